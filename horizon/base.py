@@ -22,6 +22,7 @@ the classes contained therein.
 
 import collections
 import copy
+import hashlib
 from importlib import import_module
 import inspect
 import logging
@@ -31,12 +32,16 @@ import django
 from django.conf import settings
 from django.conf.urls import include
 from django.conf.urls import url
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.core.exceptions import ImproperlyConfigured
 from django.core.urlresolvers import reverse
+from django.utils.encoding import force_bytes
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.functional import empty
 from django.utils.functional import SimpleLazyObject
 from django.utils.module_loading import module_has_submodule
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 import six
 
@@ -45,6 +50,7 @@ from horizon.decorators import _current_component
 from horizon.decorators import require_auth
 from horizon.decorators import require_perms
 from horizon import loaders
+from horizon import manifest
 from horizon.utils import settings as utils_settings
 
 
@@ -67,25 +73,38 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
             _decorate_urlconf(pattern.url_patterns, decorator, *args, **kwargs)
 
 
-# FIXME(lhcheng): We need to find a better way to cache the result.
-# Rather than storing it in the session, we could leverage the Django
-# session. Currently, this has been causing issue with cookie backend,
-# adding 1600+ in the cookie size.
-def access_cached(func):
-    def inner(self, context):
-        session = context['request'].session
-        try:
-            if session['allowed']['valid_for'] != session.get('token'):
-                raise KeyError()
-        except KeyError:
-            session['allowed'] = {"valid_for": session.get('token')}
+def _get_navigation_cache():
+    alias = getattr(settings, 'NAVIGATION_CACHE', 'default')
+    if alias is None:
+        return None
+    return caches[alias]
+
+
+def _get_navigation_key(request):
+    """Returns the cache key of the navigation of the user, or None.
 
-        key = "%s.%s" % (self.__class__.__module__, self.__class__.__name__)
-        if key not in session['allowed']:
-            session['allowed'][key] = func(self, context)
-            session.modified = True
-        return session['allowed'][key]
-    return inner
+    The access of the user to the dashboards and panels only changes with
+    its token, the project and region it works on and its domain context.
+    """
+    user = getattr(request, 'user', None)
+    token_id = getattr(getattr(user, 'token', None), 'id', None)
+    if token_id is None:
+        return None
+    parts = (token_id,
+             getattr(user, 'project_id', None),
+             getattr(user, 'services_region', None),
+             request.session.get('domain_context'))
+    digest = hashlib.sha256(force_bytes(
+        '\n'.join(six.text_type(part) for part in parts))).hexdigest()
+    return 'horizon.navigation:%s' % digest
+
+
+def _get_navigation_timeout(request):
+    # The entry can't be used anymore once the token has expired.
+    expires = getattr(request.user.token, 'expires', None)
+    if expires is None:
+        return DEFAULT_TIMEOUT
+    return max(int((expires - timezone.now()).total_seconds()), 1)
 
 
 class NotRegistered(Exception):
@@ -107,31 +126,35 @@ class HorizonComponent(object):
         return name
 
     def _get_default_urlpatterns(self):
+        urlpatterns = manifest.get_urlpatterns(self)
+        if urlpatterns is not None:
+            return urlpatterns
+        return self._import_urlpatterns()
+
+    def _import_urls_module(self):
         package_string = '.'.join(self.__module__.split('.')[:-1])
         if getattr(self, 'urls', None):
             try:
-                mod = import_module('.%s' % self.urls, package_string)
+                return import_module('.%s' % self.urls, package_string)
             except ImportError:
-                mod = import_module(self.urls)
-            urlpatterns = mod.urlpatterns
-        else:
-            # Try importing a urls.py from the dashboard package
-            if module_has_submodule(import_module(package_string), 'urls'):
-                urls_mod = import_module('.urls', package_string)
-                urlpatterns = urls_mod.urlpatterns
-            else:
-                urlpatterns = []
-        return urlpatterns
+                return import_module(self.urls)
+        # Try importing a urls.py from the dashboard package
+        if module_has_submodule(import_module(package_string), 'urls'):
+            return import_module('.urls', package_string)
+        return None
+
+    def _import_urlpatterns(self):
+        mod = self._import_urls_module()
+        if mod is None:
+            return []
+        return mod.urlpatterns
 
-    # FIXME(lhcheng): Removed the access_cached decorator for now until
-    # a better implementation has been figured out. This has been causing
-    # issue with cookie backend, adding 1600+ in the cookie size.
-    # @access_cached
     def can_access(self, context):
         """Return whether the user has role based access to this component.
 
-        This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        This method is not intended to be overridden. The navigation
+        rendered on each page does not call it every time, see
+        :meth:`~horizon.Site.get_allowed_components`.
         """
         return self.allowed(context)
 
@@ -775,6 +798,39 @@ class Site(Registry, HorizonComponent):
         else:
             raise NotRegistered("No dashboard modules have been registered.")
 
+    def get_allowed_components(self, context):
+        """Returns the dashboards and panels the current user can access.
+
+        Dashboards are identified by their slug and panels by the slug of
+        their dashboard and their own, as in ``"project/instances"``.
+
+        Checking the access to every component evaluates policy rules and
+        may call the services, so the result is computed once per token,
+        project, region and domain context and kept in the cache named by
+        the ``NAVIGATION_CACHE`` setting, as well as on the request.
+        """
+        request = context['request']
+        allowed = getattr(request, '_horizon_allowed_components', None)
+        if allowed is not None:
+            return allowed
+        cache = _get_navigation_cache()
+        key = _get_navigation_key(request)
+        if cache is not None and key is not None:
+            allowed = cache.get(key)
+        if allowed is None:
+            allowed = set()
+            for dashboard in self.get_dashboards():
+                if dashboard.can_access(context):
+                    allowed.add(dashboard.slug)
+                for panel in dashboard.get_panels():
+                    if panel.can_access(context):
+                        allowed.add('%s/%s' % (dashboard.slug, panel.slug))
+            allowed = frozenset(allowed)
+            if cache is not None and key is not None:
+                cache.set(key, allowed, _get_navigation_timeout(request))
+        request._horizon_allowed_components = allowed
+        return allowed
+
     def get_user_home(self, user):
         """Returns the default URL for a particular user.
 
@@ -898,6 +954,12 @@ class Site(Registry, HorizonComponent):
             raise ImproperlyConfigured('You must set a '
                                        '"_registerable_class" property '
                                        'in order to use autodiscovery.')
+        # The manifest lists the modules found when it was built.
+        modules = manifest.get_modules()
+        if modules is not None:
+            for mod_name in modules:
+                import_module(mod_name)
+            return
         # Discover both dashboards and panels, in that order
         for mod_name in ('dashboard', 'panel'):
             for app in settings.INSTALLED_APPS:
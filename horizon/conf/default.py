@@ -27,6 +27,15 @@ HORIZON_CONFIG = {
     # AJAX settings for JavaScript
     'ajax_queue_limit': 10,
     'ajax_poll_interval': 2500,
+    'delta_poll_interval': 10000,
+
+    # Size of the thread pool shared by the concurrent loading of tabs and
+    # table data.
+    'concurrency_max_workers': 10,
+
+    # Path of the manifest of the dashboards and panels written by the
+    # build_manifest command.
+    'manifest': None,
 
     # URL for reporting issue with this site.
     'bug_url': None,
@@ -0,0 +1,57 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from horizon import base
+from horizon import conf
+from horizon import manifest
+
+
+class Command(BaseCommand):
+    help = ("Write the manifest of the registered dashboards and panels, "
+            "from which the worker processes build their URLconf without "
+            "importing the views. Run it again whenever the code, the "
+            "installed applications or the enabled plugins change.")
+
+    # The system checks would build the URLconf from the current manifest.
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument('-o', '--output',
+                            default=conf.HORIZON_CONFIG['manifest'],
+                            help=("The path of the manifest, "
+                                  "HORIZON_CONFIG['manifest'] by default"))
+
+    def handle(self, *args, **options):
+        if not options['output']:
+            raise CommandError("No output path given and "
+                               "HORIZON_CONFIG['manifest'] is not set.")
+        # Build the registry by importing everything.
+        manifest.set_manifest(None)
+        base.Horizon._urls()
+        data = manifest.build(base.Horizon)
+        with open(options['output'], 'w') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+
+        components = data['components']
+        lazy = [key for key, entry in components.items()
+                if entry['urlpatterns'] is not None]
+        self.stdout.write("Wrote the manifest of %d dashboards and panels to "
+                          "%s, %d of them with lazily imported views."
+                          % (len(components), options['output'], len(lazy)))
+        for key in sorted(set(components) - set(lazy)):
+            self.stdout.write("The views of %s are imported at startup."
+                              % key)
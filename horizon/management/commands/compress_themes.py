@@ -0,0 +1,200 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import json
+import multiprocessing
+import os
+
+from compressor import cache as compress_cache
+from compressor.conf import settings as compress_settings
+from compressor.storage import default_storage
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+from django.utils.module_loading import import_string
+import six
+
+from horizon import themes
+
+
+# The fingerprints and manifest entries of the contexts last compressed,
+# kept in the output directory of the compressor.
+STATE_FILE = 'themes.json'
+
+
+def get_contexts():
+    """Returns the offline contexts, one per theme with Horizon's default."""
+    contexts = compress_settings.COMPRESS_OFFLINE_CONTEXT
+    if isinstance(contexts, six.string_types):
+        contexts = import_string(contexts)()
+    elif isinstance(contexts, dict):
+        contexts = [contexts]
+    return list(contexts)
+
+
+def _get_name(index, context):
+    return context.get('THEME') or str(index)
+
+
+def _hash_tree(sha, top, exclude=()):
+    for root, dirs, files in os.walk(top, followlinks=True):
+        dirs[:] = sorted(d for d in dirs
+                         if os.path.join(root, d) not in exclude)
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            sha.update(os.path.relpath(path, top).encode('utf-8'))
+            with open(path, 'rb') as f:
+                sha.update(hashlib.sha256(f.read()).digest())
+
+
+def _get_template_dirs():
+    dirs = list(get_app_template_dirs('templates'))
+    for engine in engines.all():
+        dirs.extend(engine.template_dirs)
+    return sorted(set(dirs))
+
+
+def get_common_fingerprint():
+    """Returns the hash of the sources shared by all the contexts.
+
+    Those are the static files, except the collected themes and the output
+    of the compressor, and the templates.
+    """
+    sha = hashlib.sha256()
+    root = compress_settings.COMPRESS_ROOT
+    _hash_tree(sha, root,
+               exclude=(os.path.join(root, themes.get_theme_dir()),
+                        os.path.join(root,
+                                     compress_settings.COMPRESS_OUTPUT_DIR)))
+    for template_dir in _get_template_dirs():
+        _hash_tree(sha, template_dir)
+    return sha.hexdigest()
+
+
+def get_fingerprint(common_fingerprint, context):
+    """Returns the hash of the sources compressed with ``context``."""
+    sha = hashlib.sha256(common_fingerprint.encode('utf-8'))
+    sha.update(json.dumps(context, sort_keys=True,
+                          default=six.text_type).encode('utf-8'))
+    theme = themes.find_theme(context.get('THEME'))
+    if theme is not None:
+        root_path = getattr(settings, 'ROOT_PATH',
+                            os.path.abspath('openstack_dashboard'))
+        _hash_tree(sha, os.path.join(root_path, theme[2]))
+    return sha.hexdigest()
+
+
+def _get_state_path():
+    return os.path.join(compress_settings.COMPRESS_ROOT,
+                        compress_settings.COMPRESS_OUTPUT_DIR, STATE_FILE)
+
+
+def _load_state():
+    try:
+        with open(_get_state_path()) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return {}
+
+
+def _save_state(state):
+    with open(_get_state_path(), 'w') as f:
+        json.dump(state, f)
+
+
+def _compress(args):
+    """Compresses the templates with a single context, in a worker process.
+
+    Returns the entries of the offline manifest written for the context.
+    """
+    index, options = args
+    context = get_contexts()[index]
+    # The settings of the worker process only.
+    compress_settings.COMPRESS_OFFLINE_CONTEXT = [context]
+    compress_settings.COMPRESS_OFFLINE_MANIFEST = 'manifest.%d.json' % index
+    compress_cache.flush_offline_manifest()
+    call_command('compress', **options)
+    manifest = dict(compress_cache.get_offline_manifest())
+    default_storage.delete(compress_cache.get_offline_manifest_filename())
+    return index, manifest
+
+
+class Command(BaseCommand):
+    help = ("Compress the templates offline like the compress command, "
+            "compressing each theme in a separate process, and only the "
+            "themes whose sources have changed since the last run.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('-p', '--processes', type=int, default=None,
+                            help=("The number of themes compressed at the "
+                                  "same time, the number of CPUs by "
+                                  "default"))
+        parser.add_argument('-a', '--all', action='store_true',
+                            help="Compress the unchanged themes too")
+        parser.add_argument('-f', '--force', action='store_true',
+                            help=("Compress even if COMPRESS_ENABLED or "
+                                  "COMPRESS_OFFLINE is not set, as with the "
+                                  "compress command"))
+
+    def _compress_all(self, contexts, todo, state, options):
+        compress_options = {'force': options['force'],
+                            'verbosity': options['verbosity']}
+        # Each context is compressed by a new process, to start from the
+        # settings and the caches of the command.
+        pool = multiprocessing.Pool(options['processes'], maxtasksperchild=1)
+        try:
+            results = pool.imap_unordered(
+                _compress, [(index, compress_options) for index in todo])
+            for index, manifest in results:
+                name = _get_name(index, contexts[index])
+                state[name]['manifest'] = manifest
+                self.stdout.write("Compressed %s." % name)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def handle(self, *args, **options):
+        if options['processes'] is not None and options['processes'] < 1:
+            raise CommandError("At least one process is needed.")
+        contexts = get_contexts()
+        if not contexts:
+            raise CommandError("No offline context to compress with.")
+
+        common_fingerprint = get_common_fingerprint()
+        state = {} if options['all'] else _load_state()
+        new_state = {}
+        todo = []
+        for index, context in enumerate(contexts):
+            name = _get_name(index, context)
+            fingerprint = get_fingerprint(common_fingerprint, context)
+            previous = state.get(name)
+            if previous and previous['fingerprint'] == fingerprint:
+                new_state[name] = previous
+                self.stdout.write("%s is unchanged, skipping." % name)
+            else:
+                new_state[name] = {'fingerprint': fingerprint}
+                todo.append(index)
+
+        if todo:
+            self._compress_all(contexts, todo, new_state, options)
+
+        offline_manifest = {}
+        for name in sorted(new_state):
+            offline_manifest.update(new_state[name]['manifest'])
+        compress_cache.write_offline_manifest(offline_manifest)
+        _save_state(new_state)
+        self.stdout.write("Compressed %d of %d themes, %d blocks in total."
+                          % (len(todo), len(contexts), len(offline_manifest)))
@@ -0,0 +1,310 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Manifest of the registered dashboards and panels.
+
+The manifest is written by the ``build_manifest`` management command and
+read from the path given by ``HORIZON_CONFIG['manifest']``. It lists the
+modules registering the dashboards and panels, so that they are imported
+without probing every installed application, and describes the URL patterns
+of each dashboard and panel, so that their views are only imported the first
+time one of their URLs is requested instead of when the URLconf is built.
+
+The manifest is ignored when the installed applications or the plugin
+configuration have changed since it was written, and the URL patterns of a
+component are imported as usual when its class has changed, or when one of
+the modules defining its URL patterns and views has been modified.
+"""
+
+from importlib import import_module
+import json
+import logging
+import os
+import sys
+import types
+
+from django.conf import settings
+from django.core import urlresolvers
+from django.utils.module_loading import import_string
+from django.utils.module_loading import module_has_submodule
+from django.views.generic import View
+
+from horizon import conf
+
+
+LOG = logging.getLogger(__name__)
+
+VERSION = 1
+
+# The keys of the plugin configuration which change the registry.
+PANEL_CUSTOMIZATION_KEYS = ('PANEL', 'PANEL_DASHBOARD', 'PANEL_GROUP',
+                            'PANEL_GROUP_DASHBOARD', 'ADD_PANEL',
+                            'REMOVE_PANEL', 'DEFAULT_PANEL')
+
+_UNSET = object()
+_manifest = _UNSET
+
+
+class LazyView(object):
+    """A view which is only imported the first time it is called."""
+
+    def __init__(self, path, initkwargs=None):
+        self.path = path
+        self.initkwargs = initkwargs
+        self._view = None
+
+    def get_view(self):
+        if self._view is None:
+            view = import_string(self.path)
+            if self.initkwargs is not None:
+                view = view.as_view(**self.initkwargs)
+            self._view = view
+        return self._view
+
+    def __call__(self, request, *args, **kwargs):
+        return self.get_view()(request, *args, **kwargs)
+
+    def __repr__(self):
+        return '<LazyView: %s>' % self.path
+
+
+def _get_path(obj):
+    return '%s.%s' % (obj.__module__, obj.__name__)
+
+
+def _get_key(component):
+    # Dashboards are registered with the site, which is not registered.
+    parent = getattr(component, '_registered_with', None)
+    if parent is None:
+        return None
+    if getattr(parent, '_registered_with', None) is None:
+        return component.slug
+    return '%s/%s' % (parent.slug, component.slug)
+
+
+def get_fingerprint():
+    """Returns what the registry is built from, besides the code itself."""
+    panel_customization = [
+        dict((key, config[key]) for key in PANEL_CUSTOMIZATION_KEYS
+             if key in config)
+        for config in conf.HORIZON_CONFIG['panel_customization'] or []]
+    fingerprint = {
+        'installed_apps': list(settings.INSTALLED_APPS),
+        'dashboards': list(conf.HORIZON_CONFIG['dashboards'] or []),
+        'panel_customization': panel_customization,
+    }
+    # Compare it as read back from the manifest.
+    return json.loads(json.dumps(fingerprint))
+
+
+def _load():
+    path = conf.HORIZON_CONFIG['manifest']
+    if not path:
+        return None
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (IOError, ValueError) as e:
+        LOG.warning("Unable to read the manifest %s: %s", path, e)
+        return None
+    if (manifest.get('version') != VERSION or
+            manifest.get('fingerprint') != get_fingerprint()):
+        LOG.warning("The manifest %s is out of date and is not used, run the "
+                    "build_manifest command again.", path)
+        return None
+    return manifest
+
+
+def get_manifest():
+    """Returns the manifest, or None if there is none or it is outdated."""
+    global _manifest
+    if _manifest is _UNSET:
+        _manifest = _load()
+    return _manifest
+
+
+def set_manifest(manifest):
+    """Replaces the manifest of the process, None disabling it."""
+    global _manifest
+    _manifest = manifest
+
+
+def get_modules():
+    """Returns the modules registering the dashboards and panels, or None."""
+    manifest = get_manifest()
+    if manifest is None:
+        return None
+    return manifest['modules']
+
+
+def _build_pattern(spec):
+    if 'patterns' in spec:
+        return urlresolvers.RegexURLResolver(
+            spec['regex'], [_build_pattern(s) for s in spec['patterns']],
+            spec['kwargs'], app_name=spec['app_name'],
+            namespace=spec['namespace'])
+    return urlresolvers.RegexURLPattern(
+        spec['regex'], LazyView(spec['view'], spec['initkwargs']),
+        spec['kwargs'], spec['name'])
+
+
+def get_urlpatterns(component):
+    """Returns the URL patterns of a dashboard or panel, or None.
+
+    The views of the patterns are imported the first time they are called.
+    None is returned when the URL patterns of the component have to be
+    imported, because there is no manifest or it does not describe them.
+    """
+    manifest = get_manifest()
+    if manifest is None:
+        return None
+    entry = manifest['components'].get(_get_key(component))
+    if (entry is None or entry['urlpatterns'] is None or
+            entry['class'] != _get_path(component.__class__) or
+            entry['sources'] != _get_mtimes(entry['sources'])):
+        return None
+    return [_build_pattern(spec) for spec in entry['urlpatterns']]
+
+
+def _get_source(module_name):
+    path = getattr(sys.modules.get(module_name), '__file__', None)
+    if path and path.endswith(('.pyc', '.pyo')) and os.path.exists(path[:-1]):
+        path = path[:-1]
+    return path
+
+
+def _get_mtimes(paths):
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.path.getmtime(path)
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def _get_view_class(callback):
+    """Returns the class and the arguments of a class-based view, or None.
+
+    Django 1.8 does not set ``view_class`` and ``view_initkwargs`` on the
+    views returned by ``as_view``, they are only found in their closure.
+    """
+    view_class = getattr(callback, 'view_class', None)
+    if view_class is not None:
+        return view_class, callback.view_initkwargs
+    code = getattr(callback, '__code__', None)
+    if code is None or not callback.__closure__:
+        return None
+    cells = dict(zip(code.co_freevars,
+                     (cell.cell_contents for cell in callback.__closure__)))
+    view_class = cells.get('cls')
+    if (isinstance(view_class, type) and issubclass(view_class, View) and
+            isinstance(cells.get('initkwargs'), dict)):
+        return view_class, cells['initkwargs']
+    return None
+
+
+def _describe_view(callback):
+    view_class = None
+    class_view = _get_view_class(callback)
+    if class_view is not None:
+        view_class, initkwargs = class_view
+        path = _get_path(view_class)
+    else:
+        path = _get_path(callback)
+        initkwargs = None
+    try:
+        imported = import_string(path)
+    except ImportError:
+        imported = None
+    if imported is not (view_class or callback):
+        raise ValueError("The view %r can't be imported from %s."
+                         % (callback, path))
+    return {'view': path, 'initkwargs': initkwargs}
+
+
+def _describe_patterns(urlpatterns, modules):
+    specs = []
+    for pattern in urlpatterns:
+        spec = {'regex': pattern.regex.pattern}
+        if isinstance(pattern, urlresolvers.RegexURLResolver):
+            if isinstance(pattern.urlconf_module, types.ModuleType):
+                modules.add(pattern.urlconf_module.__name__)
+            spec.update({'kwargs': pattern.default_kwargs,
+                         'app_name': pattern.app_name,
+                         'namespace': pattern.namespace,
+                         'patterns': _describe_patterns(pattern.url_patterns,
+                                                        modules)})
+        else:
+            spec.update({'kwargs': pattern.default_args,
+                         'name': pattern.name})
+            spec.update(_describe_view(pattern.callback))
+            modules.add(spec['view'].rsplit('.', 1)[0])
+        specs.append(spec)
+    return specs
+
+
+def _describe_component(component):
+    entry = {'class': _get_path(component.__class__), 'urlpatterns': None,
+             'sources': {}}
+    try:
+        urls_module = component._import_urls_module()
+        modules = set()
+        if urls_module is not None:
+            modules.add(urls_module.__name__)
+        urlpatterns = _describe_patterns(component._import_urlpatterns(),
+                                         modules)
+        entry['sources'] = _get_mtimes(
+            path for path in map(_get_source, sorted(modules)) if path)
+        # The patterns are only kept when they can be written as JSON.
+        json.dumps(urlpatterns)
+        entry['urlpatterns'] = urlpatterns
+    except (TypeError, ValueError) as e:
+        LOG.info("The URL patterns of %s are imported at startup: %s",
+                 _get_key(component), e)
+    return entry
+
+
+def _get_discovered_modules():
+    modules = []
+    for mod_name in ('dashboard', 'panel'):
+        for app in settings.INSTALLED_APPS:
+            if module_has_submodule(import_module(app), mod_name):
+                modules.append('%s.%s' % (app, mod_name))
+    return modules
+
+
+def build(site):
+    """Returns the manifest of the dashboards and panels of ``site``.
+
+    The registry of the site must have been built, which happens when its
+    URLconf is.
+    """
+    dashboards = []
+    components = {}
+    for dashboard in site._registry.values():
+        components[_get_key(dashboard)] = _describe_component(dashboard)
+        panel_groups = []
+        for group in dashboard.get_panel_groups().values():
+            panel_groups.append({'slug': group.slug,
+                                 'panels': [panel.slug for panel in group]})
+            for panel in group:
+                components[_get_key(panel)] = _describe_component(panel)
+        dashboards.append({'slug': dashboard.slug,
+                           'class': _get_path(dashboard.__class__),
+                           'default_panel': dashboard.default_panel,
+                           'panel_groups': panel_groups})
+    return {'version': VERSION,
+            'fingerprint': get_fingerprint(),
+            'modules': _get_discovered_modules(),
+            'dashboards': sorted(dashboards, key=lambda d: d['slug']),
+            'components': components}
@@ -17,12 +17,42 @@ Drop-in replacement for django.contrib.messages which handles Horizon's
 messaging needs (e.g. AJAX communication, etc.).
 """
 
+import contextlib
+import threading
+
 from django.contrib import messages as _messages
 from django.contrib.messages import constants
 from django.utils.encoding import force_text
 from django.utils.safestring import SafeData
 
 
+# Local thread storage of the messages deferred by defer_messages
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def defer_messages():
+    """Keeps aside the messages added in the current thread within the block.
+
+    Yields the list of the deferred messages, which can be added to the
+    request later with :func:`add_deferred_messages`. This is used by code
+    running in worker threads, since the message storage of a request is not
+    meant to be shared between threads.
+    """
+    previous = getattr(_local, 'deferred', None)
+    _local.deferred = deferred = []
+    try:
+        yield deferred
+    finally:
+        _local.deferred = previous
+
+
+def add_deferred_messages(request, deferred):
+    """Adds the messages kept aside by :func:`defer_messages`."""
+    for level, message, extra_tags, fail_silently in deferred:
+        add_message(request, level, message, extra_tags, fail_silently)
+
+
 def horizon_message_already_queued(request, message):
     _message = force_text(message)
     if request.is_ajax():
@@ -38,6 +68,10 @@ def horizon_message_already_queued(request, message):
 
 def add_message(request, level, message, extra_tags='', fail_silently=False):
     """Attempts to add a message to the request using the 'messages' app."""
+    deferred = getattr(_local, 'deferred', None)
+    if deferred is not None:
+        deferred.append((level, message, extra_tags, fail_silently))
+        return
     if not horizon_message_already_queued(request, message):
         if request.is_ajax():
             tag = constants.DEFAULT_TAGS[level]
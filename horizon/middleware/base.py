@@ -76,9 +76,9 @@ class HorizonMiddleware(object):
             return None
         # If we use cookie-based sessions, check that the cookie size does not
         # reach the max size accepted by common web browsers.
-        if (
-            settings.SESSION_ENGINE ==
-            'django.contrib.sessions.backends.signed_cookies'
+        if settings.SESSION_ENGINE in (
+            'django.contrib.sessions.backends.signed_cookies',
+            'horizon.sessions',
         ):
             max_cookie_size = getattr(
                 settings, 'SESSION_COOKIE_MAX_SIZE', None)
@@ -0,0 +1,131 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cookie-based sessions keeping their large values in a shared cache.
+
+Select it with ``SESSION_ENGINE = 'horizon.sessions'``. The session is
+signed into a cookie as with Django's ``signed_cookies`` engine, except that
+the values too large for a cookie, such as the token and its service
+catalog, are kept in the cache named by ``SESSION_BLOB_CACHE`` under the
+hash of their content, and only referenced from the cookie. The service
+catalog of the token is kept apart, so that a single copy is shared by all
+the users seeing the same catalog.
+
+The cache must be shared by all the dashboard processes, and large enough to
+keep the values of all the sessions for ``SESSION_COOKIE_AGE``: a session
+whose values have been evicted is lost, which logs the user out.
+"""
+
+import copy
+import hashlib
+import logging
+
+from django.conf import settings
+from django.contrib.sessions.backends import signed_cookies
+from django.core.cache import caches
+from six.moves import cPickle as pickle
+
+
+LOG = logging.getLogger(__name__)
+
+KEY_PREFIX = 'horizon:session:'
+
+# The attributes of the session values kept apart, as they are the same in
+# many sessions.
+SHARED_ATTRIBUTES = ('serviceCatalog',)
+
+
+class BlobReference(object):
+    """Stands in the cookie for a session value kept in the cache.
+
+    ``attributes`` maps the names of the shared attributes of the value to
+    the keys under which they are kept.
+    """
+
+    def __init__(self, key, attributes=None):
+        self.key = key
+        self.attributes = attributes or {}
+
+    def get_keys(self):
+        return [self.key] + list(self.attributes.values())
+
+
+def get_cache():
+    return caches[getattr(settings, 'SESSION_BLOB_CACHE', 'default')]
+
+
+def _dump(value, blobs):
+    data = pickle.dumps(value, 2)
+    key = KEY_PREFIX + hashlib.sha256(data).hexdigest()
+    blobs[key] = data
+    return key
+
+
+class SessionStore(signed_cookies.SessionStore):
+    # The values whose pickle is smaller stay in the cookie, unless they
+    # have shared attributes.
+    blob_min_size = 256
+
+    def load(self):
+        session = super(SessionStore, self).load()
+        references = [value for value in session.values()
+                      if isinstance(value, BlobReference)]
+        if not references:
+            return session
+
+        keys = [key for reference in references
+                for key in reference.get_keys()]
+        blobs = get_cache().get_many(keys)
+        if len(blobs) < len(set(keys)):
+            LOG.info("The values of a session are no longer cached, it is "
+                     "discarded.")
+            self.create()
+            return {}
+        for name, value in list(session.items()):
+            if isinstance(value, BlobReference):
+                resolved = pickle.loads(blobs[value.key])
+                for attribute, key in value.attributes.items():
+                    setattr(resolved, attribute, pickle.loads(blobs[key]))
+                session[name] = resolved
+        return session
+
+    def _compact(self, value, blobs):
+        attributes = {}
+        for attribute in SHARED_ATTRIBUTES:
+            shared = getattr(value, attribute, None)
+            if shared is not None:
+                attributes[attribute] = _dump(shared, blobs)
+        if attributes:
+            value = copy.copy(value)
+            for attribute in attributes:
+                setattr(value, attribute, None)
+            return BlobReference(_dump(value, blobs), attributes)
+
+        data = pickle.dumps(value, 2)
+        if len(data) < self.blob_min_size:
+            return value
+        return BlobReference(_dump(value, blobs))
+
+    def _get_session_key(self):
+        blobs = {}
+        session = self._get_session()
+        compact = dict((name, self._compact(value, blobs))
+                       for name, value in session.items())
+        if blobs:
+            # Refreshed with each cookie, which expires as late.
+            get_cache().set_many(blobs, timeout=settings.SESSION_COOKIE_AGE)
+
+        self._session_cache = compact
+        try:
+            return super(SessionStore, self)._get_session_key()
+        finally:
+            self._session_cache = session
@@ -34,6 +34,10 @@ urlpatterns.extend([
     url(r'^i18n/js/(?P<packages>\S+?)/$',
         i18n.javascript_catalog,
         name='jsi18n'),
+    url(r'^i18n/js/(?P<packages>\S+?)/(?P<language>[\w-]+)\.'
+        r'(?P<version>[0-9a-f]+)\.js$',
+        views.javascript_catalog,
+        name='jsi18n_versioned'),
     url(r'^i18n/setlang/$',
         i18n.set_language,
         name="set_language"),
@@ -20,6 +20,10 @@ horizon.membership = {
   roles: [],
   has_roles: [],
   default_role_id: [],
+  lazy: [],
+  initial_membership: [],
+  available_filter: [],
+  available_offset: [],
 
   /* Parses the form field selector's ID to get the
    * role id. It returns the string after the last underscore.
@@ -62,11 +66,122 @@ horizon.membership = {
    * default role id.
    **/
   init_properties: function(step_slug) {
-    horizon.membership.has_roles[step_slug] = $("." + step_slug + "_membership").data('show-roles') !== "False";
+    var $membership = $("." + step_slug + "_membership");
+    horizon.membership.has_roles[step_slug] = $membership.data('show-roles') !== "False";
     horizon.membership.default_role_id[step_slug] = $('#id_default_' + step_slug + '_role').attr('value');
-    horizon.membership.init_data_list(step_slug);
-    horizon.membership.init_role_list(step_slug);
-    horizon.membership.init_current_membership(step_slug);
+    horizon.membership.lazy[step_slug] = Boolean($membership.data('available-url'));
+    if (horizon.membership.lazy[step_slug]) {
+      horizon.membership.init_lazy_membership(step_slug, $membership.data('membership'));
+    } else {
+      horizon.membership.init_data_list(step_slug);
+      horizon.membership.init_role_list(step_slug);
+      horizon.membership.init_current_membership(step_slug);
+    }
+  },
+
+  /*
+   * Initializes the lists of a lazy membership step from the roles and
+   * the current members given by the server. The other candidates are
+   * loaded page by page from the available URL.
+   **/
+  init_lazy_membership: function(step_slug, membership) {
+    var data = [], roles = [], current = [], initial = [];
+    var i, j, member, role_id;
+    for (i = 0; i < membership.roles.length; i++) {
+      role_id = membership.roles[i].id;
+      roles[role_id] = membership.roles[i].name;
+      current[role_id] = [];
+      initial[role_id] = [];
+    }
+    for (i = 0; i < membership.members.length; i++) {
+      member = membership.members[i];
+      data[member.id] = member.name;
+      for (j = 0; j < member.roles.length; j++) {
+        role_id = member.roles[j];
+        if (current.hasOwnProperty(role_id)) {
+          current[role_id].push(member.id);
+          initial[role_id].push(member.id);
+        }
+      }
+    }
+    horizon.membership.data[step_slug] = data;
+    horizon.membership.roles[step_slug] = roles;
+    horizon.membership.current_membership[step_slug] = current;
+    horizon.membership.initial_membership[step_slug] = initial;
+    horizon.membership.available_filter[step_slug] = null;
+    horizon.membership.available_offset[step_slug] = 0;
+  },
+
+  /*
+   * Writes the role assignments granted and revoked since the step was
+   * loaded into the hidden fields of a lazy membership step, as lists of
+   * [member id, role id] pairs.
+   **/
+  update_changes: function(step_slug) {
+    var grants = [], revokes = [], role_id, i;
+    var current = horizon.membership.current_membership[step_slug];
+    var initial = horizon.membership.initial_membership[step_slug];
+    for (role_id in current) {
+      if (current.hasOwnProperty(role_id)) {
+        for (i = 0; i < current[role_id].length; i++) {
+          if ($.inArray(current[role_id][i], initial[role_id]) === -1) {
+            grants.push([current[role_id][i], role_id]);
+          }
+        }
+        for (i = 0; i < initial[role_id].length; i++) {
+          if ($.inArray(initial[role_id][i], current[role_id]) === -1) {
+            revokes.push([initial[role_id][i], role_id]);
+          }
+        }
+      }
+    }
+    $('#id_' + step_slug + '_grants').val(JSON.stringify(grants));
+    $('#id_' + step_slug + '_revokes').val(JSON.stringify(revokes));
+  },
+
+  /*
+   * Loads a page of the available list of a lazy membership step, matching
+   * the text of its filter. The list is emptied first when reset is true,
+   * otherwise the next page is appended to it.
+   **/
+  load_available: function(step_slug, reset) {
+    var $membership = $("." + step_slug + "_membership");
+    var $list = $(".available_" + step_slug);
+    var filter = $("input[id='available_" + step_slug + "']").val() || "";
+    if (reset) {
+      horizon.membership.available_offset[step_slug] = 0;
+    }
+    horizon.membership.available_filter[step_slug] = filter;
+    $.getJSON($membership.data('available-url'), {
+      filter: filter,
+      offset: horizon.membership.available_offset[step_slug]
+    }).done(function (response) {
+      // Ignore the pages of a filter which has since been changed.
+      if (filter !== horizon.membership.available_filter[step_slug]) {
+        return;
+      }
+      if (reset) {
+        $list.empty();
+      }
+      horizon.membership.available_offset[step_slug] += response.items.length;
+      $.each(response.items, function (idx, item) {
+        var data_id = "id_" + step_slug + "_" + item.id;
+        if (horizon.membership.get_member_roles(step_slug, item.id).length > 0 ||
+            $list.find("li[data-" + step_slug + "-id='" + data_id + "']").length) {
+          return;
+        }
+        horizon.membership.data[step_slug][item.id] = item.name;
+        var member_el = horizon.membership.generate_member_element(
+          step_slug, item.name, item.id, [], "+");
+        member_el.find(".role_options").hide();
+        $list.append(member_el);
+      });
+      $("#more_available_" + step_slug).toggle(response.more);
+      horizon.membership.fix_stripes(step_slug);
+      horizon.membership.detect_no_results(step_slug);
+    }).fail(function () {
+      horizon.toast.add('error', gettext('Unable to retrieve the available list.'));
+    });
   },
 
   /*
@@ -134,6 +249,9 @@ horizon.membership = {
   update_role_lists: function(step_slug, role_id, new_list) {
     this.get_role_element(step_slug, role_id).val(new_list);
     horizon.membership.current_membership[step_slug][role_id] = new_list;
+    if (horizon.membership.lazy[step_slug]) {
+      horizon.membership.update_changes(step_slug);
+    }
   },
 
   /*
@@ -312,9 +430,14 @@ horizon.membership = {
       // Pick the class name that contains the step_slug
       var filter = $.grep(css_class.split(' '), function(val){ return val.indexOf(step_slug) !== -1; })[0];
 
+      // The filter of a lazy available list searches the server, so it
+      // must stay usable when nothing matches.
+      var searched = horizon.membership.lazy[step_slug] && filter === "available_" + step_slug;
       if (!$('.' + filter).children('ul').length) {
         $('#no_' + filter).show();
-        $("input[id='" + filter + "']").attr('disabled', 'disabled');
+        if (!searched) {
+          $("input[id='" + filter + "']").attr('disabled', 'disabled');
+        }
       }
       else {
         $('#no_' + filter).hide();
@@ -425,6 +548,18 @@ horizon.membership = {
       var filter = $.grep(css_class.split(' '), function(val){ return val.indexOf(step_slug) !== -1; })[0];
 
       var input = $("input[id='" + filter +"']");
+      if (horizon.membership.lazy[step_slug] && filter === "available_" + step_slug) {
+        var timer;
+        input.on('keyup', function () {
+          clearTimeout(timer);
+          timer = setTimeout(function () {
+            if (input.val() !== horizon.membership.available_filter[step_slug]) {
+              horizon.membership.load_available(step_slug, true);
+            }
+          }, 300);
+        });
+        return;
+      }
       input.quicksearch('ul.' + filter + ' ul li span.display_name', {
         'delay': 200,
         'loader': 'span.loading',
@@ -474,7 +609,13 @@ horizon.membership = {
       horizon.membership.update_membership(step_slug);
       horizon.membership.select_member_role(step_slug);
       horizon.membership.add_new_member(step_slug);
-
+      if (horizon.membership.lazy[step_slug]) {
+        $form.find("#more_available_" + step_slug).hide().on('click', function (evt) {
+          evt.preventDefault();
+          horizon.membership.load_available(step_slug, false);
+        });
+        horizon.membership.load_available(step_slug, true);
+      }
 
       // initially hide role dropdowns for available member list
       $form.find(".available_" + step_slug + " .role_options").hide();
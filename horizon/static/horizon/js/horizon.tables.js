@@ -33,9 +33,19 @@ horizon.datatables = {
       return;
     }
 
+    var batches = {};
+
     $rows_to_update.each(function() {
       var $row = $(this);
-      var $table = $row.closest('table.datatable');
+      var batch_url = $row.attr('data-batch-update-url');
+
+      // Rows of tables which support batched updates are refreshed together
+      // with a single request per table.
+      if (batch_url) {
+        batches[batch_url] = batches[batch_url] || [];
+        batches[batch_url].push($row);
+        return;
+      }
 
       requests.push(
         horizon.ajax.queue({
@@ -44,89 +54,50 @@ horizon.datatables = {
             switch (jqXHR.status) {
               // A 404 indicates the object is gone, and should be removed from the table
               case 404:
-                // Update the footer count and reset to default empty row if needed
-                var row_count, colspan, template, params;
-
-                // existing count minus one for the row we're removing
-                row_count = horizon.datatables.update_footer_count($table, -1);
-
-                if(row_count === 0) {
-                  colspan = $table.find('.table_column_header th').length;
-                  template = horizon.templates.compiled_templates["#empty_row_template"];
-                  params = {
-                      "colspan": colspan,
-                      no_items_label: gettext("No items to display.")
-                  };
-                  var empty_row = template.render(params);
-                  $row.replaceWith(empty_row);
-                } else {
-                  $row.remove();
-                }
-                // Reset tablesorter's data cache.
-                $table.trigger("update");
-                // Enable launch action if quota is not exceeded
-                horizon.datatables.update_actions();
+                horizon.datatables.remove_row($row);
                 break;
               default:
-                console.log(gettext("An error occurred while updating."));
-                $row.removeClass("ajax-update");
-                $row.find("i.ajax-updating").remove();
+                horizon.datatables.stop_row_update($row);
                 break;
             }
           },
           success: function (data) {
-            var $new_row = $(data);
-
-            if ($new_row.hasClass('warning')) {
-              var $container = $(document.createElement('div'))
-                .addClass('progress-text horizon-loading-bar');
-
-              var $progress = $(document.createElement('div'))
-                .addClass('progress progress-striped active')
-                .appendTo($container);
-
-              $(document.createElement('div'))
-                .addClass('progress-bar')
-                .appendTo($progress);
-
-              // if action/confirm is required, show progress-bar with "?"
-              // icon to indicate user action is required
-              if ($new_row.find('.btn-action-required').length > 0) {
-                $(document.createElement('span'))
-                  .addClass('fa fa-question-circle progress-bar-text')
-                  .appendTo($container);
-              }
-              $new_row.find("td.warning:last").prepend($container);
-            }
+            horizon.datatables.replace_row($row, data);
+          },
+          complete: function () {
+            // Revalidate the button check for the updated table
+            horizon.datatables.validate_button();
+          }
+        })
+      );
+    });
 
-            // Only replace row if the html content has changed
-            if($new_row.html() !== $row.html()) {
+    $.each(batches, function(batch_url, $rows) {
+      var obj_ids = $.map($rows, function($row) {
+        return $row.attr('data-object-id');
+      });
 
-              // Directly accessing the checked property of the element
-              // is MUCH faster than using jQuery's helper method
-              var $checkbox = $row.find('.table-row-multi-select');
-              if($checkbox.length && $checkbox[0].checked) {
-                // Preserve the checkbox if it's already clicked
-                $new_row.find('.table-row-multi-select').prop('checked', true);
-              }
-              $row.replaceWith($new_row);
-
-              // TODO(matt-borland, tsufiev): ideally we should solve the
-              // problem with not-working angular actions in a content added
-              // by jQuery via replacing jQuery insert with Angular insert.
-              // Should address this in Newton release
-              recompileAngularContent($table);
-
-              // Reset tablesorter's data cache.
-              $table.trigger("update");
-              // Reset decay constant.
-              $table.removeAttr('decay_constant');
-              // Check that quicksearch is enabled for this table
-              // Reset quicksearch's data cache.
-              if ($table.attr('id') in horizon.datatables.qs) {
-                horizon.datatables.qs[$table.attr('id')].cache();
+      requests.push(
+        horizon.ajax.queue({
+          url: batch_url,
+          data: {obj_id: obj_ids},
+          traditional: true,
+          dataType: 'json',
+          error: function () {
+            $.each($rows, function(index, $row) {
+              horizon.datatables.stop_row_update($row);
+            });
+          },
+          success: function (data) {
+            $.each($rows, function(index, $row) {
+              var row_html = data.rows[$row.attr('data-object-id')];
+              // Objects missing from the response have been deleted.
+              if (row_html === undefined) {
+                horizon.datatables.remove_row($row);
+              } else {
+                horizon.datatables.replace_row($row, row_html);
               }
-            }
+            });
           },
           complete: function () {
             // Revalidate the button check for the updated table
@@ -147,6 +118,158 @@ horizon.datatables = {
     });
   },
 
+  remove_row: function ($row) {
+    var $table = $row.closest('table.datatable');
+    // Update the footer count and reset to default empty row if needed
+    var row_count, colspan, template, params;
+
+    // existing count minus one for the row we're removing
+    row_count = horizon.datatables.update_footer_count($table, -1);
+
+    if(row_count === 0) {
+      colspan = $table.find('.table_column_header th').length;
+      template = horizon.templates.compiled_templates["#empty_row_template"];
+      params = {
+          "colspan": colspan,
+          no_items_label: gettext("No items to display.")
+      };
+      var empty_row = template.render(params);
+      $row.replaceWith(empty_row);
+    } else {
+      $row.remove();
+    }
+    // Reset tablesorter's data cache.
+    $table.trigger("update");
+    // Enable launch action if quota is not exceeded
+    horizon.datatables.update_actions();
+  },
+
+  stop_row_update: function ($row) {
+    console.log(gettext("An error occurred while updating."));
+    $row.removeClass("ajax-update");
+    $row.find("i.ajax-updating").remove();
+  },
+
+  replace_row: function ($row, data) {
+    var $table = $row.closest('table.datatable');
+    var $new_row = $(data);
+
+    if ($new_row.hasClass('warning')) {
+      var $container = $(document.createElement('div'))
+        .addClass('progress-text horizon-loading-bar');
+
+      var $progress = $(document.createElement('div'))
+        .addClass('progress progress-striped active')
+        .appendTo($container);
+
+      $(document.createElement('div'))
+        .addClass('progress-bar')
+        .appendTo($progress);
+
+      // if action/confirm is required, show progress-bar with "?"
+      // icon to indicate user action is required
+      if ($new_row.find('.btn-action-required').length > 0) {
+        $(document.createElement('span'))
+          .addClass('fa fa-question-circle progress-bar-text')
+          .appendTo($container);
+      }
+      $new_row.find("td.warning:last").prepend($container);
+    }
+
+    // Only replace row if the html content has changed
+    if($new_row.html() !== $row.html()) {
+
+      // Directly accessing the checked property of the element
+      // is MUCH faster than using jQuery's helper method
+      var $checkbox = $row.find('.table-row-multi-select');
+      if($checkbox.length && $checkbox[0].checked) {
+        // Preserve the checkbox if it's already clicked
+        $new_row.find('.table-row-multi-select').prop('checked', true);
+      }
+      $row.replaceWith($new_row);
+
+      // TODO(matt-borland, tsufiev): ideally we should solve the
+      // problem with not-working angular actions in a content added
+      // by jQuery via replacing jQuery insert with Angular insert.
+      // Should address this in Newton release
+      recompileAngularContent($table);
+
+      // Reset tablesorter's data cache.
+      $table.trigger("update");
+      // Reset decay constant.
+      $table.removeAttr('decay_constant');
+      // Check that quicksearch is enabled for this table
+      // Reset quicksearch's data cache.
+      if ($table.attr('id') in horizon.datatables.qs) {
+        horizon.datatables.qs[$table.attr('id')].cache();
+      }
+    }
+  },
+
+  delta_update: function ($table) {
+    var interval = $table.attr('data-delta-interval');
+
+    setTimeout(function () {
+      // The table has been replaced or removed since the last refresh.
+      if (!$.contains(document, $table[0])) { return; }
+
+      horizon.ajax.queue({
+        url: $table.attr('data-delta-url'),
+        data: {since: $table.attr('data-delta-since')},
+        dataType: 'json',
+        error: function () {
+          console.log(gettext("An error occurred while updating."));
+        },
+        success: function (data) {
+          horizon.datatables.apply_delta($table, data);
+          $table.attr('data-delta-since', data.since);
+        },
+        complete: function () {
+          horizon.datatables.validate_button();
+          horizon.datatables.delta_update($table);
+        }
+      });
+    }, interval);
+  },
+
+  apply_delta: function ($table, data) {
+    var $tbody = $table.children('tbody');
+    var find_row = function (obj_id) {
+      return $tbody.children('tr').filter(function () {
+        return $(this).attr('data-object-id') === obj_id;
+      });
+    };
+
+    // Insert new rows in reverse so that they end up in the server's order.
+    $.each(data.rows.slice().reverse(), function (index, row) {
+      var $row = find_row(row[0]);
+      if ($row.length) {
+        horizon.datatables.replace_row($row, row[1]);
+      } else {
+        $tbody.children('tr.empty').remove();
+        $tbody.prepend($(row[1]));
+        horizon.datatables.update_footer_count($table, 1);
+        recompileAngularContent($table);
+        $table.trigger("update");
+      }
+    });
+
+    $.each(data.deleted, function (index, obj_id) {
+      find_row(obj_id).each(function () {
+        horizon.datatables.remove_row($(this));
+      });
+    });
+
+    // Without a list of deletions every row not in the data set is gone.
+    if (data.ids) {
+      $tbody.children('tr[data-object-id]').each(function () {
+        if ($.inArray($(this).attr('data-object-id'), data.ids) === -1) {
+          horizon.datatables.remove_row($(this));
+        }
+      });
+    }
+  },
+
   update_actions: function() {
     var $actions_to_update = $('.btn-launch.ajax-update, .btn-create.ajax-update');
     $actions_to_update.each(function() {
@@ -537,6 +660,10 @@ horizon.datatables.set_table_sorting = function (parent) {
   $(parent).find("table.datatable").each(function () {
     var $table = $(this),
       header_options = {};
+    // Tables sorted by the server link their headers to the sorted pages.
+    if ($table.data('server-sorting')) {
+      return;
+    }
     // Disable if not sortable or has <= 1 item
     if ($table.find('tbody tr').not('.empty').length > 1){
       $table.find("thead th[class!='table_header']").each(function (i) {
@@ -713,4 +840,7 @@ horizon.addInitFunction(horizon.datatables.init = function() {
   });
 
   horizon.datatables.update();
+  $('table.datatable[data-delta-url]').each(function () {
+    horizon.datatables.delta_update($(this));
+  });
 });
@@ -18,6 +18,7 @@
 from horizon.tables.actions import Action
 from horizon.tables.actions import BatchAction
 from horizon.tables.actions import DeleteAction
+from horizon.tables.actions import ExportAction
 from horizon.tables.actions import FilterAction
 from horizon.tables.actions import FixedFilterAction
 from horizon.tables.actions import LinkAction
@@ -28,6 +29,7 @@ from horizon.tables.base import DataTable
 from horizon.tables.base import Row
 from horizon.tables.base import WrappingColumn
 from horizon.tables.views import DataTableView
+from horizon.tables.views import LocalPagedTableMixin
 from horizon.tables.views import MixedDataTableView
 from horizon.tables.views import MultiTableMixin
 from horizon.tables.views import MultiTableView
@@ -38,6 +40,7 @@ __all__ = [
     'Action',
     'BatchAction',
     'DeleteAction',
+    'ExportAction',
     'FilterAction',
     'FixedFilterAction',
     'LinkAction',
@@ -48,6 +51,7 @@ __all__ = [
     'Row',
     'WrappingColumn',
     'DataTableView',
+    'LocalPagedTableMixin',
     'MixedDataTableView',
     'MultiTableMixin',
     'MultiTableView',
@@ -29,6 +29,7 @@ from django.utils.translation import ungettext_lazy
 import six
 
 from horizon import messages
+from horizon.utils import filter_index
 from horizon.utils import functions
 from horizon.utils import html
 from horizon.utils import settings as utils_settings
@@ -411,6 +412,32 @@ class LinkAction(BaseAction):
             return self.url
 
 
+class ExportAction(LinkAction):
+    """A table action which downloads all the data of the table.
+
+    The view of the table streams the objects as ``export_format`` rows,
+    ``"csv"`` or ``"ndjson"`` (one JSON object per line), holding the text
+    of the columns returned by
+    :meth:`~horizon.tables.DataTable.get_export_columns`. Paginated views
+    fetch the data one page at a time, see
+    :meth:`~horizon.tables.DataTableView.iter_export_pages`.
+
+    .. attribute:: export_format
+
+        ``"csv"`` or ``"ndjson"``. Default: ``"csv"``.
+    """
+    name = "export"
+    verbose_name = _("Export")
+    icon = "download"
+    export_format = "csv"
+
+    def get_link_url(self, datum=None):
+        params = urlencode(
+            OrderedDict([("action", self.name), ("table", self.table.name)])
+        )
+        return "%s?%s" % (self.table.get_absolute_url(), params)
+
+
 class FilterAction(BaseAction):
     """A base class representing a filter action for a table.
 
@@ -529,6 +556,24 @@ class FilterAction(BaseAction):
         """
         return data
 
+    def search(self, table, data, filter_string, fields, prefix=False):
+        """Returns the items of ``data`` matching ``filter_string``.
+
+        Matching is case-insensitive and done against the given ``fields``
+        (attribute or key names) of each item: a substring match, or a match
+        on the start of the value or of one of its words if ``prefix`` is
+        True. When ``data`` is the table's own data set and the view kept an
+        index of it, see :meth:`~horizon.tables.DataTable.set_filter_index`,
+        the index is queried instead of scanning the data.
+        """
+        index = None
+        if data is table.data:
+            index = table.get_filter_index(build=False)
+        if index is None:
+            return filter_index.scan(data, filter_string, fields,
+                                     prefix=prefix)
+        return index.search(filter_string, fields, prefix=prefix)
+
     def is_api_filter(self, filter_field):
         """Determine if agiven filter field should be used as an API filter."""
         if self.filter_type == 'server':
@@ -553,10 +598,8 @@ class NameFilterAction(FilterAction):
     """A filter action for name property."""
 
     def filter(self, table, items, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [item for item in items
-                if query in item.name.lower()]
+        """Case-insensitive search on the name of the items."""
+        return self.search(table, items, filter_string, ('name',))
 
 
 class FixedFilterAction(FilterAction):
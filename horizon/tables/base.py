@@ -29,9 +29,11 @@ from django.template.defaultfilters import slugify
 from django.template.defaultfilters import truncatechars
 from django.template.loader import render_to_string
 from django.utils.html import escape
+from django.utils.html import strip_tags
 from django.utils import http
 from django.utils.http import urlencode
 from django.utils.safestring import mark_safe
+from django.utils.safestring import SafeData
 from django.utils import termcolors
 from django.utils.translation import ugettext_lazy as _
 import six
@@ -42,6 +44,7 @@ from horizon.forms import ThemableCheckboxInput
 from horizon import messages
 from horizon.tables.actions import FilterAction
 from horizon.tables.actions import LinkAction
+from horizon.utils import filter_index
 from horizon.utils import html
 
 
@@ -74,6 +77,15 @@ class Column(html.HTMLElement):
         Boolean to determine whether this column should be sortable or not.
         Defaults to ``True``.
 
+    .. attribute:: sort_key
+
+        A string or callable giving the value this column is sorted by when
+        the table is sorted on the server, see
+        :class:`~horizon.tables.LocalPagedTableMixin`. A string is the name
+        of the attribute (or dictionary key) of the data to sort by, and a
+        callable is passed each datum and returns the value to sort by.
+        Defaults to ``None``, which sorts by the raw data of the column.
+
     .. attribute:: hidden
 
         Boolean to determine whether or not this column should be displayed
@@ -299,7 +311,8 @@ class Column(html.HTMLElement):
                  auto=None, truncate=None, link_classes=None, wrap_list=False,
                  form_field=None, form_field_attributes=None,
                  update_action=None, link_attrs=None, policy_rules=None,
-                 cell_attributes_getter=None, help_text=None):
+                 cell_attributes_getter=None, help_text=None,
+                 sort_key=None):
 
         allowed_data_types = allowed_data_types or []
         self.classes = list(classes or getattr(self, "classes", []))
@@ -324,6 +337,7 @@ class Column(html.HTMLElement):
 
         self.auto = auto
         self.sortable = sortable
+        self.sort_key = sort_key
         self.link = link
         self.allowed_data_types = allowed_data_types
         self.hidden = hidden
@@ -405,6 +419,34 @@ class Column(html.HTMLElement):
                           {'attr': self.transform, 'obj': datum})
         return data
 
+    def get_sort_value(self, datum):
+        """Returns the value ``datum`` is sorted by in this column.
+
+        See :attr:`~horizon.tables.Column.sort_key`.
+        """
+        if callable(self.sort_key):
+            return self.sort_key(datum)
+        if self.sort_key:
+            if isinstance(datum, collections.Mapping):
+                return datum.get(self.sort_key)
+            return getattr(datum, self.sort_key, None)
+        return self.get_raw_data(datum)
+
+    def get_sort_string(self):
+        """Returns the query parameter string sorting the table by this column.
+
+        If the table is already sorted by this column the sort order is
+        reversed.
+        """
+        return self.table.get_sort_string(self.name)
+
+    def get_sort_query_string(self):
+        """Returns the query string of the request, sorted by this column.
+
+        See :meth:`~horizon.tables.DataTable.get_sort_query_string`.
+        """
+        return self.table.get_sort_query_string(self.name)
+
     def get_data(self, datum):
         """Returns the final display data for this column from the given inputs.
 
@@ -570,10 +612,24 @@ class Row(html.HTMLElement):
         updates of cell. Generally you won't need to change this value.
         It is also used for inline edit of the cell.
         Default: ``"cell_update"``.
+
+    .. attribute:: ajax_batch
+
+        Boolean value to determine whether the AJAX updates of the rows of a
+        table are coalesced into a single request, see
+        :meth:`~horizon.tables.Row.get_data_list`. Default: ``False``.
+
+    .. attribute:: ajax_batch_action_name
+
+        String that is used for the query parameter key to request batched
+        AJAX updates. Generally you won't need to change this value.
+        Default: ``"rows_update"``.
     """
     ajax = False
     ajax_action_name = "row_update"
     ajax_cell_action_name = "cell_update"
+    ajax_batch = False
+    ajax_batch_action_name = "rows_update"
 
     def __init__(self, table, datum=None):
         super(Row, self).__init__()
@@ -618,6 +674,9 @@ class Row(html.HTMLElement):
             interval = conf.HORIZON_CONFIG['ajax_poll_interval']
             self.attrs['data-update-interval'] = interval
             self.attrs['data-update-url'] = self.get_ajax_update_url()
+            if self.ajax_batch:
+                self.attrs['data-batch-update-url'] = \
+                    self.get_ajax_batch_update_url()
             self.classes.append("ajax-update")
 
         self.attrs['data-object-id'] = table.get_object_id(datum)
@@ -677,6 +736,14 @@ class Row(html.HTMLElement):
         ]))
         return "%s?%s" % (table_url, params)
 
+    def get_ajax_batch_update_url(self):
+        table_url = self.table.get_absolute_url()
+        params = urlencode(collections.OrderedDict([
+            ("action", self.ajax_batch_action_name),
+            ("table", self.table.name)
+        ]))
+        return "%s?%s" % (table_url, params)
+
     def can_be_selected(self, datum):
         """Determines whether the row can be selected.
 
@@ -692,6 +759,27 @@ class Row(html.HTMLElement):
         """
         return {}
 
+    def get_data_list(self, request, obj_ids):
+        """Fetches the updated data for the rows of several objects at once.
+
+        Used when ``ajax_batch`` is enabled. Returns a list of data objects;
+        the objects whose IDs are missing from it are considered deleted and
+        their rows are removed from the table.
+
+        By default this calls :meth:`~horizon.tables.Row.get_data` for each
+        ID. Subclasses should override it to fetch all of the objects with
+        a single API call where the API allows it.
+        """
+        data = []
+        for obj_id in obj_ids:
+            try:
+                data.append(self.get_data(request, obj_id))
+            except Exception:
+                error = exceptions.handle(request, ignore=True)
+                if error is not exceptions.NotFound:
+                    raise
+        return data
+
 
 class Cell(html.HTMLElement):
     """Represents a single cell in the table."""
@@ -894,6 +982,23 @@ class Cell(html.HTMLElement):
                                 {"cell": self})
 
 
+class StreamedRows(object):
+    """Stand-in for the rows of a table whose body is streamed.
+
+    It only reports how many rows the table holds, which is all the table
+    template needs to render the header, the footer and the empty message.
+    """
+
+    def __init__(self, count):
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(())
+
+
 class DataTableOptions(object):
     """Contains options for :class:`.DataTable` objects.
 
@@ -993,6 +1098,14 @@ class DataTableOptions(object):
         single view this will need to be changed to differentiate between the
         tables. Default: ``"marker"``.
 
+    .. attribute:: sort_param
+
+        The name of the query string parameter holding the name of the column
+        the table is sorted by on the server, prefixed with ``"-"`` for a
+        descending sort. When using multiple tables in a single view this will
+        need to be changed to differentiate between the tables.
+        Default: ``"sort"``.
+
     .. attribute:: status_columns
 
         A list or tuple of column names which represents the "state"
@@ -1079,6 +1192,7 @@ class DataTableOptions(object):
                                              'prev_pagination_param',
                                              'prev_marker')
         self.pagination_param = getattr(options, 'pagination_param', 'marker')
+        self.sort_param = getattr(options, 'sort_param', 'sort')
         self.browser_table = getattr(options, 'browser_table', None)
         self.footer = getattr(options, 'footer', True)
         self.hidden_title = getattr(options, 'hidden_title', True)
@@ -1256,7 +1370,38 @@ class DataTable(object):
         the :meth:`~horizon.tables.FilterAction.filter` method of the table's
         :class:`~horizon.tables.FilterAction` class (if one is provided)
         using the current request's query parameters.
+
+    .. attribute:: streaming
+
+        Boolean. When ``True`` the table is rendered without its rows; a
+        placeholder is emitted instead and the rows are produced separately
+        by :meth:`~horizon.tables.DataTable.render_rows`. This is set by
+        views which stream their response. Default: ``False``.
+
+    .. attribute:: delta_since
+
+        Timestamp of the data shown by the table, in ISO 8601 format. When
+        set, the table periodically asks its view for the rows changed since
+        then, see :class:`~horizon.tables.DataTableView`. Default: ``None``.
+
+    .. attribute:: server_sorting
+
+        Boolean. When ``True`` the rows are sorted by the view rather than in
+        the browser, and the headers of the sortable columns link to the
+        sorted pages. Set by :class:`~horizon.tables.LocalPagedTableMixin`.
+        Default: ``False``.
+
+    .. attribute:: sort_column
+
+        The name of the column the rows are sorted by on the server, or
+        ``None`` if they are in the order of the data. Default: ``None``.
+
+    .. attribute:: sort_descending
+
+        Boolean. Whether the rows are sorted by :attr:`sort_column` in
+        descending order. Default: ``False``.
     """
+    delta_action_name = "table_delta"
 
     def __init__(self, request, data=None, needs_form_wrapper=None, **kwargs):
         self.request = request
@@ -1269,6 +1414,13 @@ class DataTable(object):
         self.permissions = self._meta.permissions
         self.needs_filter_first = False
         self._filter_first_message = self._meta.filter_first_message
+        self.streaming = False
+        self.delta_since = None
+        self._filter_index = None
+        self._filter_index_data = None
+        self.server_sorting = False
+        self.sort_column = None
+        self.sort_descending = False
 
         # Create a new set
         columns = []
@@ -1363,6 +1515,30 @@ class DataTable(object):
         filter_field = self.request.session.get(param_name, '')
         return filter_field
 
+    def get_filter_index(self, build=True):
+        """Returns a :class:`~horizon.utils.filter_index.FilterIndex` of data.
+
+        The index is built when there is none for the current ``self.data``,
+        unless ``build`` is False, in which case None is returned. Building
+        an index only pays off when it is kept for later requests, see
+        :meth:`set_filter_index`.
+        """
+        if (self._filter_index is None or
+                self._filter_index_data is not self.data):
+            if not build:
+                return None
+            self.set_filter_index(filter_index.FilterIndex(self.data or []))
+        return self._filter_index
+
+    def set_filter_index(self, index):
+        """Uses ``index`` as the filter index for the current data.
+
+        Views which cache their data set can cache its index alongside it
+        and hand it back here to skip rebuilding it on every request.
+        """
+        self._filter_index = index
+        self._filter_index_data = self.data
+
     def _populate_data_cache(self):
         self._data_cache = {}
         # Set up hash tables to store data points for each column
@@ -1419,6 +1595,18 @@ class DataTable(object):
         """
         return self.request.get_full_path()
 
+    def get_delta_url(self):
+        """Returns the URL polled for the rows changed since ``delta_since``.
+        """
+        params = urlencode(collections.OrderedDict([
+            ("action", self.delta_action_name),
+            ("table", self.name)
+        ]))
+        return "%s?%s" % (self.get_absolute_url(), params)
+
+    def get_delta_interval(self):
+        return conf.HORIZON_CONFIG['delta_poll_interval']
+
     def get_empty_message(self):
         """Returns the message to be displayed when there is no data."""
         return self._no_data_message
@@ -1669,6 +1857,9 @@ class DataTable(object):
                         return HttpResponse(new_row.render())
                     else:
                         return HttpResponse(status=error.status_code)
+            elif (new_row.ajax and new_row.ajax_batch and
+                  new_row.ajax_batch_action_name == action_name):
+                return self.batch_row_update_handle(request, new_row)
             elif new_row.ajax_cell_action_name == action_name:
                 # inline edit of the cell actions
                 return self.inline_edit_handle(request, table_name,
@@ -1685,6 +1876,32 @@ class DataTable(object):
                             return handled
         return None
 
+    def batch_row_update_handle(self, request, new_row):
+        """Batched AJAX row update handler.
+
+        Responds with a JSON object whose ``rows`` maps the ID of each
+        requested object which still exists to its rendered row. Objects
+        missing from ``rows`` have been deleted.
+        """
+        obj_ids = [self.sanitize_id(obj_id)
+                   for obj_id in request.GET.getlist('obj_id')]
+        requested = set(six.text_type(obj_id) for obj_id in obj_ids)
+        try:
+            rows = {}
+            for datum in new_row.get_data_list(request, obj_ids):
+                obj_id = six.text_type(self.get_object_id(datum))
+                if obj_id in requested:
+                    rows[obj_id] = self._get_row(datum).render()
+            error = False
+        except Exception:
+            error = exceptions.handle(request, ignore=True)
+        if request.is_ajax():
+            if not error:
+                return HttpResponse(json.dumps({'rows': rows}),
+                                    content_type="application/json")
+            else:
+                return HttpResponse(status=error.status_code)
+
     def inline_edit_handle(self, request, table_name, action_name, obj_id,
                            new_row):
         """Inline edit handler.
@@ -1856,12 +2073,55 @@ class DataTable(object):
 
     def get_prev_pagination_string(self):
         """Returns the query parameter string to paginate to the prev page."""
-        return "=".join([self._meta.prev_pagination_param,
-                         self.get_prev_marker()])
+        return self._add_sort_string("=".join(
+            [self._meta.prev_pagination_param, self.get_prev_marker()]))
 
     def get_pagination_string(self):
         """Returns the query parameter string to paginate to the next page."""
-        return "=".join([self._meta.pagination_param, self.get_marker()])
+        return self._add_sort_string("=".join(
+            [self._meta.pagination_param, self.get_marker()]))
+
+    def get_sort_string(self, column_name=None):
+        """Returns the query parameter string for a server side sort order.
+
+        The string sorts the table by the column named ``column_name``, in
+        descending order if the table is already sorted by it in ascending
+        order. Without ``column_name`` it keeps the current sort order, or is
+        empty if the table is not sorted on the server.
+        """
+        if column_name is None:
+            if not self.sort_column:
+                return ''
+            column_name = self.sort_column
+            descending = self.sort_descending
+        else:
+            descending = (column_name == self.sort_column and
+                          not self.sort_descending)
+        value = ('-' if descending else '') + column_name
+        return "=".join([self._meta.sort_param, http.urlquote_plus(value)])
+
+    def get_sort_query_string(self, column_name):
+        """Returns the query string of the request, sorted by a column.
+
+        The sort order is the one of :meth:`get_sort_string`. The other
+        parameters of the request, such as the filter, are kept, except the
+        pagination markers since the sorted table starts at its first page.
+        """
+        query = self.request.GET.copy()
+        for param in (self._meta.pagination_param,
+                      self._meta.prev_pagination_param,
+                      self._meta.sort_param):
+            query.pop(param, None)
+        sort_string = self.get_sort_string(column_name)
+        if query:
+            return "&".join([query.urlencode(), sort_string])
+        return sort_string
+
+    def _add_sort_string(self, query):
+        sort_string = self.get_sort_string()
+        if sort_string:
+            return "&".join([query, sort_string])
+        return query
 
     def calculate_row_status(self, statuses):
         """Returns a boolean value determining the overall row status.
@@ -1908,16 +2168,29 @@ class DataTable(object):
         """Returns this table's columns including auto-generated ones."""
         return self.columns.values()
 
+    def _get_row(self, datum):
+        row = self._meta.row_class(self, datum)
+        if self.get_object_id(datum) == self.current_item_id:
+            self.selected = True
+            row.classes.append('current_selected')
+        return row
+
     def get_rows(self):
-        """Return the row data for this table broken out by columns."""
+        """Return the row data for this table broken out by columns.
+
+        When the table is :attr:`streaming` only a placeholder sized like
+        the row list is returned, so that the header and footer can be laid
+        out before any row is built.
+        """
+        if self.streaming:
+            # Filters may return an iterator, which would be exhausted by
+            # counting it before the rows are rendered.
+            self._filtered_data = list(self.filtered_data or [])
+            return StreamedRows(len(self._filtered_data))
         rows = []
         try:
             for datum in self.filtered_data:
-                row = self._meta.row_class(self, datum)
-                if self.get_object_id(datum) == self.current_item_id:
-                    self.selected = True
-                    row.classes.append('current_selected')
-                rows.append(row)
+                rows.append(self._get_row(datum))
         except Exception:
             # Exceptions can be swallowed at the template level here,
             # re-raising as a TemplateSyntaxError makes them visible.
@@ -1928,6 +2201,66 @@ class DataTable(object):
 
         return rows
 
+    @property
+    def row_stream_marker(self):
+        """The placeholder rendered in place of the rows when streaming."""
+        return mark_safe("<!-- horizon-table-rows:%s -->"
+                         % self.slugify_name())
+
+    def render_rows(self, chunk_size=100):
+        """Yields the rendered rows of this table in chunks of HTML.
+
+        Each row is built, rendered and discarded before the next one, so
+        only ``chunk_size`` rendered rows are held in memory at any time.
+        Errors are logged and end the table body early, since the response
+        headers have already been sent by the time rows are rendered.
+        """
+        chunk = []
+        try:
+            for datum in self.filtered_data:
+                chunk.append(self._get_row(datum).render())
+                if len(chunk) >= chunk_size:
+                    yield "".join(chunk)
+                    chunk = []
+        except Exception:
+            LOG.exception("Error while rendering streamed table rows.")
+        if chunk:
+            yield "".join(chunk)
+
+    def get_export_columns(self):
+        """Returns the columns written by the table's export action.
+
+        Defaults to every column except the automatic ones, such as the
+        checkbox and row actions columns.
+        """
+        return [column for column in self.get_columns() if not column.auto]
+
+    def export_rows(self, pages):
+        """Yields the text of the export columns for each object of ``pages``.
+
+        ``pages`` is an iterable of lists of objects, each of which is
+        filtered by the table's filter action in turn. Only the current page
+        is held by the table, so the memory used does not grow with the
+        number of objects exported.
+        """
+        columns = self.get_export_columns()
+        for page in pages:
+            self.data = page
+            for datum in self.filtered_data:
+                yield [self._get_export_value(column, datum)
+                       for column in columns]
+                # Do not keep the cell values of the exported rows.
+                self._populate_data_cache()
+            del self._filtered_data
+
+    def _get_export_value(self, column, datum):
+        value = column.get_data(datum)
+        if value is None:
+            return u''
+        if isinstance(value, SafeData):
+            value = strip_tags(value)
+        return six.text_type(value)
+
     def css_classes(self):
         """Returns the additional CSS class to be added to <table> tag."""
         return self._meta.css_classes
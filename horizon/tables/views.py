@@ -13,17 +13,84 @@
 #    under the License.
 
 from collections import defaultdict
-
+from collections import OrderedDict
+import datetime
+import hashlib
+import itertools
+import json
+import logging
+
+from django.contrib import messages
+from django.core.cache import cache
+from django import http
 from django import shortcuts
-
+from django.utils import translation
+from django.utils.translation import ugettext_lazy as _
+import six
+
+from horizon import exceptions
+from horizon.tables import actions
+from horizon import themes
+from horizon.utils import concurrency
+from horizon.utils import csvbase
+from horizon.utils import filter_index
+from horizon.utils import filters
+from horizon.utils import functions
 from horizon import views
 
 from horizon.templatetags.horizon import has_permissions
 
 
+LOG = logging.getLogger(__name__)
+
+
+class TableCsvResponse(csvbase.BaseCsvStreamingResponse):
+    """Streams rows produced by :meth:`DataTable.export_rows` as CSV."""
+
+    def __init__(self, request, rows, **kwargs):
+        self.rows = rows
+        super(TableCsvResponse, self).__init__(request, None, {},
+                                               'text/csv', **kwargs)
+
+    def get_row_data(self):
+        return self.rows
+
+
 class MultiTableMixin(object):
-    """A generic mixin which provides methods for handling DataTables."""
+    """A generic mixin which provides methods for handling DataTables.
+
+    .. attribute:: load_concurrently
+
+        Boolean to control whether the ``get_{{ table_name }}_data`` methods
+        of the tables are called concurrently on the thread pool shared by
+        the process, see :func:`horizon.utils.concurrency.run_concurrently`.
+        Default: ``False``
+
+    .. attribute:: max_workers
+
+        The maximum number of data methods called at the same time when
+        ``load_concurrently`` is ``True``. Default: ``4``
+
+    .. attribute:: export_page_size
+
+        The number of objects per page the data methods should ask the API
+        for while a table is exported. Default: ``500``
+
+    .. attribute:: exporting
+
+        ``True`` while a table is exported, see :meth:`handle_export`.
+
+    .. attribute:: export_marker
+
+        The marker of the page of the export being fetched, ``None`` for the
+        first page, see :meth:`DataTableView.iter_export_pages`.
+    """
     data_method_pattern = "get_%s_data"
+    load_concurrently = False
+    max_workers = 4
+    export_page_size = 500
+    exporting = False
+    export_marker = None
 
     def __init__(self, *args, **kwargs):
         super(MultiTableMixin, self).__init__(*args, **kwargs)
@@ -35,13 +102,19 @@ class MultiTableMixin(object):
 
     def _get_data_dict(self):
         if not self._data:
-            for table in self.table_classes:
-                data = []
-                name = table._meta.name
-                func_list = self._data_methods.get(name, [])
-                for func in func_list:
-                    data.extend(func())
-                self._data[name] = data
+            names = [table._meta.name for table in self.table_classes]
+            funcs = [(name, func) for name in names
+                     for func in self._data_methods.get(name, [])]
+            if self.load_concurrently:
+                futures = concurrency.run_concurrently(
+                    self.request, [func for name, func in funcs],
+                    max_workers=self.max_workers)
+                funcs = [(name, future.result) for (name, func), future
+                         in zip(funcs, futures)]
+            for name in names:
+                self._data[name] = []
+            for name, func in funcs:
+                self._data[name].extend(func())
         return self._data
 
     def get_data_methods(self, table_classes, methods):
@@ -118,6 +191,92 @@ class MultiTableMixin(object):
     def needs_filter_first(self, table):
         return False
 
+    def iter_export_pages(self, table):
+        """Yields the data exported from ``table`` as lists of objects."""
+        for func in self._data_methods.get(table.name, []):
+            yield list(func())
+
+    def get_export_action(self, table):
+        """Returns the :class:`~horizon.tables.ExportAction` requested.
+
+        ``None`` is returned unless the request is for an allowed export
+        action of ``table``.
+        """
+        if self.request.method != 'GET':
+            return None
+        table_name, action_name, obj_id = table.check_handler(self.request)
+        if table_name != table.name:
+            return None
+        action = table.base_actions.get(action_name)
+        if (isinstance(action, actions.ExportAction) and
+                action._allowed(self.request, None)):
+            return action
+        return None
+
+    def handle_export(self, table, action):
+        """Responds with all the data of ``table`` in the action's format.
+
+        The response is streamed: the data is fetched and written one page
+        at a time, see :meth:`iter_export_pages`. While ``exporting`` is set
+        the data methods should fetch pages of ``export_page_size`` objects
+        instead of the user's page size. When the data can't all be
+        retrieved, the export ends with a row saying so.
+        """
+        if action.export_format not in ('csv', 'ndjson'):
+            return http.HttpResponseBadRequest()
+        self.exporting = True
+        self.update_server_filter_action(self.request, table)
+        pages = self._check_export_pages(table, self.iter_export_pages(table))
+        rows = table.export_rows(pages)
+        header = [six.text_type(column)
+                  for column in table.get_export_columns()]
+        if action.export_format == 'csv':
+            rows = self._handle_export_errors(table, rows, lambda msg: [msg])
+            response = TableCsvResponse(
+                self.request, itertools.chain([header], rows),
+                filename="%s.csv" % table.slugify_name())
+        else:
+            names = [column.name for column in table.get_export_columns()]
+            lines = (json.dumps(OrderedDict(zip(names, row))) + '\n'
+                     for row in rows)
+            lines = self._handle_export_errors(
+                table, lines, lambda msg: json.dumps({'error': msg}) + '\n')
+            response = http.StreamingHttpResponse(
+                lines, content_type='application/x-ndjson')
+            response['Content-Disposition'] = (
+                'attachment; filename="%s.ndjson"' % table.slugify_name())
+        # The rows are produced while the response is sent, after the
+        # middleware chain has run.
+        response.streaming_content = self._override_language(
+            response.streaming_content, translation.get_language())
+        return response
+
+    def _check_export_pages(self, table, pages):
+        # The data methods report most API errors as messages instead of
+        # raising them, which leaves pages empty or incomplete.
+        count = len(messages.get_messages(self.request))
+        for page in pages:
+            if len(messages.get_messages(self.request)) > count:
+                raise exceptions.HorizonException(
+                    "An error was reported while exporting table %s."
+                    % table.name)
+            yield page
+
+    def _handle_export_errors(self, table, rows, error_row):
+        try:
+            for row in rows:
+                yield row
+        except Exception:
+            LOG.exception("Error while exporting table %s.", table.name)
+            yield error_row(six.text_type(
+                _("Error: the export is incomplete as some of the data "
+                  "could not be retrieved.")))
+
+    def _override_language(self, content, language):
+        with translation.override(language):
+            for chunk in content:
+                yield chunk
+
     def handle_table(self, table):
         name = table.name
         data = self._get_data_dict()
@@ -200,10 +359,20 @@ class MultiTableView(MultiTableMixin, views.HorizonTemplateView):
     define a ``get_{{ table_name }}_data`` method for each table class
     which returns a set of data for that table; and specify a template for
     the ``template_name`` attribute.
+
+    Set ``stream_tables`` to ``True`` to send the page shell and the table
+    headers as soon as the data is loaded and to render the table rows
+    while the response is being sent, ``stream_chunk_size`` rows at a time.
     """
+    stream_tables = False
+    stream_chunk_size = 100
 
     def construct_tables(self):
         tables = self.get_tables().values()
+        for table in tables:
+            action = self.get_export_action(table)
+            if action is not None:
+                return self.handle_export(table, action)
         # Early out before data is loaded
         for table in tables:
             preempted = table.maybe_preempt()
@@ -224,12 +393,50 @@ class MultiTableView(MultiTableMixin, views.HorizonTemplateView):
         if handled:
             return handled
         context = self.get_context_data(**kwargs)
+        if self.stream_tables:
+            return self.render_to_streaming_response(context)
         return self.render_to_response(context)
 
     def post(self, request, *args, **kwargs):
         # GET and POST handling are the same
         return self.get(request, *args, **kwargs)
 
+    def render_to_streaming_response(self, context):
+        """Returns the page as a ``StreamingHttpResponse``.
+
+        The page is rendered with the rows of every table left out, then
+        sent piece by piece with each table's rows rendered in place of its
+        :attr:`~horizon.tables.DataTable.row_stream_marker`.
+        """
+        tables = list(self.get_tables().values())
+        for table in tables:
+            table.streaming = True
+        page = self.render_to_response(context).rendered_content
+        # Tables without rows or not present in the template have no marker.
+        tables = [table for table in tables
+                  if table.row_stream_marker in page]
+        tables.sort(key=lambda table: page.find(table.row_stream_marker))
+        # The rows are rendered after the response has left the middleware
+        # chain, so the active language and theme are captured now and
+        # restored while the response is consumed.
+        stream = self._stream_page(page, tables,
+                                   translation.get_language(),
+                                   themes.get_active_theme())
+        response = http.StreamingHttpResponse(stream,
+                                              content_type=self.content_type)
+        # Ask buffering proxies to pass the chunks on as they are produced.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def _stream_page(self, page, tables, language, theme):
+        with translation.override(language), themes.override_theme(theme):
+            for table in tables:
+                head, marker, page = page.partition(table.row_stream_marker)
+                yield head
+                for chunk in table.render_rows(self.stream_chunk_size):
+                    yield chunk
+            yield page
+
 
 class DataTableView(MultiTableView):
     """A class-based generic view to handle basic DataTable processing.
@@ -241,20 +448,133 @@ class DataTableView(MultiTableView):
 
     Optionally, you can override the ``has_more_data`` method to trigger
     pagination handling for APIs that support it.
+
+    Set ``delta_refresh`` to ``True`` to have the first page of the table
+    refresh itself with the rows created, changed or deleted since it was
+    last loaded, see :meth:`get_delta_data`.
     """
     table_class = None
     context_object_name = 'table'
     template_name = 'horizon/common/_data_table_view.html'
+    delta_refresh = False
+    delta_timestamp_attr = 'updated_at'
+    # Seconds subtracted from each delta timestamp to make up for clock
+    # differences between the dashboard and the API services.
+    delta_clock_skew = 10
 
     def _get_data_dict(self):
         if not self._data:
             self.update_server_filter_action(self.request)
+            since = self._get_delta_timestamp()
             self._data = {self.table_class._meta.name: self.get_data()}
+            if self._delta_allowed():
+                self.get_table().delta_since = since
         return self._data
 
+    def _delta_allowed(self):
+        if not self.delta_refresh:
+            return False
+        meta = self.table_class._meta
+        # Only the first page of a paginated table can take in new rows.
+        return not (self.request.GET.get(meta.pagination_param) or
+                    self.request.GET.get(meta.prev_pagination_param))
+
+    def _get_delta_timestamp(self):
+        now = datetime.datetime.utcnow().replace(microsecond=0)
+        since = now - datetime.timedelta(seconds=self.delta_clock_skew)
+        return since.isoformat() + 'Z'
+
+    def _changed_since(self, datum, since):
+        updated = filters.parse_isotime(
+            getattr(datum, self.delta_timestamp_attr, None))
+        # Objects without a valid timestamp are always sent.
+        return not updated or updated >= since
+
+    def get_delta_data(self, since):
+        """Returns the data which changed since the ``since`` datetime.
+
+        The return value is a ``(data, deleted_ids)`` tuple. Override this
+        method when the backend can filter by change time: ``data`` then
+        holds the objects created or changed since ``since`` and
+        ``deleted_ids`` the IDs of the objects deleted since then.
+
+        By default the full data set is loaded with ``get_data`` and
+        ``deleted_ids`` is ``None``. The changed objects are then picked by
+        their ``delta_timestamp_attr`` attribute and the rows of objects
+        which are no longer in the data set are removed.
+        """
+        return self.get_data(), None
+
+    def handle_delta(self, table):
+        """Responds to a request for the rows changed since a timestamp.
+
+        The JSON response holds the rendered ``rows`` as ``[id, html]``
+        pairs, the ``deleted`` object IDs, the ``ids`` of all objects when
+        the backend cannot report deletions, and the ``since`` timestamp to
+        be sent with the next request.
+        """
+        request = self.request
+        since = filters.parse_isotime(request.GET.get('since'))
+        if not since:
+            return http.HttpResponseBadRequest()
+        next_since = self._get_delta_timestamp()
+        try:
+            data, deleted_ids = self.get_delta_data(since)
+            ids = None
+            if deleted_ids is None:
+                ids = [six.text_type(table.get_object_id(datum))
+                       for datum in data]
+                data = [datum for datum in data
+                        if self._changed_since(datum, since)]
+            rows = [[six.text_type(table.get_object_id(datum)),
+                     table._get_row(datum).render()] for datum in data]
+        except Exception:
+            error = exceptions.handle(request, ignore=True)
+            return http.HttpResponse(status=error.status_code)
+        response = {'rows': rows,
+                    'deleted': [six.text_type(obj_id)
+                                for obj_id in deleted_ids or []],
+                    'ids': ids,
+                    'since': next_since}
+        return http.HttpResponse(json.dumps(response),
+                                 content_type="application/json")
+
+    def construct_tables(self):
+        if self.delta_refresh:
+            table = self.get_tables().get(self.table_class._meta.name)
+            if table is not None:
+                table_name, action_name, obj_id = \
+                    table.check_handler(self.request)
+                if (table_name == table.name and
+                        action_name == table.delta_action_name and
+                        self.request.is_ajax()):
+                    self.update_server_filter_action(self.request)
+                    return self.handle_delta(table)
+        return super(DataTableView, self).construct_tables()
+
     def get_data(self):
         return []
 
+    def iter_export_pages(self, table):
+        """Yields the data exported from ``table`` one page at a time.
+
+        ``get_data`` is called for each page. After a page for which
+        ``has_more_data`` is true, ``export_marker`` is set to the ID of the
+        last object of the page before the next call, so views paginating
+        their API with that marker while ``exporting`` export all the data
+        without holding it in memory at once.
+        """
+        self.export_marker = None
+        while True:
+            data = list(self.get_data())
+            yield data
+            if not data or not self.has_more_data(table):
+                return
+            marker = six.text_type(table.get_object_id(data[-1]))
+            if marker == self.export_marker:
+                return
+            self.export_marker = marker
+
     def get_tables(self):
         if not self._tables:
             self._tables = {}
@@ -352,6 +672,9 @@ class MixedDataTableView(DataTableView):
             setattr(datum, self.table_class.data_type_name,
                     type_string)
 
+    def iter_export_pages(self, table):
+        yield self._get_data_dict()[table.name]
+
     def get_table(self):
         self.table = super(MixedDataTableView, self).get_table()
         if not self.table._meta.mixed_data_type:
@@ -375,6 +698,8 @@ class PagedTableMixin(object):
         return self._has_more_data
 
     def _get_marker(self):
+        if self.exporting:
+            return self.export_marker, "desc"
         try:
             meta = self.table_class._meta
         except AttributeError:
@@ -387,3 +712,175 @@ class PagedTableMixin(object):
             if marker:
                 return marker, "desc"
             return None, "desc"
+
+
+class LocalPagedTableMixin(PagedTableMixin):
+    """Sorts and paginates the data of a DataTableView in the dashboard.
+
+    This is for tables whose API returns the whole data set and can neither
+    sort nor page it. ``get_data`` still returns all the data, but only one
+    page of ``page_size`` rows is rendered, by default the user's
+    ``API_RESULT_PAGE_SIZE``. The rows are sorted by the
+    :attr:`~horizon.tables.Column.sort_key` of the column named in the
+    table's ``sort_param`` query parameter, and the column headers link to
+    the sorted pages.
+
+    The data is kept in the Django cache for ``snapshot_timeout`` seconds per
+    user, page and server filter, so moving between pages or sorting again
+    does not fetch it again, and neither does submitting the table filter:
+    the :class:`~horizon.utils.filter_index.FilterIndex` of the fields the
+    filter queried is cached with the data. Loading the table without a
+    marker or sort order fetches fresh data, and so does a table action, as
+    it changes the data. The data is cached as returned by
+    :meth:`dump_snapshot_data`, which must be picklable; when it is not the
+    data is fetched for each page.
+    """
+    page_size = None
+    snapshot_timeout = 300
+
+    def get_page_size(self):
+        return self.page_size or functions.get_page_size(self.request)
+
+    def dump_snapshot_data(self, data):
+        """Returns ``data`` as the plain data cached in the snapshot.
+
+        API objects may hold their client, so views should return plain
+        values, e.g. the ``to_dict()`` of each object, and rebuild the
+        objects in :meth:`load_snapshot_data`. By default ``data`` is cached
+        as it is.
+        """
+        return data
+
+    def load_snapshot_data(self, data):
+        """Returns the objects of ``data`` from :meth:`dump_snapshot_data`."""
+        return data
+
+    def get_snapshot_key(self, table):
+        """Returns the cache key of the data snapshot of ``table``."""
+        user = self.request.user
+        token = getattr(user, 'token', None)
+        parts = [getattr(user, 'id', None), getattr(token, 'id', None),
+                 self.request.path, table.name]
+        filter_info = self.get_server_filter_info(self.request, table)
+        if filter_info is not None:
+            parts.extend([filter_info['field'], filter_info['value']])
+        digest = hashlib.sha256(
+            u'\0'.join(six.text_type(part) for part in parts).encode('utf-8'))
+        return 'horizon:table_snapshot:%s' % digest.hexdigest()
+
+    def _get_data_dict(self):
+        if not self._data:
+            self.update_server_filter_action(self.request)
+            table = self.get_table()
+            self.set_table_sorting(table)
+            data = self._get_snapshot_data(table)
+            data = self.sort_data(table, data)
+            self._data = {table.name: self.paginate_data(table, data)}
+        return self._data
+
+    def _get_snapshot_data(self, table):
+        meta = table._meta
+        key = self.get_snapshot_key(table)
+        table_name, action_name, obj_id = table.check_handler(self.request)
+        if self.request.method != 'GET' and action_name:
+            cache.delete(key)
+            return self._fetch_snapshot_data(table, key, cache_data=False)
+        # A POST without an action only submits the table filter.
+        if self.request.method != 'GET' or any(
+                self.request.GET.get(param) for param in
+                (meta.pagination_param, meta.prev_pagination_param,
+                 meta.sort_param)):
+            snapshot = cache.get(key)
+            if snapshot is not None:
+                table.data = list(self.load_snapshot_data(snapshot['data']))
+                index = filter_index.FilterIndex(table.data,
+                                                 snapshot['fields'])
+                table.set_filter_index(index)
+                data = self._filter_snapshot_data(table)
+                # Keep the index of the fields the filter queried.
+                if len(index.fields) > len(snapshot['fields']):
+                    self._cache_snapshot(table, key)
+                return data
+        return self._fetch_snapshot_data(table, key)
+
+    def _fetch_snapshot_data(self, table, key, cache_data=True):
+        table.data = list(self.get_data())
+        # The index is built before the filter queries it, so that the index
+        # of the queried fields is cached with the data.
+        table.get_filter_index()
+        data = self._filter_snapshot_data(table)
+        if cache_data and table.data:
+            self._cache_snapshot(table, key)
+        return data
+
+    def _cache_snapshot(self, table, key):
+        try:
+            # The index is cached without its data, which is cached as plain
+            # data.
+            snapshot = {'data': self.dump_snapshot_data(table.data),
+                        'fields': table.get_filter_index().fields}
+            cache.set(key, snapshot, self.snapshot_timeout)
+        except Exception:
+            LOG.warning("Unable to cache the data of table %s.",
+                        table.name, exc_info=True)
+
+    def _filter_snapshot_data(self, table):
+        # The table filter runs on the whole data set, and again on the page
+        # once the page is handed to the table.
+        data = list(table.filtered_data)
+        del table._filtered_data
+        return data
+
+    def set_table_sorting(self, table):
+        """Reads the sort order of ``table`` from the request."""
+        table.server_sorting = True
+        sort = self.request.GET.get(table._meta.sort_param, '')
+        column = table.columns.get(sort.lstrip('-'))
+        if column is not None and column.sortable:
+            table.sort_column = column.name
+            table.sort_descending = sort.startswith('-')
+
+    def sort_data(self, table, data):
+        """Returns ``data`` sorted by the sort column of ``table``."""
+        if not table.sort_column:
+            return data
+        column = table.columns[table.sort_column]
+        values = [column.get_sort_value(datum) for datum in data]
+
+        def sort_key(pos):
+            value = values[pos]
+            if isinstance(value, six.string_types):
+                value = value.lower()
+            # Empty values come last in ascending order.
+            return value is None, value
+
+        positions = range(len(data))
+        try:
+            positions = sorted(positions, key=sort_key,
+                               reverse=table.sort_descending)
+        except TypeError:
+            # Values of different types, fall back to their text.
+            values = [None if value is None else six.text_type(value)
+                      for value in values]
+            positions = sorted(positions, key=sort_key,
+                               reverse=table.sort_descending)
+        return [data[pos] for pos in positions]
+
+    def paginate_data(self, table, data):
+        """Returns the page of ``data`` selected by the request's marker."""
+        page_size = self.get_page_size()
+        marker, direction = self._get_marker()
+        start = 0
+        if marker:
+            ids = [six.text_type(table.get_object_id(datum))
+                   for datum in data]
+            # An unknown marker, e.g. of a deleted object, shows the first
+            # page.
+            if marker in ids:
+                if direction == "desc":
+                    start = ids.index(marker) + 1
+                else:
+                    start = max(ids.index(marker) - page_size, 0)
+        self._has_prev_data = start > 0
+        self._has_more_data = start + page_size < len(data)
+        return data[start:start + page_size]
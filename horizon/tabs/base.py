@@ -13,6 +13,7 @@
 #    under the License.
 
 from collections import OrderedDict
+import functools
 import sys
 
 import six
@@ -21,6 +22,7 @@ from django.template.loader import render_to_string
 from django.template import TemplateSyntaxError
 
 from horizon import exceptions
+from horizon.utils import concurrency
 from horizon.utils import html
 
 SEPARATOR = "__"
@@ -76,12 +78,28 @@ class TabGroup(html.HTMLElement):
         Read-only property which is set to the value of the current active tab.
         This may not be the same as the value of ``selected`` if no
         specific tab was requested via the ``GET`` parameter.
+
+    .. attribute:: load_concurrently
+
+        Boolean to control whether the data of the preloaded tabs is loaded
+        concurrently, on the thread pool shared by the process. This is
+        worth it when several tabs are preloaded and each makes its own API
+        calls. The errors of each tab are still handled on the request
+        thread.
+        Default: ``False``
+
+    .. attribute:: max_workers
+
+        The maximum number of tabs loaded at the same time when
+        ``load_concurrently`` is ``True``. Default: ``4``
     """
     slug = None
     template_name = "horizon/common/_tab_group.html"
     param_name = 'tab'
     sticky = False
     show_single_tab = False
+    load_concurrently = False
+    max_workers = 4
     _selected = None
     _active = None
 
@@ -118,13 +136,24 @@ class TabGroup(html.HTMLElement):
 
     def load_tab_data(self):
         """Preload all data that for the tabs that will be displayed."""
-        for tab in self._tabs.values():
-            if tab.load and not tab.data_loaded:
-                try:
-                    tab._data = tab.get_context_data(self.request)
-                except Exception:
-                    tab._data = False
-                    exceptions.handle(self.request)
+        tabs = [tab for tab in self._tabs.values()
+                if tab.load and not tab.data_loaded]
+        if self.load_concurrently and len(tabs) > 1:
+            futures = concurrency.run_concurrently(
+                self.request,
+                [functools.partial(tab.get_context_data, self.request)
+                 for tab in tabs],
+                max_workers=self.max_workers)
+            loaders = [future.result for future in futures]
+        else:
+            loaders = [functools.partial(tab.get_context_data, self.request)
+                       for tab in tabs]
+        for tab, load in zip(tabs, loaders):
+            try:
+                tab._data = load()
+            except Exception:
+                tab._data = False
+                exceptions.handle(self.request)
 
     def get_id(self):
         """Returns the id for this tab group.
@@ -423,8 +452,21 @@ class TableTab(Tab):
         :class:`~horizon.tables.MultiTableView`. For each table class you
         need to define a corresponding ``get_{{ table_name }}_data`` method
         as with :class:`~horizon.tables.MultiTableView`.
+
+    .. attribute:: load_concurrently
+
+        Boolean to control whether the ``get_{{ table_name }}_data`` methods
+        are called concurrently, as with
+        :class:`~horizon.tables.MultiTableView`. Default: ``False``
+
+    .. attribute:: max_workers
+
+        The maximum number of data methods called at the same time when
+        ``load_concurrently`` is ``True``. Default: ``4``
     """
     table_classes = None
+    load_concurrently = False
+    max_workers = 4
 
     def __init__(self, tab_group, request):
         super(TableTab, self).__init__(tab_group, request)
@@ -446,6 +488,7 @@ class TableTab(Tab):
         """
         # We only want the data to be loaded once, so we track if we have...
         if not self._table_data_loaded:
+            data_funcs = []
             for table_name, table in self._tables.items():
                 # Fetch the data function.
                 func_name = "get_%s_data" % table_name
@@ -456,7 +499,14 @@ class TableTab(Tab):
                         "You must define a %(func_name)s method on"
                         " %(cls_name)s."
                         % {'func_name': func_name, 'cls_name': cls_name})
+                data_funcs.append(data_func)
+
+            if self.load_concurrently:
+                futures = concurrency.run_concurrently(
+                    self.request, data_funcs, max_workers=self.max_workers)
+                data_funcs = [future.result for future in futures]
 
+            for table, data_func in zip(self._tables.values(), data_funcs):
                 # Load the data.
                 table.data = data_func()
                 table._meta.has_prev_data = self.has_prev_data(table)
@@ -13,12 +13,15 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
+
 from compressor.signals import post_compress
 from django.contrib.staticfiles import finders
 from django.core.cache import caches
 from django.core.cache.utils import make_template_fragment_key
 from django.dispatch import receiver
 from django import template
+from django.utils.safestring import mark_safe
 
 register = template.Library()
 
@@ -76,6 +79,14 @@ def angular_escapes(value):
         .replace("\r", "\\r")
 
 
+def _to_script_json(value):
+    """Serializes ``value`` as JSON which can be included in a script tag."""
+    return mark_safe(json.dumps(value, sort_keys=True)
+                     .replace('<', '\\u003c')
+                     .replace('>', '\\u003e')
+                     .replace('&', '\\u0026'))
+
+
 @register.inclusion_tag('angular/angular_templates.html', takes_context=True)
 def angular_templates(context):
     """Generate a dictionary of template contents for all static HTML templates.
@@ -91,6 +102,8 @@ def angular_templates(context):
      angular_templates: dictionary of angular template contents
       - key is the template's static path,
       - value is a string of HTML template contents
+     angular_templates_json: the same contents as a JSON object, to put
+      them all in the template cache from a single script
     """
     template_paths = context['HORIZON_CONFIG']['external_templates']
     all_theme_static_files = context['HORIZON_CONFIG']['theme_static_files']
@@ -124,5 +137,6 @@ def angular_templates(context):
     templates.sort(key=lambda item: item[0])
 
     return {
-        'angular_templates': templates
+        'angular_templates': templates,
+        'angular_templates_json': _to_script_json(angular_templates),
     }
@@ -26,6 +26,7 @@ from django.utils.translation import ugettext_lazy as _
 from horizon.base import Horizon
 from horizon import conf
 from horizon.contrib import bootstrap_datepicker
+from horizon.utils import js_catalog
 
 
 register = template.Library()
@@ -53,6 +54,22 @@ def has_permissions_on_list(components, user):
             in components if has_permissions(user, component)]
 
 
+def _panel_path(dashboard, panel):
+    return '%s/%s' % (dashboard.slug, panel.slug)
+
+
+def _get_allowed_panels(context, allowed, dashboard, group):
+    allowed_panels = []
+    for panel in group:
+        if _panel_path(dashboard, panel) not in allowed:
+            continue
+        if callable(panel.nav) and panel.nav(context):
+            allowed_panels.append(panel)
+        elif not callable(panel.nav) and panel.nav:
+            allowed_panels.append(panel)
+    return allowed_panels
+
+
 @register.inclusion_tag('horizon/_sidebar.html', takes_context=True)
 def horizon_nav(context):
     if 'request' not in context:
@@ -60,28 +77,23 @@ def horizon_nav(context):
     current_dashboard = context['request'].horizon.get('dashboard', None)
     current_panel_group = None
     current_panel = context['request'].horizon.get('panel', None)
+    allowed = Horizon.get_allowed_components(context)
     dashboards = []
     for dash in Horizon.get_dashboards():
         panel_groups = dash.get_panel_groups()
         non_empty_groups = []
         for group in panel_groups.values():
-            allowed_panels = []
-            for panel in group:
-                if (callable(panel.nav) and panel.nav(context) and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                elif (not callable(panel.nav) and panel.nav and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                if panel == current_panel:
-                    current_panel_group = group.slug
+            allowed_panels = _get_allowed_panels(context, allowed, dash,
+                                                 group)
+            if current_panel in group:
+                current_panel_group = group.slug
             if allowed_panels:
                 non_empty_groups.append((group, allowed_panels))
-        if (callable(dash.nav) and dash.nav(context) and
-                dash.can_access(context)):
+        if dash.slug not in allowed:
+            continue
+        if callable(dash.nav) and dash.nav(context):
             dashboards.append((dash, OrderedDict(non_empty_groups)))
-        elif (not callable(dash.nav) and dash.nav and
-                dash.can_access(context)):
+        elif not callable(dash.nav) and dash.nav:
             dashboards.append((dash, OrderedDict(non_empty_groups)))
     return {'components': dashboards,
             'user': context['request'].user,
@@ -97,9 +109,10 @@ def horizon_main_nav(context):
     if 'request' not in context:
         return {}
     current_dashboard = context['request'].horizon.get('dashboard', None)
+    allowed = Horizon.get_allowed_components(context)
     dashboards = []
     for dash in Horizon.get_dashboards():
-        if dash.can_access(context):
+        if dash.slug in allowed:
             if callable(dash.nav) and dash.nav(context):
                 dashboards.append(dash)
             elif dash.nav:
@@ -117,17 +130,12 @@ def horizon_dashboard_nav(context):
         return {}
     dashboard = context['request'].horizon['dashboard']
     panel_groups = dashboard.get_panel_groups()
+    allowed = Horizon.get_allowed_components(context)
     non_empty_groups = []
 
     for group in panel_groups.values():
-        allowed_panels = []
-        for panel in group:
-            if (callable(panel.nav) and panel.nav(context) and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-            elif (not callable(panel.nav) and panel.nav and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
+        allowed_panels = _get_allowed_panels(context, allowed, dashboard,
+                                             group)
         if allowed_panels:
             if group.name is None:
                 non_empty_groups.append((dashboard.name, allowed_panels))
@@ -171,6 +179,16 @@ def quotapercent(used, limit):
         return round((float(used) / float(limit)) * 100)
 
 
+@register.simple_tag
+def jsi18n_url(packages):
+    """Returns the versioned URL of the JavaScript catalog of ``packages``.
+
+    The catalog is in the current language, and the browsers can cache it
+    until its translations change.
+    """
+    return js_catalog.get_url(packages)
+
+
 class JSTemplateNode(template.Node):
     """Helper node for the ``jstemplate`` template tag."""
     def __init__(self, nodelist):
@@ -18,6 +18,8 @@
 #    under the License.
 
 from importlib import import_module
+import json
+import os
 
 import six
 from six import moves
@@ -25,15 +27,19 @@ from six import moves
 import django
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.core import urlresolvers
+from django.test.utils import override_settings
 
 import horizon
 from horizon import base
 from horizon import conf
+from horizon import manifest
 from horizon.test import helpers as test
 from horizon.test.test_dashboards.cats.dashboard import Cats
 from horizon.test.test_dashboards.cats.kittens.panel import Kittens
+from horizon.test.test_dashboards.cats.kittens import views as kittens_views
 from horizon.test.test_dashboards.cats.tigers.panel import Tigers
 from horizon.test.test_dashboards.dogs.dashboard import Dogs
 from horizon.test.test_dashboards.dogs.puppies.panel import Puppies
@@ -71,6 +77,12 @@ class RbacYesAccessPanel(horizon.Panel):
     slug = "rbac_panel_yes"
 
 
+class FakeToken(object):
+    def __init__(self, token_id):
+        self.id = token_id
+        self.expires = None
+
+
 class BaseHorizonTests(test.TestCase):
 
     def setUp(self):
@@ -238,6 +250,54 @@ class HorizonTests(BaseHorizonTests):
         iter(urlpatterns)
         reversed(urlpatterns)
 
+    def test_manifest(self):
+        data = manifest.build(base.Horizon)
+
+        self.assertIn(Cats.__module__, data['modules'])
+        self.assertEqual('%s.Kittens' % Kittens.__module__,
+                         data['components']['cats/kittens']['class'])
+        self.assertEqual(
+            [{'regex': '^$', 'name': 'index', 'kwargs': {},
+              'view': 'horizon.test.test_dashboards.cats.kittens.views'
+                      '.IndexView',
+              'initkwargs': {}}],
+            data['components']['cats/kittens']['urlpatterns'])
+
+        # The views are imported the first time they are called.
+        manifest.set_manifest(json.loads(json.dumps(data)))
+        self.addCleanup(manifest.set_manifest, None)
+        kittens = horizon.get_dashboard('cats').get_panel('kittens')
+        urlpatterns = kittens._get_default_urlpatterns()
+        self.assertEqual(['index'], [p.name for p in urlpatterns])
+        view = urlpatterns[0].callback
+        self.assertIsInstance(view, manifest.LazyView)
+        self.assertEqual((kittens_views.IndexView, {}),
+                         manifest._get_view_class(view.get_view()))
+
+    def test_manifest_outdated(self):
+        data = manifest.build(base.Horizon)
+        data['components']['cats/kittens']['class'] = 'other.Kittens'
+        manifest.set_manifest(data)
+        self.addCleanup(manifest.set_manifest, None)
+
+        kittens = horizon.get_dashboard('cats').get_panel('kittens')
+        urlpatterns = kittens._get_default_urlpatterns()
+        self.assertNotIsInstance(urlpatterns[0].callback, manifest.LazyView)
+
+    def test_manifest_source_modified(self):
+        data = manifest.build(base.Horizon)
+        sources = data['components']['cats/kittens']['sources']
+        self.assertEqual(['urls.py', 'views.py'],
+                         sorted(os.path.basename(path) for path in sources))
+        for path in sources:
+            sources[path] -= 1
+        manifest.set_manifest(data)
+        self.addCleanup(manifest.set_manifest, None)
+
+        kittens = horizon.get_dashboard('cats').get_panel('kittens')
+        urlpatterns = kittens._get_default_urlpatterns()
+        self.assertNotIsInstance(urlpatterns[0].callback, manifest.LazyView)
+
     def test_horizon_test_isolation_1(self):
         """Isolation Test Part 1: sets a value."""
         cats = horizon.get_dashboard("cats")
@@ -533,3 +593,32 @@ class RbacHorizonTests(test.TestCase):
                                  ['<Panel: rbac_panel_yes>'])
 
         self.assertTrue(dogs.can_access(context))
+
+    @override_settings(NAVIGATION_CACHE='default')
+    def test_allowed_components_cached(self):
+        cache.clear()
+        self.request.user.token = FakeToken('token')
+        context = {'request': self.request}
+
+        allowed = base.Horizon.get_allowed_components(context)
+
+        self.assertIn('dogs', allowed)
+        self.assertIn('dogs/rbac_panel_yes', allowed)
+        self.assertNotIn('cats', allowed)
+        self.assertNotIn('cats/rbac_panel_no', allowed)
+        key = base._get_navigation_key(self.request)
+        self.assertEqual(allowed, cache.get(key))
+
+        # The other requests made with the same token use the cached
+        # result instead of checking the access again.
+        cache.set(key, frozenset(['cats']))
+        request = self.factory.get('/')
+        request.user.token = self.request.user.token
+        allowed = base.Horizon.get_allowed_components({'request': request})
+        self.assertEqual(frozenset(['cats']), allowed)
+
+        # But not the ones made with another token.
+        request = self.factory.get('/')
+        request.user.token = FakeToken('other-token')
+        allowed = base.Horizon.get_allowed_components({'request': request})
+        self.assertIn('dogs', allowed)
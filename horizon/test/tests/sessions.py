@@ -0,0 +1,76 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.contrib.sessions import serializers
+from django.core.cache import cache
+from django.core import signing
+from django.test.utils import override_settings
+
+from horizon import sessions
+from horizon.test import helpers as test
+
+
+class FakeToken(object):
+    def __init__(self, token_id, catalog):
+        self.id = token_id
+        self.serviceCatalog = catalog
+
+
+@override_settings(
+    SESSION_SERIALIZER='django.contrib.sessions.serializers.PickleSerializer')
+class SessionStoreTests(test.TestCase):
+    catalog = [{'type': 'compute',
+                'endpoints': [{'url': 'http://nova.example.com:8774/v2.1',
+                               'interface': 'public'}] * 10}]
+
+    def setUp(self):
+        super(SessionStoreTests, self).setUp()
+        cache.clear()
+
+    def _save(self, **values):
+        session = sessions.SessionStore()
+        session.update(values)
+        session.save()
+        return session.session_key
+
+    def test_values_cached(self):
+        session_key = self._save(token=FakeToken('a', self.catalog),
+                                 user_id='u1', big='x' * 1000)
+
+        session = sessions.SessionStore(session_key)
+
+        self.assertEqual('u1', session['user_id'])
+        self.assertEqual('x' * 1000, session['big'])
+        self.assertEqual('a', session['token'].id)
+        self.assertEqual(self.catalog, session['token'].serviceCatalog)
+        self.assertLess(len(session_key), 1000)
+
+    def test_catalog_shared(self):
+        cookies = [
+            signing.loads(self._save(token=FakeToken(token_id, self.catalog)),
+                          serializer=serializers.PickleSerializer,
+                          salt='django.contrib.sessions.backends.'
+                               'signed_cookies')
+            for token_id in ('a', 'b')]
+
+        self.assertNotEqual(cookies[0]['token'].key, cookies[1]['token'].key)
+        self.assertEqual(cookies[0]['token'].attributes,
+                         cookies[1]['token'].attributes)
+
+    def test_values_evicted(self):
+        session_key = self._save(token=FakeToken('a', self.catalog),
+                                 user_id='u1')
+        cache.clear()
+
+        session = sessions.SessionStore(session_key)
+
+        self.assertNotIn('user_id', session)
@@ -15,12 +15,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django import forms
 from django import http
 from django import shortcuts
 from django.template import defaultfilters
 from django.test.utils import override_settings
+from django.utils import translation
 from django.utils.translation import ungettext_lazy
 
 from mox3.mox import IsA
@@ -128,6 +132,13 @@ class MyRow(tables.Row):
         return TEST_DATA_2[0]
 
 
+class MyBatchRow(MyRow):
+    ajax_batch = True
+
+    def get_data_list(self, request, obj_ids):
+        return [datum for datum in TEST_DATA if datum.id in obj_ids]
+
+
 class MyBatchAction(tables.BatchAction):
     name = "batch"
 
@@ -1132,6 +1143,28 @@ class DataTableTests(test.TestCase):
                                   u'FakeObject: öbject_4'],
                                  transform=six.text_type)
 
+    def test_batch_row_update(self):
+        class MyBatchUpdateTable(MyTable):
+            class Meta(object):
+                name = "my_table"
+                columns = ('id', 'name', 'value', 'optional', 'status')
+                row_class = MyBatchRow
+
+        self.table = MyBatchUpdateTable(self.request, TEST_DATA)
+        row = self.table.get_rows()[0]
+        self.assertEqual('?action=rows_update&table=my_table',
+                         row.attrs['data-batch-update-url'])
+
+        url = '/my_url/?table=my_table&action=rows_update&obj_id=1&obj_id=5'
+        req = self.factory.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyBatchUpdateTable(req)
+        resp = self.table.maybe_preempt()
+        self.assertEqual(200, resp.status_code)
+        rows = json.loads(resp.content.decode('utf-8'))['rows']
+        # The missing object is left out to have its row removed.
+        self.assertEqual(['1'], list(rows))
+        self.assertIn('id="my_table__row__1"', rows['1'])
+
     def test_inline_edit_update_action_get_non_ajax(self):
         # Non ajax inline edit request should return None.
         url = ('/my_url/?action=cell_update'
@@ -1459,6 +1492,90 @@ class SingleTableViewWithPermissions(SingleTableView):
     table_class = TableWithPermissions
 
 
+class StreamingTableView(SingleTableView):
+    stream_tables = True
+    stream_chunk_size = 2
+
+
+class DeltaTableView(SingleTableView):
+    delta_refresh = True
+    delta_timestamp_attr = 'optional'
+
+
+class LocalPagedTableView(tables.LocalPagedTableMixin, SingleTableView):
+    page_size = 2
+
+    def dump_snapshot_data(self, data):
+        return [(datum.id, datum.name, datum.value, datum.status)
+                for datum in data]
+
+    def load_snapshot_data(self, data):
+        return [FakeObject(*values) for values in data]
+
+
+class LocalPagedFilterTable(tables.DataTable):
+    name = tables.Column('name')
+
+    class Meta(object):
+        name = "my_table"
+        table_actions = (tables.NameFilterAction,)
+
+
+class LocalPagedFilterTableView(LocalPagedTableView):
+    table_class = LocalPagedFilterTable
+
+
+class MyNDJSONExportAction(tables.ExportAction):
+    name = "export_ndjson"
+    export_format = "ndjson"
+
+
+class ExportTable(tables.DataTable):
+    id = tables.Column('id', hidden=True)
+    name = tables.Column('name')
+    value = tables.Column('value')
+
+    class Meta(object):
+        name = "export_table"
+        table_actions = (tables.ExportAction, MyNDJSONExportAction)
+        row_actions = (MyAction,)
+
+
+class ExportTableView(SingleTableView):
+    table_class = ExportTable
+
+
+class PagedExportTableView(ExportTableView):
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        super(PagedExportTableView, self).__init__(*args, **kwargs)
+        # Some tests change the objects of TEST_DATA.
+        self.objects = [FakeObject('1', 'object_1', 'value_1', 'up'),
+                        FakeObject('2', 'object_2', '<strong>evil</strong>',
+                                   'down'),
+                        FakeObject('3', 'object_3', 'value_3', 'up'),
+                        FakeObject('4', u'öbject_4', u'välue_1', u'üp')]
+
+    def get_data(self):
+        self.calls += 1
+        ids = [datum.id for datum in self.objects]
+        marker = self.export_marker
+        start = ids.index(marker) + 1 if marker else 0
+        self._more = start + 2 < len(self.objects)
+        return self.objects[start:start + 2]
+
+    def has_more_data(self, table):
+        return self._more
+
+
+class FailingExportTableView(PagedExportTableView):
+    def get_data(self):
+        if self.calls:
+            raise Exception("Expected failure.")
+        return super(FailingExportTableView, self).get_data()
+
+
 class MultiTableView(tables.MultiTableView):
     table_classes = (TableWithPermissions, MyTable)
 
@@ -1469,6 +1586,17 @@ class MultiTableView(tables.MultiTableView):
         return TEST_DATA
 
 
+class ConcurrentMultiTableView(MultiTableView):
+    load_concurrently = True
+
+    def get_table_with_permissions_data(self):
+        self.language = translation.get_language()
+        return TEST_DATA
+
+    def get_my_table_data(self):
+        return TEST_DATA_2
+
+
 class DataTableViewTests(test.TestCase):
     def _prepare_view(self, cls, *args, **kwargs):
         req = self.factory.get('/my_url/')
@@ -1485,6 +1613,189 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(SingleTableView.table_class,
                          context['table'].__class__)
 
+    def test_data_table_view_streaming(self):
+        view = self._prepare_view(StreamingTableView)
+        response = view.get(view.request)
+        self.assertTrue(response.streaming)
+        chunks = [six.text_type(chunk, 'utf-8')
+                  for chunk in response.streaming_content]
+        content = u"".join(chunks)
+        self.assertNotIn(view.table.row_stream_marker, content)
+        # Page head, two chunks of two rows each and the page tail.
+        self.assertEqual(4, len(chunks))
+        for datum in TEST_DATA:
+            self.assertIn('id="my_table__row__%s"' % datum.id, content)
+        self.assertIn(u'Displaying 4 items', content)
+        self.assertLess(content.index('table_column_header'),
+                        content.index('my_table__row__1'))
+
+    def test_data_table_view_delta_url(self):
+        view = self._prepare_view(DeltaTableView)
+        view.construct_tables()
+        self.assertIsNotNone(view.table.delta_since)
+        content = view.table.render()
+        self.assertIn('data-delta-url="/my_url/?action=table_delta&amp;'
+                      'table=my_table"', content)
+
+    def test_data_table_view_delta(self):
+        view = self._prepare_view(DeltaTableView)
+        view.request = self.factory.get(
+            '/my_url/',
+            {'table': 'my_table', 'action': 'table_delta',
+             'since': '2017-06-01T00:00:00Z'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        view.request.user = self.user
+        view.get_data = lambda: [
+            FakeObject('1', 'object_1', 'value_1', 'up',
+                       '2017-05-31T23:00:00Z'),
+            FakeObject('2', 'object_2', 'value_2', 'up',
+                       '2017-06-01T01:00:00Z'),
+        ]
+        resp = view.construct_tables()
+        self.assertEqual(200, resp.status_code)
+        delta = json.loads(resp.content.decode('utf-8'))
+        # Only the object changed after "since" is rendered.
+        self.assertEqual(['2'], [obj_id for obj_id, row in delta['rows']])
+        self.assertIn('my_table__row__2', delta['rows'][0][1])
+        self.assertEqual(['1', '2'], delta['ids'])
+        self.assertEqual([], delta['deleted'])
+        self.assertTrue(delta['since'].endswith('Z'))
+
+    def test_data_table_view_delta_requires_since(self):
+        view = self._prepare_view(DeltaTableView)
+        view.request = self.factory.get(
+            '/my_url/', {'table': 'my_table', 'action': 'table_delta'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        view.request.user = self.user
+        resp = view.construct_tables()
+        self.assertEqual(400, resp.status_code)
+
+    def _get_local_paged_table(self, params, get_data):
+        view = self._prepare_view(LocalPagedTableView)
+        view.request = self.factory.get('/my_url/', params)
+        view.request.user = self.user
+        view.get_data = get_data
+        view.construct_tables()
+        return view.table
+
+    def test_local_paged_table_view(self):
+        cache.clear()
+        table = self._get_local_paged_table({}, lambda: TEST_DATA)
+        self.assertTrue(table.server_sorting)
+        self.assertEqual(['1', '2'], [obj.id for obj in table.data])
+        self.assertFalse(table.has_prev_data())
+        self.assertTrue(table.has_more_data())
+        self.assertEqual('marker=2', table.get_pagination_string())
+        self.assertIn('data-server-sorting="true"', table.render())
+
+        table = self._get_local_paged_table({'marker': '2'},
+                                            lambda: TEST_DATA)
+        self.assertEqual(['3', '4'], [obj.id for obj in table.data])
+        self.assertTrue(table.has_prev_data())
+        self.assertFalse(table.has_more_data())
+
+    def test_local_paged_table_view_sorting(self):
+        cache.clear()
+        table = self._get_local_paged_table({'sort': '-value'},
+                                            lambda: TEST_DATA)
+        self.assertEqual('value', table.sort_column)
+        self.assertTrue(table.sort_descending)
+        self.assertEqual(['4', '3'], [obj.id for obj in table.data])
+        self.assertEqual('marker=3&sort=-value',
+                         table.get_pagination_string())
+        # Sorting again by the same column reverses the order.
+        self.assertEqual('sort=value',
+                         table.columns['value'].get_sort_string())
+        self.assertEqual('sort=status',
+                         table.columns['status'].get_sort_string())
+
+    def test_local_paged_table_view_snapshot(self):
+        cache.clear()
+        self._get_local_paged_table({}, lambda: TEST_DATA)
+
+        def get_data():
+            self.fail("The data should be read from the snapshot.")
+
+        table = self._get_local_paged_table({'marker': '2', 'sort': 'name'},
+                                            get_data)
+        self.assertEqual(['3', '4'], [obj.id for obj in table.data])
+        # The objects are rebuilt from the plain data of the snapshot.
+        self.assertNotIn(table.data[0], TEST_DATA)
+        self.assertEqual('object_3', table.data[0].name)
+
+    def test_local_paged_table_view_filter(self):
+        cache.clear()
+        view = self._prepare_view(LocalPagedFilterTableView)
+        view.get_data = lambda: TEST_DATA
+        view.construct_tables()
+        key = view.get_snapshot_key(view.table)
+
+        def get_data():
+            self.fail("The data should be read from the snapshot.")
+
+        view = self._prepare_view(LocalPagedFilterTableView)
+        view.request = self.factory.post('/my_url/',
+                                         {'my_table__filter__q': 'object_3'})
+        view.request.user = self.user
+        view.get_data = get_data
+        view.construct_tables()
+        self.assertEqual(['3'], [obj.id for obj in view.table.data])
+        # The index of the names is cached with the data.
+        self.assertEqual(['name'], list(cache.get(key)['fields']))
+
+    def test_local_paged_table_view_sort_links(self):
+        cache.clear()
+        table = self._get_local_paged_table(
+            {'marker': '2', 'sort': 'name', 'q': 'object'}, lambda: TEST_DATA)
+        # The other parameters are kept, and the sorted table starts at its
+        # first page.
+        self.assertEqual('q=object&sort=value',
+                         table.columns['value'].get_sort_query_string())
+        self.assertEqual('q=object&sort=-name',
+                         table.columns['name'].get_sort_query_string())
+
+    def _export(self, cls, action):
+        view = self._prepare_view(cls)
+        view.request = self.factory.get(
+            '/my_url/', {'table': 'export_table', 'action': action})
+        view.request.user = self.user
+        resp = view.construct_tables()
+        self.assertTrue(resp.streaming)
+        content = b"".join(resp.streaming_content).decode('utf-8')
+        return view, resp, content
+
+    def test_data_table_view_export_csv(self):
+        view, resp, content = self._export(ExportTableView, 'export')
+        self.assertEqual('text/csv', resp['Content-Type'])
+        self.assertIn('filename="export_table.csv"',
+                      resp['Content-Disposition'])
+        lines = content.splitlines()
+        # The row actions column is not exported.
+        self.assertEqual(u'Id,Name,Value', lines[0])
+        self.assertEqual(u'2,object_2,<strong>evil</strong>', lines[2])
+        self.assertEqual(u'4,öbject_4,välue_1', lines[4])
+        self.assertEqual(5, len(lines))
+
+    def test_data_table_view_export_ndjson_paginated(self):
+        view, resp, content = self._export(PagedExportTableView,
+                                           'export_ndjson')
+        self.assertEqual('application/x-ndjson', resp['Content-Type'])
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(['1', '2', '3', '4'], [row['id'] for row in rows])
+        self.assertEqual(u'öbject_4', rows[3]['name'])
+        self.assertEqual(2, view.calls)
+
+    def test_data_table_view_export_error(self):
+        view, resp, content = self._export(FailingExportTableView, 'export')
+        lines = content.splitlines()
+        self.assertEqual([u'Id,Name,Value', u'1,object_1,value_1',
+                          u'2,object_2,<strong>evil</strong>'], lines[:3])
+        self.assertEqual(4, len(lines))
+        self.assertTrue(lines[3].startswith('Error:'))
+        # The marker of the pages is kept by the view, not in the request.
+        self.assertEqual('2', view.export_marker)
+        self.assertNotIn('marker', view.request.GET)
+
     def test_data_table_view_not_authorized(self):
         view = self._prepare_view(SingleTableViewWithPermissions)
         context = view.get_context_data()
@@ -1512,6 +1823,15 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(TableWithPermissions,
                          context['table_with_permissions_table'].__class__)
 
+    def test_multi_table_view_concurrent(self):
+        view = self._prepare_view(ConcurrentMultiTableView)
+        with translation.override('fr'):
+            data = view._get_data_dict()
+        self.assertEqual(list(TEST_DATA), data['table_with_permissions'])
+        self.assertEqual(list(TEST_DATA_2), data['my_table'])
+        # The data methods run with the language of the request.
+        self.assertEqual('fr', view.language)
+
     fil_value_param = "my_table__filter__q"
     fil_field_param = '%s_field' % fil_value_param
 
@@ -22,6 +22,7 @@ from django import http
 import six
 
 from horizon import exceptions
+from horizon import messages
 from horizon import middleware
 from horizon import tabs as horizon_tabs
 from horizon.test import helpers as test
@@ -110,6 +111,16 @@ class RedirectExceptionTab(horizon_tabs.Tab):
         raise exc
 
 
+class MessageTab(horizon_tabs.Tab):
+    name = "Message Tab"
+    slug = "message_tab"
+    template_name = "_tab.html"
+
+    def get_context_data(self, request):
+        messages.warning(request, "Partial data.")
+        return {"tab": self}
+
+
 class TableTabGroup(horizon_tabs.TabGroup):
     slug = "tab_group"
     tabs = [TabWithTable]
@@ -323,6 +334,7 @@ class TabExceptionTests(test.TestCase):
     def tearDown(self):
         super(TabExceptionTests, self).tearDown()
         TabWithTableView.tab_group_class.tabs = self._original_tabs
+        TabWithTableView.tab_group_class.load_concurrently = False
 
     def test_tab_view_exception(self):
         TabWithTableView.tab_group_class.tabs.append(RecoverableErrorTab)
@@ -342,3 +354,37 @@ class TabExceptionTests(test.TestCase):
             resp = mw.process_exception(req, e)
             resp.client = self.client
         self.assertRedirects(resp, RedirectExceptionTab.url)
+
+    def test_tab_view_exception_concurrent(self):
+        TabWithTableView.tab_group_class.load_concurrently = True
+        TabWithTableView.tab_group_class.tabs.append(RecoverableErrorTab)
+        view = TabWithTableView.as_view()
+        req = self.factory.get("/")
+        res = view(req)
+        self.assertMessageCount(res, error=1)
+        # The other tab is loaded despite the error.
+        tab_group = res.context_data['tab_group']
+        self.assertTrue(tab_group.get_tab('tab_with_table').data)
+        self.assertFalse(tab_group.get_tab('recoverable_error_tab').data)
+
+    def test_tab_messages_concurrent(self):
+        TabWithTableView.tab_group_class.load_concurrently = True
+        TabWithTableView.tab_group_class.tabs.append(MessageTab)
+        view = TabWithTableView.as_view()
+        req = self.factory.get("/")
+        res = view(req)
+        # The message added from the worker thread reaches the request.
+        self.assertMessageCount(res, warning=1)
+
+    def test_tab_302_exception_concurrent(self):
+        TabWithTableView.tab_group_class.load_concurrently = True
+        TabWithTableView.tab_group_class.tabs.append(RedirectExceptionTab)
+        view = TabWithTableView.as_view()
+        req = self.factory.get("/")
+        mw = middleware.HorizonMiddleware()
+        try:
+            resp = view(req)
+        except Exception as e:
+            resp = mw.process_exception(req, e)
+            resp.client = self.client
+        self.assertRedirects(resp, RedirectExceptionTab.url)
@@ -16,13 +16,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
 import re
+import shutil
+import tempfile
 
 from django.conf import settings
 from django.template import Context
 from django.template import Template
 from django.utils.text import normalize_newlines
+import mock
 
+from horizon.templatetags import angular
 from horizon.test import helpers as test
 # The following imports are required to register the dashboards.
 from horizon.test.test_dashboards.cats.dashboard import Cats  # noqa: F401
@@ -133,6 +138,41 @@ class TemplateTagTests(test.TestCase):
                                             context={'test': ctx_string})
         self.assertEqual(expected, rendered_str)
 
+    def test_angular_templates(self):
+        static_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_dir)
+        for name, html in (('a.html', '<p>"a"</p>\n'),
+                           ('b.html', '<p>b</p>'),
+                           ('b_theme.html', '<script>b</script>')):
+            with open(os.path.join(static_dir, name), 'w') as f:
+                f.write(html)
+        finder = mock.Mock()
+        finder.find.side_effect = lambda path, all: [
+            os.path.join(static_dir, path)]
+        context = {
+            'STATIC_URL': '/static/',
+            'THEME': 'default',
+            'HORIZON_CONFIG': {
+                'external_templates': ['b.html', 'a.html'],
+                'theme_static_files': {'default': {
+                    'template_overrides': {'b.html': 'b_theme.html'}}},
+            },
+        }
+
+        with mock.patch.object(angular.finders, 'get_finders',
+                               return_value=[finder]):
+            result = angular.angular_templates(context)
+
+        self.assertEqual([('/static/a.html', '<p>"a"</p>\n'),
+                          ('/static/b.html', '<script>b</script>')],
+                         result['angular_templates'])
+        # The templates can't end the script including them.
+        self.assertEqual('{"/static/a.html": "\\u003cp\\u003e\\"a\\"'
+                         '\\u003c/p\\u003e\\n", '
+                         '"/static/b.html": "\\u003cscript\\u003eb'
+                         '\\u003c/script\\u003e"}',
+                         result['angular_templates_json'])
+
     def test_horizon_main_nav(self):
         text = "{% horizon_main_nav %}"
         expected = """
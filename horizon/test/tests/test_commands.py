@@ -18,6 +18,7 @@ from django.core.management import call_command
 from django.core.management import CommandError
 from django.test import TestCase
 
+from horizon.management.commands import compress_themes
 from horizon.management.commands import startdash
 from horizon.management.commands import startpanel
 
@@ -49,3 +50,38 @@ class CommandsTestCase(TestCase):
                                   files=[], no_color=False, pythonpath=None,
                                   settings=None, skip_checks=True, target=None,
                                   template=None, traceback=False, verbosity=1)
+
+
+class CompressThemesTestCase(TestCase):
+    contexts = [{'THEME': 'default'}, {'THEME': 'material'}]
+
+    @mock.patch.object(compress_themes, '_save_state')
+    @mock.patch.object(compress_themes.compress_cache,
+                       'write_offline_manifest')
+    @mock.patch.object(compress_themes.Command, '_compress_all')
+    @mock.patch.object(compress_themes, '_load_state')
+    @mock.patch.object(compress_themes, 'get_common_fingerprint',
+                       return_value='common')
+    @mock.patch.object(compress_themes, 'get_contexts')
+    def test_unchanged_themes_skipped(self, get_contexts, common, load_state,
+                                      compress_all, write_manifest,
+                                      save_state):
+        get_contexts.return_value = self.contexts
+        fingerprint = compress_themes.get_fingerprint('common',
+                                                      self.contexts[0])
+        load_state.return_value = {
+            'default': {'fingerprint': fingerprint,
+                        'manifest': {'a': 'default'}},
+            'material': {'fingerprint': 'outdated',
+                         'manifest': {'b': 'material'}},
+        }
+
+        def compress(contexts, todo, state, options):
+            for index in todo:
+                state[contexts[index]['THEME']]['manifest'] = {'c': 'new'}
+        compress_all.side_effect = compress
+
+        call_command('compress_themes')
+
+        self.assertEqual([1], compress_all.call_args[0][1])
+        write_manifest.assert_called_once_with({'a': 'default', 'c': 'new'})
@@ -10,6 +10,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import os
+import shutil
+import tempfile
 import unittest
 
 from horizon.utils import file_discovery as fd
@@ -250,3 +253,55 @@ class FinderTests(unittest.TestCase):
 
         self.assertTrue(templates[0].endswith('.html'))
         self.assertTrue(templates[1].endswith('.html'))
+
+
+class DiscoveryCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.static_path = os.path.join(self.root, 'static')
+        os.makedirs(os.path.join(self.static_path, 'a'))
+        for name in ('a.module.js', 'a.controller.js', 'a.html'):
+            open(os.path.join(self.static_path, 'a', name), 'w').close()
+        self.cache_path = os.path.join(self.root, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _discover(self):
+        cache = fd.DiscoveryCache(self.cache_path)
+        found = fd.discover_static_files(self.static_path, cache=cache)
+        cache.save()
+        return found
+
+    def test_discovery_reused(self):
+        found = self._discover()
+        self.assertEqual((['a/a.module.js', 'a/a.controller.js'], [], [],
+                          ['a/a.html']), found)
+
+        old_walk = fd.walk
+        fd.walk = None
+        try:
+            self.assertEqual(found, self._discover())
+        finally:
+            fd.walk = old_walk
+
+    def test_discovery_modified_directory(self):
+        self._discover()
+        a_path = os.path.join(self.static_path, 'a')
+        open(os.path.join(a_path, 'a.directive.js'), 'w').close()
+        # The modification time may not have changed on coarse filesystems.
+        mtime = os.stat(a_path).st_mtime
+        os.utime(a_path, (mtime + 10, mtime + 10))
+
+        sources = self._discover()[0]
+
+        self.assertEqual(['a/a.module.js', 'a/a.controller.js',
+                          'a/a.directive.js'], sources)
+
+    def test_discovery_unreadable_cache(self):
+        with open(self.cache_path, 'w') as f:
+            f.write('not json')
+
+        sources = self._discover()[0]
+
+        self.assertEqual(['a/a.module.js', 'a/a.controller.js'], sources)
@@ -14,18 +14,24 @@
 
 import datetime
 import os
+import pickle
+import shutil
+import tempfile
 
 from django.core.exceptions import ValidationError
 import django.template
 from django.template import defaultfilters
+import mock
 
 from horizon import forms
 from horizon.test import helpers as test
+from horizon.utils import filter_index
 from horizon.utils import filters
 # we have to import the filter in order to register it
 from horizon.utils.filters import parse_isotime  # noqa: F401
 from horizon.utils import functions
 from horizon.utils import memoized
+from horizon.utils import scss_filter
 from horizon.utils import secret_key
 from horizon.utils import units
 from horizon.utils import validators
@@ -320,6 +326,46 @@ class SecretKeyTests(test.TestCase):
         os.remove(key_file)
 
 
+class ScssCacheTests(test.TestCase):
+    def setUp(self):
+        super(ScssCacheTests, self).setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.cache_dir, 'scss', 'entry.json')
+        self.sources = {'horizon/_variables.scss': '$a: 1px;'}
+        patcher = mock.patch.object(scss_filter, '_read_source',
+                                    side_effect=self.sources.get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        super(ScssCacheTests, self).tearDown()
+        shutil.rmtree(self.cache_dir)
+
+    def test_cached(self):
+        scss_filter.set_cached(self.cache_path, dict(self.sources),
+                               'p { margin: 1px; }')
+
+        self.assertEqual('p { margin: 1px; }',
+                         scss_filter.get_cached(self.cache_path))
+
+    def test_cached_import_changed(self):
+        scss_filter.set_cached(self.cache_path, dict(self.sources),
+                               'p { margin: 1px; }')
+        self.sources['horizon/_variables.scss'] = '$a: 2px;'
+
+        self.assertIsNone(scss_filter.get_cached(self.cache_path))
+
+    def test_cached_import_removed(self):
+        scss_filter.set_cached(self.cache_path, dict(self.sources),
+                               'p { margin: 1px; }')
+        self.sources.clear()
+
+        self.assertIsNone(scss_filter.get_cached(self.cache_path))
+
+    def test_not_cached(self):
+        self.assertIsNone(scss_filter.get_cached(self.cache_path))
+
+
 class FiltersTests(test.TestCase):
     def test_replace_underscore_filter(self):
         res = filters.replace_underscores("__under_score__")
@@ -399,6 +445,68 @@ class TimeSinceNeverFilterTests(test.TestCase):
         self.assertEqual(defaultfilters.timesince(now), t.render(c))
 
 
+class FilterIndexTests(test.TestCase):
+    def setUp(self):
+        super(FilterIndexTests, self).setUp()
+        self.data = [{'name': 'Web-Server 1', 'email': 'ops@example.org'},
+                     {'name': 'db server', 'email': None},
+                     {'name': None},
+                     {'name': 'webby', 'email': 'WEB@example.com'}]
+        self.index = filter_index.FilterIndex(self.data)
+
+    def _names(self, result):
+        return [datum['name'] for datum in result]
+
+    def test_contains(self):
+        self.assertEqual(['Web-Server 1', 'webby'],
+                         self._names(self.index.search('WEB', ['name'])))
+        self.assertEqual(['Web-Server 1', 'db server'],
+                         self._names(self.index.search('server', ['name'])))
+        self.assertEqual([], self.index.search('server 2', ['name']))
+
+    def test_contains_short_query(self):
+        self.assertEqual(['Web-Server 1', 'webby'],
+                         self._names(self.index.search('eb', ['name'])))
+
+    def test_empty_query_returns_all(self):
+        self.assertEqual(self.data, self.index.search('', ['name']))
+
+    def test_prefix(self):
+        self.assertEqual(['Web-Server 1', 'db server'],
+                         self._names(self.index.search('ser', ['name'],
+                                                       prefix=True)))
+        self.assertEqual([], self.index.search('erver', ['name'],
+                                               prefix=True))
+
+    def test_multiple_fields(self):
+        self.assertEqual(['webby'],
+                         self._names(self.index.search('example.com',
+                                                       ['name', 'email'])))
+
+    def test_pickle(self):
+        self.index.search('web', ['name'])
+        index = pickle.loads(pickle.dumps(self.index))
+        self.assertEqual(['Web-Server 1', 'webby'],
+                         self._names(index.search('web', ['name'])))
+
+    def test_cached_fields(self):
+        self.index.search('web', ['name'])
+        fields = pickle.loads(pickle.dumps(self.index.fields))
+        index = filter_index.FilterIndex(self.data, fields)
+        self.assertEqual(['name'], list(index.fields))
+        self.assertEqual(['Web-Server 1', 'webby'],
+                         self._names(index.search('web', ['name'])))
+
+    def test_scan_matches_index(self):
+        for query in ('WEB', 'server', 'server 2', 'eb', '', 'example.com'):
+            for prefix in (False, True):
+                self.assertEqual(
+                    self.index.search(query, ['name', 'email'],
+                                      prefix=prefix),
+                    filter_index.scan(self.data, query, ['name', 'email'],
+                                      prefix=prefix))
+
+
 class MemoizedTests(test.TestCase):
     def test_memoized_decorator_cache_on_next_call(self):
         values_list = []
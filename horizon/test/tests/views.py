@@ -14,8 +14,10 @@
 
 
 from horizon.test import helpers as test
+from horizon.utils import js_catalog
 from horizon import views
 
+from django.core.urlresolvers import reverse
 from django import forms
 from django.test import client
 from django.utils.translation import ugettext_lazy as _
@@ -100,3 +102,46 @@ class PageTitleTests(test.TestCase):
     def test_form_with_title(self):
         res = self._dispatch(FormWithTitle)
         self.assertEqual("A Title: myName", res.context_data['page_title'])
+
+
+class JavaScriptCatalogTests(test.TestCase):
+    def test_versioned_catalog(self):
+        url = js_catalog.get_url('horizon', 'en')
+
+        res = self.client.get(url)
+
+        self.assertEqual(200, res.status_code)
+        self.assertEqual(js_catalog.get_catalog('en', 'horizon')[1],
+                         res.content)
+        self.assertIn('max-age=%d' % js_catalog.MAX_AGE,
+                      res['Cache-Control'])
+
+    def test_catalog_packages_normalized(self):
+        self.assertEqual('horizon',
+                         js_catalog.get_packages('horizon+horizon+unknown'))
+
+    def test_unused_catalog_not_kept(self):
+        url = reverse('horizon:jsi18n_versioned',
+                      args=['horizon+django.conf', 'en', '0123456789ab'])
+
+        res = self.client.get(url)
+
+        self.assertEqual(200, res.status_code)
+        self.assertNotIn(('en', 'django.conf+horizon'), js_catalog._catalogs)
+
+    def test_outdated_catalog(self):
+        url = reverse('horizon:jsi18n_versioned',
+                      args=['horizon', 'en', '0123456789ab'])
+
+        res = self.client.get(url)
+
+        self.assertEqual(200, res.status_code)
+        self.assertNotIn('max-age', res.get('Cache-Control', ''))
+
+    def test_unknown_language(self):
+        url = reverse('horizon:jsi18n_versioned',
+                      args=['horizon', 'xx-unknown', '0123456789ab'])
+
+        res = self.client.get(url)
+
+        self.assertEqual(404, res.status_code)
@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 from django import forms
 from django import http
 import mock
@@ -146,6 +148,12 @@ class TestWorkflow(workflows.Workflow):
     default_steps = (TestStepOne, TestStepTwo)
 
 
+class TestConcurrentWorkflow(workflows.Workflow):
+    slug = "test_concurrent_workflow"
+    default_steps = (TestStepOne, TestStepTwo)
+    load_concurrently = True
+
+
 class TestWorkflowView(workflows.WorkflowView):
     workflow_class = TestWorkflow
     template_name = "workflow.html"
@@ -176,6 +184,7 @@ class WorkflowsTests(test.TestCase):
 
     def _reset_workflow(self):
         TestWorkflow._cls_registry = set([])
+        TestConcurrentWorkflow._cls_registry = set([])
 
     def test_workflow_construction(self):
         TestWorkflow.register(TestExtraStep)
@@ -359,3 +368,42 @@ class WorkflowsTests(test.TestCase):
 
         flow = TestWorkflow(req, entry_point="test_action_two")
         self.assertEqual("test_action_two", flow.get_entry_point())
+
+    def test_workflow_load_concurrently(self):
+        threads = []
+
+        def populate(action, request, context):
+            threads.append(threading.current_thread())
+            return [(PROJECT_ID, "test_project")]
+
+        with mock.patch.object(TestActionOne, 'populate_project_id_choices',
+                               populate):
+            flow = TestConcurrentWorkflow(self.request)
+
+        action = flow.get_step("test_action_one").action
+        self.assertEqual([(PROJECT_ID, "test_project")],
+                         action.fields['project_id'].choices)
+        self.assertEqual([(self.request.user.id,
+                           self.request.user.username)],
+                         action.fields['user_id'].choices)
+        self.assertEqual(1, len(threads))
+        self.assertNotEqual(threading.current_thread(), threads[0])
+
+    def test_workflow_load_concurrently_exception(self):
+        def populate(action, request, context):
+            raise exceptions.NotFound()
+
+        with mock.patch.object(TestActionOne, 'populate_project_id_choices',
+                               populate):
+            self.assertRaises(exceptions.NotFound,
+                              TestConcurrentWorkflow, self.request)
+
+    def test_membership_changes_field(self):
+        field = workflows.base.MembershipChangesField(required=False)
+
+        self.assertEqual([], field.clean(''))
+        self.assertEqual([('user', 'role')],
+                         field.clean('[["user", "role"]]'))
+        self.assertRaises(forms.ValidationError, field.clean, '[["user"]]')
+        self.assertRaises(forms.ValidationError, field.clean, '[["a", 1]]')
+        self.assertRaises(forms.ValidationError, field.clean, 'user')
@@ -17,6 +17,7 @@
 Allows Dynamic Theme Loading.
 """
 
+import contextlib
 import io
 import os
 import threading
@@ -25,6 +26,7 @@ import django
 from django.conf import settings
 from django.core.exceptions import SuspiciousFileOperation
 from django.template.engine import Engine
+from django.template.loaders import cached
 from django.template.loaders.base import Loader as tLoaderCls
 from django.utils._os import safe_join
 
@@ -37,6 +39,9 @@ else:
 # Local thread storage to retrieve the currently set theme
 _local = threading.local()
 
+# The themes by name, along with the list of themes they were indexed from
+_theme_index = (None, {})
+
 
 # Get the themes from settings
 def get_selectable_themes():
@@ -68,11 +73,59 @@ def get_default_theme():
 
 # Find the theme tuple
 def find_theme(theme_name):
-    for each_theme in get_themes():
-        if theme_name == each_theme[0]:
-            return each_theme
+    global _theme_index
+    themes = get_themes()
+    indexed_themes, index = _theme_index
+    # The index is rebuilt whenever the setting is replaced, as in tests.
+    if indexed_themes is not themes:
+        index = {}
+        for each_theme in themes:
+            index.setdefault(each_theme[0], each_theme)
+        _theme_index = (themes, index)
+
+    return index.get(theme_name)
+
+
+# Get the theme active in the current thread, if any
+def get_active_theme():
+    return getattr(_local, 'theme', None)
+
+
+# Get the tuple of the theme the templates are loaded from
+def get_template_theme():
+    # If the cookie doesn't exist, use the default theme
+    this_theme = find_theme(getattr(_local, 'theme', get_default_theme()))
 
-    return None
+    # If the theme is not valid, check the default theme ...
+    if not this_theme:
+        this_theme = find_theme(get_default_theme())
+
+    return this_theme
+
+
+@contextlib.contextmanager
+def override_theme(theme):
+    """Activates ``theme`` for the current thread within the block.
+
+    This is needed wherever templates are rendered outside of the
+    request/response cycle covered by :class:`ThemeMiddleware`, e.g.
+    while a streaming response is consumed or in a worker thread.
+    """
+    previous = get_active_theme()
+    if theme is None:
+        yield
+        return
+    _local.theme = theme
+    try:
+        yield
+    finally:
+        if previous is None:
+            try:
+                delattr(_local, 'theme')
+            except AttributeError:
+                pass
+        else:
+            _local.theme = previous
 
 
 # Offline Context Generator
@@ -126,20 +179,7 @@ class ThemeTemplateLoader(tLoaderCls):
     is_usable = True
 
     def get_template_sources(self, template_name):
-
-        # If the cookie doesn't exist, set it to the default theme
-        default_theme = get_default_theme()
-        theme = getattr(_local, 'theme', default_theme)
-        this_theme = find_theme(theme)
-
-        # If the theme is not valid, check the default theme ...
-        if not this_theme:
-            this_theme = find_theme(get_default_theme())
-
-            # If the theme is still not valid, then move along ...
-            # these aren't the templates you are looking for
-            if not this_theme:
-                pass
+        this_theme = get_template_theme()
 
         try:
             # To support themes residing outside of Django, use os.path.join to
@@ -180,5 +220,21 @@ class ThemeTemplateLoader(tLoaderCls):
         raise TemplateDoesNotExist(template_name)
 
 
+class CachedThemeTemplateLoader(cached.Loader):
+    """Cached loader keeping the templates of each theme apart.
+
+    It wraps :class:`ThemeTemplateLoader`, whose templates depend on the
+    theme of the current thread, so that they are compiled once per theme
+    instead of on each lookup, while the users switching themes still get
+    the templates of their theme.
+    """
+
+    def cache_key(self, template_name, *args, **kwargs):
+        key = super(CachedThemeTemplateLoader, self).cache_key(
+            template_name, *args, **kwargs)
+        this_theme = get_template_theme()
+        return '%s:%s' % (this_theme[0] if this_theme else '', key)
+
+
 e = Engine()
 _loader = ThemeTemplateLoader(e)
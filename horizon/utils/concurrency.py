@@ -0,0 +1,180 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+import logging
+import threading
+import time
+
+from django.utils import translation
+import futurist
+from futurist import waiters
+
+from horizon import conf
+from horizon import messages
+from horizon import themes
+
+
+LOG = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Local thread storage telling whether the thread is one of our workers
+_local = threading.local()
+
+_context_captures = []
+
+
+def register_context(capture):
+    """Registers a function carrying thread-local state into the workers.
+
+    ``capture`` is called on the thread submitting the calls. It returns
+    ``None``, or a function returning a context manager which is entered
+    around each call in the worker thread. This is how the language, the
+    theme and the profiler trace of the request follow the calls into the
+    workers.
+    """
+    _context_captures.append(capture)
+
+
+@contextlib.contextmanager
+def _language(language):
+    translation.activate(language)
+    try:
+        yield
+    finally:
+        translation.deactivate()
+
+
+def _capture_language():
+    language = translation.get_language()
+    return lambda: _language(language)
+
+
+def _capture_theme():
+    theme = themes.get_active_theme()
+    return lambda: themes.override_theme(theme)
+
+
+register_context(_capture_language)
+register_context(_capture_theme)
+
+
+def get_executor():
+    """Returns the thread pool shared by the whole process.
+
+    Its size is the ``concurrency_max_workers`` of ``HORIZON_CONFIG``.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = conf.HORIZON_CONFIG['concurrency_max_workers']
+            _executor = futurist.ThreadPoolExecutor(max_workers=max_workers)
+        return _executor
+
+
+def in_worker():
+    """Returns whether the current thread is running a concurrent call."""
+    return getattr(_local, 'in_worker', False)
+
+
+def _call_within(contexts, func):
+    if not contexts:
+        return func()
+    with contexts[0]():
+        return _call_within(contexts[1:], func)
+
+
+def _in_context(func, deferred, contexts):
+    def call():
+        _local.in_worker = True
+        with messages.defer_messages() as thread_deferred:
+            try:
+                return _call_within(contexts, func)
+            finally:
+                _local.in_worker = False
+                deferred.extend(thread_deferred)
+    return call
+
+
+def _call_inline(func):
+    future = futurist.Future()
+    try:
+        future.set_result(func())
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _cancelled():
+    future = futurist.Future()
+    future.cancel()
+    return future
+
+
+def run_concurrently(request, funcs, max_workers=None, stop_on=(),
+                     timeout=None):
+    """Calls each of ``funcs`` on the shared pool and waits for all of them.
+
+    Returns the futures of the calls, in the order of ``funcs``. The result
+    of a call, or the exception it raised, is given by the ``result()``
+    method of its future, so that errors can still be handled on the
+    request thread with :func:`horizon.exceptions.handle`. At most
+    ``max_workers`` of the calls run at the same time.
+
+    The calls which have not started yet are cancelled, their futures
+    raising ``CancelledError``, once a call raises one of the ``stop_on``
+    exceptions or ``timeout`` seconds have passed. The calls already
+    running are still waited for.
+
+    The calls run with the state registered by :func:`register_context`.
+    The messages they add to the request are kept aside and only added once
+    all the calls are done, in the order of ``funcs``.
+
+    When called from a worker itself, the calls are made one after the
+    other in the current thread, so that nested calls cannot exhaust the
+    pool while waiting for it.
+    """
+    if in_worker() or len(funcs) < 2:
+        return [_call_inline(func) for func in funcs]
+    deferred = [[] for func in funcs]
+    contexts = [context for context in
+                (capture() for capture in _context_captures)
+                if context is not None]
+    executor = get_executor()
+    max_workers = max_workers or len(funcs)
+    deadline = time.time() + timeout if timeout else None
+    pending = list(enumerate(funcs))
+    futures = [None] * len(funcs)
+    running = set()
+    while pending or running:
+        while pending and len(running) < max_workers:
+            index, func = pending.pop(0)
+            futures[index] = executor.submit(
+                _in_context(func, deferred[index], contexts))
+            running.add(futures[index])
+        wait_timeout = None
+        if pending and deadline is not None:
+            wait_timeout = max(deadline - time.time(), 0)
+        done, running = waiters.wait_for_any(running, timeout=wait_timeout)
+        stop = any(isinstance(future.exception(), stop_on)
+                   for future in done)
+        if pending and (stop or (deadline and time.time() >= deadline)):
+            LOG.debug("Cancelling %d calls which have not started yet.",
+                      len(pending))
+            for index, func in pending:
+                futures[index] = _cancelled()
+            pending = []
+    for func_deferred in deferred:
+        messages.add_deferred_messages(request, func_deferred)
+    return futures
@@ -10,7 +10,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
 import logging
+import os
 
 from os import path
 from os import walk
@@ -72,31 +74,118 @@ def sort_js_files(js_files):
     return sources, mocks, specs
 
 
-def discover_static_files(base_path, sub_path=''):
+class DiscoveryCache(object):
+    """Static files discovered by earlier processes, kept in a file.
+
+    The files discovered in a directory tree are reused as long as none of
+    its directories has been modified since, which is checked with their
+    modification time: adding, removing or renaming a file or a directory
+    modifies the directory containing it. Checking the modification time of
+    each directory is much cheaper than listing all the files of the tree.
+    """
+    VERSION = 1
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.entries = {}
+        self.modified = False
+        try:
+            with open(cache_path) as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.entries = data['entries']
+        except (IOError, OSError, ValueError, KeyError):
+            pass
+
+    @staticmethod
+    def _get_key(base_path, sub_path):
+        return '%s:%s' % (base_path, sub_path)
+
+    @staticmethod
+    def get_directories(top):
+        """Returns the directories of a tree with their modification times."""
+        directories = []
+        for root, dirs, files in walk(top):
+            try:
+                directories.append((root, os.stat(root).st_mtime))
+            except OSError:
+                pass
+        return directories
+
+    def get(self, base_path, sub_path=''):
+        """Returns the files found in a tree, or None if it was modified."""
+        entry = self.entries.get(self._get_key(base_path, sub_path))
+        if entry is None:
+            return None
+        for directory, mtime in entry['directories']:
+            try:
+                if os.stat(directory).st_mtime != mtime:
+                    return None
+            except OSError:
+                return None
+        return tuple(entry['files'])
+
+    def set(self, base_path, sub_path, directories, files):
+        self.entries[self._get_key(base_path, sub_path)] = {
+            'directories': directories,
+            'files': files,
+        }
+        self.modified = True
+
+    def save(self):
+        """Writes the cache file if something new was discovered."""
+        if not self.modified:
+            return
+        tmp_path = '%s.%d.tmp' % (self.cache_path, os.getpid())
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': self.VERSION, 'entries': self.entries},
+                          f)
+            os.rename(tmp_path, self.cache_path)
+            self.modified = False
+        except (IOError, OSError) as e:
+            LOG.warning("Unable to write the static files discovery cache "
+                        "%s: %s", self.cache_path, e)
+
+
+def discover_static_files(base_path, sub_path='', cache=None):
     """Discovers static files in given paths.
 
     It returns JavaScript sources, mocks, specs and HTML templates,
-    all grouped in lists.
+    all grouped in lists. When a :class:`DiscoveryCache` is given, the
+    files it found earlier are returned if the directories are unchanged.
     """
+    p = path.join(base_path, sub_path)
+    if cache is not None:
+        found = cache.get(base_path, sub_path)
+        if found is not None:
+            LOG.debug("Reusing the static files discovered in %s", p)
+            return found
+        # Taken first so that changes made during the discovery are seen
+        # by the next process.
+        directories = cache.get_directories(p)
+
     js_files = discover_files(base_path, sub_path=sub_path,
                               ext='.js', trim_base_path=True)
     sources, mocks, specs = sort_js_files(js_files)
     html_files = discover_files(base_path, sub_path=sub_path,
                                 ext='.html', trim_base_path=True)
 
-    p = path.join(base_path, sub_path)
     _log(sources, 'JavaScript source', p)
     _log(mocks, 'JavaScript mock', p)
     _log(specs, 'JavaScript spec', p)
     _log(html_files, 'HTML template', p)
 
+    if cache is not None:
+        cache.set(base_path, sub_path, directories,
+                  [sources, mocks, specs, html_files])
     return sources, mocks, specs, html_files
 
 
 def populate_horizon_config(horizon_config, base_path,
-                            sub_path='', prepend=False):
+                            sub_path='', prepend=False, cache=None):
     sources, mocks, specs, template = discover_static_files(
-        base_path, sub_path=sub_path)
+        base_path, sub_path=sub_path, cache=cache)
     if prepend:
         horizon_config.setdefault('js_files', [])[:0] = sources
         horizon_config.setdefault('js_spec_files', [])[:0] = mocks + specs
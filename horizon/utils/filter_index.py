@@ -0,0 +1,156 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import bisect
+import collections
+try:
+    from collections import abc as collections_abc
+except ImportError:
+    # Python 2
+    collections_abc = collections
+import re
+
+import six
+
+
+TOKEN_SEPARATORS = re.compile(r'[\s\-_.,:;/]+', re.UNICODE)
+NGRAM_SIZE = 3
+
+
+def normalize(value):
+    """Returns the lower-cased text form of ``value``, or ``''`` for None."""
+    if value is None:
+        return u''
+    return six.text_type(value).lower()
+
+
+def get_field(datum, field):
+    if isinstance(datum, collections_abc.Mapping):
+        return datum.get(field)
+    return getattr(datum, field, None)
+
+
+def _matches(value, query, prefix):
+    if not prefix:
+        return query in value
+    return value.startswith(query) or any(
+        word.startswith(query) for word in TOKEN_SEPARATORS.split(value))
+
+
+def scan(data, query, fields, prefix=False):
+    """Returns the data matching ``query`` in any of ``fields``.
+
+    Matches the same data as :meth:`FilterIndex.search`, by scanning the
+    data once, which is faster than building an index used only once.
+    """
+    query = normalize(query)
+    if not query:
+        return list(data)
+    return [datum for datum in data
+            if any(_matches(normalize(get_field(datum, field)), query, prefix)
+                   for field in fields)]
+
+
+class FilterIndex(object):
+    """Case-insensitive lookup index over the fields of a data set.
+
+    The values of a field are fetched and normalized once, when the field
+    is first queried. Prefix queries are then answered by a binary search
+    over the sorted values and the sorted words of the values, and substring
+    queries by intersecting the positions of the trigrams of the query, so
+    that repeated queries against the same data set do not rescan it.
+
+    The index of the fields only holds plain containers, so it can be cached
+    apart from the data: ``fields`` is the :attr:`fields` of an index of the
+    same data, in the same order.
+    """
+
+    def __init__(self, data, fields=None):
+        self.data = list(data)
+        self._fields = dict(fields or {})
+
+    @property
+    def fields(self):
+        """The index of the fields queried so far, by field name."""
+        return self._fields
+
+    def __len__(self):
+        return len(self.data)
+
+    def _get_field_index(self, field):
+        if field not in self._fields:
+            values = [normalize(get_field(datum, field))
+                      for datum in self.data]
+            ngrams = collections.defaultdict(set)
+            words = []
+            for pos, value in enumerate(values):
+                for i in range(len(value) - NGRAM_SIZE + 1):
+                    ngrams[value[i:i + NGRAM_SIZE]].add(pos)
+                words.extend((word, pos) for word
+                             in set(TOKEN_SEPARATORS.split(value)) if word)
+            self._fields[field] = {
+                'values': values,
+                'ngrams': dict(ngrams),
+                'sorted_values': sorted((value, pos) for pos, value
+                                        in enumerate(values)),
+                'sorted_words': sorted(words),
+            }
+        return self._fields[field]
+
+    def contains(self, field, query):
+        """Returns the positions of the data whose ``field`` has ``query``."""
+        index = self._get_field_index(field)
+        values = index['values']
+        query = normalize(query)
+        if len(query) < NGRAM_SIZE:
+            return set(pos for pos, value in enumerate(values)
+                       if query in value)
+        postings = [index['ngrams'].get(query[i:i + NGRAM_SIZE], set())
+                    for i in range(len(query) - NGRAM_SIZE + 1)]
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        # Matching trigrams do not guarantee they are adjacent.
+        return set(pos for pos in candidates if query in values[pos])
+
+    def startswith(self, field, query, words=False):
+        """Returns the positions of the data whose ``field`` starts with it.
+
+        If ``words`` is True, any word of the value may start with ``query``.
+        """
+        index = self._get_field_index(field)
+        entries = index['sorted_words' if words else 'sorted_values']
+        query = normalize(query)
+        positions = set()
+        for i in range(bisect.bisect_left(entries, (query,)), len(entries)):
+            value, pos = entries[i]
+            if not value.startswith(query):
+                break
+            positions.add(pos)
+        return positions
+
+    def search(self, query, fields, prefix=False):
+        """Returns the data matching ``query`` in any of ``fields``.
+
+        Matches are case-insensitive substring matches, or prefix matches on
+        the values and their words if ``prefix`` is True. The data is returned
+        in its original order.
+        """
+        if not normalize(query):
+            return list(self.data)
+        positions = set()
+        for field in fields:
+            if prefix:
+                positions |= self.startswith(field, query)
+                positions |= self.startswith(field, query, words=True)
+            else:
+                positions |= self.contains(field, query)
+        return [self.data[pos] for pos in sorted(positions)]
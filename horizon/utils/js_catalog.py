@@ -0,0 +1,86 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""JavaScript translation catalogs built once per process.
+
+Django's ``javascript_catalog`` view reads and merges the gettext catalogs of
+the packages on every request. The catalogs only change with the code, so
+they are built once per language and set of packages, and served under a
+URL holding the hash of their content which the browsers can cache for good.
+"""
+
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.urlresolvers import reverse
+from django.http import HttpRequest
+from django.utils import translation
+from django.views import i18n
+
+
+# How long the browsers keep a versioned catalog, in seconds.
+MAX_AGE = 365 * 24 * 60 * 60
+
+_catalogs = {}
+# The package sets of the URLs given to the templates, the only ones whose
+# catalogs are kept, since the others can be requested by anyone.
+_used_packages = set()
+_lock = threading.Lock()
+
+
+def get_packages(packages):
+    """Returns the packages a catalog can be built from, joined by '+'.
+
+    The others are ignored by Django anyway. The packages are deduplicated
+    and sorted, so that each set of packages has a single catalog.
+    """
+    return '+'.join(sorted(set(
+        p for p in packages.split('+')
+        if p == 'django.conf' or p in settings.INSTALLED_APPS)))
+
+
+def _build(language, packages):
+    request = HttpRequest()
+    with translation.override(language):
+        response = i18n.javascript_catalog(request, packages=packages)
+    content = response.content
+    return hashlib.sha256(content).hexdigest()[:12], content
+
+
+def get_catalog(language, packages):
+    """Returns the version and the content of a JavaScript catalog.
+
+    The catalogs are only kept for the package sets of :func:`get_url`,
+    the others are built on each call.
+    """
+    key = (language, get_packages(packages))
+    if key[1] not in _used_packages:
+        return _build(*key)
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        with _lock:
+            catalog = _catalogs.get(key)
+            if catalog is None:
+                catalog = _catalogs[key] = _build(*key)
+    return catalog
+
+
+def get_url(packages, language=None):
+    """Returns the versioned URL of a catalog, in the current language."""
+    language = language or translation.get_language() or \
+        settings.LANGUAGE_CODE
+    packages = get_packages(packages)
+    _used_packages.add(packages)
+    version = get_catalog(language, packages)[0]
+    return reverse('horizon:jsi18n_versioned',
+                   args=[packages, language, version])
@@ -12,32 +12,141 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import hashlib
+import json
+import logging
+import os
+
 from django.conf import settings
 
 from django_pyscss.compressor import DjangoScssFilter
 from django_pyscss import DjangoScssCompiler
+from django_pyscss.utils import get_file_and_storage
 
 from scss.namespace import Namespace
+from scss.source import SourceFile
 from scss.types import String
 
 import six
 
 
+LOG = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+def _read_source(path):
+    """Returns the contents of an imported SCSS file, as compiled."""
+    full_path, storage = get_file_and_storage(path)
+    if not full_path:
+        return None
+    origin, relpath = os.path.split(path)
+    with storage.open(full_path) as f:
+        return SourceFile.from_file(f, origin=origin, relpath=relpath).contents
+
+
+def _hash(contents):
+    return hashlib.sha256(contents.encode('utf-8')).hexdigest()
+
+
+def get_cached(cache_path):
+    """Returns the cached CSS, or None if any imported file has changed."""
+    try:
+        with open(cache_path) as f:
+            entry = json.load(f)
+        imports, css = entry['imports'], entry['css']
+    except (IOError, ValueError, KeyError):
+        return None
+    for path, checksum in imports:
+        contents = _read_source(path)
+        if contents is None or _hash(contents) != checksum:
+            return None
+    return css
+
+
+def set_cached(cache_path, imports, css):
+    """Stores the CSS along with the hashes of the files it imports."""
+    entry = {'imports': [[path, _hash(contents)]
+                         for path, contents in sorted(imports.items())],
+             'css': css}
+    tmp_path = '%s.%d.tmp' % (cache_path, os.getpid())
+    try:
+        if not os.path.isdir(os.path.dirname(cache_path)):
+            os.makedirs(os.path.dirname(cache_path))
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.rename(tmp_path, cache_path)
+    except (IOError, OSError) as e:
+        LOG.warning("Unable to write the SCSS cache %s: %s", cache_path, e)
+
+
+class HorizonScssCompiler(DjangoScssCompiler):
+    """Compiler keeping its last compilation, to list the imported files."""
+    compilation = None
+
+    def make_compilation(self):
+        self.compilation = super(HorizonScssCompiler, self).make_compilation()
+        return self.compilation
+
+    def get_imports(self):
+        """Returns the contents of the imported files by static path."""
+        imports = {}
+        for source in getattr(self.compilation, 'source_index', {}).values():
+            # The compiled file itself has no origin.
+            if source.origin is not None:
+                path = os.path.join(str(source.origin), str(source.relpath))
+                imports[path] = source.contents
+        return imports
+
+
 class HorizonScssFilter(DjangoScssFilter):
     def __init__(self, *args, **kwargs):
         super(HorizonScssFilter, self).__init__(*args, **kwargs)
 
         self.namespace = Namespace()
+        self.variables = {}
+        self._compiler = None
 
         # Add variables to the SCSS Global Namespace Here
-        self.namespace.set_variable(
-            '$static_url',
-            String(six.text_type(getattr(settings, 'STATIC_URL', '/static/')))
-        )
+        self.variables['$static_url'] = six.text_type(
+            getattr(settings, 'STATIC_URL', '/static/'))
+
+        for name, value in self.variables.items():
+            self.namespace.set_variable(name, String(value))
 
     # Create a compiler with the right namespace
     @property
     def compiler(self):
-        return DjangoScssCompiler(
+        self._compiler = HorizonScssCompiler(
             namespace=self.namespace
         )
+        return self._compiler
+
+    def get_cache_path(self):
+        """Returns the cache file of the CSS compiled by the filter, if any.
+
+        The file is named after the SCSS compiled, where it is compiled from
+        and the variables it is compiled with. The files it imports are
+        checked when the cache is read.
+        """
+        cache_dir = getattr(settings, 'SCSS_CACHE_DIR', None)
+        if not cache_dir:
+            return None
+        key = json.dumps([CACHE_VERSION, self.filename,
+                          getattr(self, 'relative_to', None),
+                          self.content, self.variables], sort_keys=True)
+        return os.path.join(cache_dir, '%s.json' % _hash(key))
+
+    def input(self, **kwargs):
+        cache_path = self.get_cache_path()
+        if cache_path is None:
+            return super(HorizonScssFilter, self).input(**kwargs)
+
+        css = get_cached(cache_path)
+        if css is not None:
+            return css
+        css = super(HorizonScssFilter, self).input(**kwargs)
+        if (isinstance(css, six.text_type) and self._compiler is not None and
+                self._compiler.compilation is not None):
+            set_cached(cache_path, self._compiler.get_imports(), css)
+        return css
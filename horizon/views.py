@@ -13,13 +13,17 @@
 #    under the License.
 
 from django.conf import settings
+from django import http
 from django import shortcuts
 from django import template
+from django.utils import cache
 from django.utils import encoding
+from django.utils import translation
 from django.views import generic
 
 import horizon
 from horizon import exceptions
+from horizon.utils import js_catalog
 
 from osprofiler import profiler
 
@@ -97,6 +101,24 @@ def user_home(request):
     return shortcuts.redirect(horizon.get_user_home(request.user))
 
 
+def javascript_catalog(request, packages, language, version):
+    """Serves the JavaScript translation catalog of a language.
+
+    The catalog is cached by the browser when the requested version is the
+    current one, which is always the case with the URL of
+    :func:`horizon.utils.js_catalog.get_url`.
+    """
+    if not translation.check_for_language(language):
+        raise http.Http404("Unknown language %s" % language)
+    current, content = js_catalog.get_catalog(language, packages)
+    response = http.HttpResponse(content,
+                                 content_type='text/javascript; charset=utf-8')
+    if version == current:
+        cache.patch_cache_control(response, public=True,
+                                  max_age=js_catalog.MAX_AGE)
+    return response
+
+
 class APIView(HorizonTemplateView):
     """A quick class-based view for putting API data into a template.
 
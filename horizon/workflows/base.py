@@ -13,9 +13,12 @@
 #    under the License.
 
 import copy
+import functools
 from importlib import import_module
 import inspect
+import json
 import logging
+import threading
 
 from django.core import urlresolvers
 from django import forms
@@ -32,11 +35,16 @@ import six
 from horizon import base
 from horizon import exceptions
 from horizon.templatetags.horizon import has_permissions
+from horizon.utils import concurrency
 from horizon.utils import html
 
 
 LOG = logging.getLogger(__name__)
 
+# Local thread storage collecting the choice population calls of the actions
+# of a workflow which loads them concurrently
+_local = threading.local()
+
 
 class WorkflowContext(dict):
     def __init__(self, workflow, *args, **kwargs):
@@ -170,10 +178,17 @@ class Action(forms.Form):
         return "<%s: %s>" % (self.__class__.__name__, self.slug)
 
     def _populate_choices(self, request, context):
+        # The workflow collects the calls of all its steps instead when it
+        # loads the choices concurrently.
+        collected = getattr(_local, 'choice_calls', None)
         for field_name, bound_field in self.fields.items():
             meth = getattr(self, "populate_%s_choices" % field_name, None)
             if meth is not None and callable(meth):
-                bound_field.choices = meth(request, context)
+                if collected is not None:
+                    collected.append((bound_field, functools.partial(
+                        meth, request, context)))
+                else:
+                    bound_field.choices = meth(request, context)
 
     def get_help_text(self, extra_context=None):
         """Returns the help text for this step."""
@@ -201,11 +216,38 @@ class Action(forms.Form):
         return None
 
 
+class MembershipChangesField(forms.CharField):
+    """A field holding a list of ``(member_id, role_id)`` pairs.
+
+    The lazy membership widget submits the role assignments it grants and
+    revokes as JSON lists of pairs in such fields.
+    """
+    def to_python(self, value):
+        value = super(MembershipChangesField, self).to_python(value)
+        if not value:
+            return []
+        try:
+            changes = [tuple(change) for change in json.loads(value)]
+        except (TypeError, ValueError):
+            raise forms.ValidationError(_("Invalid membership changes."))
+        for change in changes:
+            if (len(change) != 2 or
+                    not all(isinstance(i, six.string_types) for i in change)):
+                raise forms.ValidationError(_("Invalid membership changes."))
+        return changes
+
+
 class MembershipAction(Action):
     """An action that allows a user to add/remove members from a group.
 
     Extend the Action class with additional helper method for membership
     management.
+
+    By default, the action has one multiple choice field per role, listing
+    every possible member. For large groups, an action can call
+    :meth:`init_lazy_membership` instead, which only keeps the current
+    members, for a :class:`UpdateMembersStep` loading the other candidates
+    from its ``available_url``.
     """
     def get_default_role_field_name(self):
         return "default_" + self.slug + "_role"
@@ -213,6 +255,38 @@ class MembershipAction(Action):
     def get_member_field_name(self, role_id):
         return self.slug + "_role_" + role_id
 
+    def get_grants_field_name(self):
+        return self.slug + "_grants"
+
+    def get_revokes_field_name(self):
+        return self.slug + "_revokes"
+
+    def init_lazy_membership(self, roles, members):
+        """Keeps only the current members, for a lazy membership step.
+
+        ``roles`` is a list of ``(role_id, role_name)`` tuples and
+        ``members`` a list of ``(member_id, member_name, role_ids)`` tuples.
+        Rather than the full list of members of each role, the lists of the
+        ``(member_id, role_id)`` pairs to grant and to revoke are then
+        submitted, in the fields named by :meth:`get_grants_field_name` and
+        :meth:`get_revokes_field_name`.
+        """
+        self.membership_roles = roles
+        self.membership_members = members
+        for field_name in (self.get_grants_field_name(),
+                           self.get_revokes_field_name()):
+            self.fields[field_name] = MembershipChangesField(required=False)
+
+    def get_membership_data(self):
+        return {
+            'roles': [{'id': role_id, 'name': name}
+                      for role_id, name in self.membership_roles],
+            'members': [{'id': member_id, 'name': name,
+                         'roles': list(role_ids)}
+                        for member_id, name, role_ids
+                        in self.membership_members],
+        }
+
 
 @six.python_2_unicode_compatible
 class Step(object):
@@ -508,6 +582,17 @@ class UpdateMembersStep(Step):
 
         The placeholder text used when the members list is empty.
 
+    .. attribute:: available_url
+
+        The name of a URL returning the available list one page at a time.
+        When set, only the current members are rendered and the available
+        list is loaded and searched on demand. The URL is requested with
+        ``filter`` and ``offset`` parameters and must return a JSON object
+        with the ``items`` of the page, as ``{"id": ..., "name": ...}``
+        objects, and whether there are ``more`` of them. The action must
+        then be a :class:`MembershipAction` calling
+        :meth:`~MembershipAction.init_lazy_membership`. Default: ``None``
+
     """
     template_name = "horizon/common/_workflow_step_update_members.html"
     show_roles = True
@@ -515,6 +600,7 @@ class UpdateMembersStep(Step):
     members_list_title = _("Members")
     no_available_text = _("None available.")
     no_members_text = _("No members.")
+    available_url = None
 
     def get_member_field_name(self, role_id):
         if issubclass(self.action_class, MembershipAction):
@@ -522,6 +608,18 @@ class UpdateMembersStep(Step):
         else:
             return self.slug + "_role_" + role_id
 
+    def get_available_url(self):
+        if self.available_url is None:
+            return None
+        return urlresolvers.reverse(self.available_url)
+
+    @property
+    def lazy(self):
+        return self.get_available_url() is not None
+
+    def get_membership_json(self):
+        return json.dumps(self.action.get_membership_data())
+
 
 @six.python_2_unicode_compatible
 @six.add_metaclass(WorkflowMetaclass)
@@ -621,6 +719,20 @@ class Workflow(html.HTMLElement):
         Whether to present the workflow as a wizard, with "prev" and "next"
         buttons and validation after every step.
 
+    .. attribute:: load_concurrently
+
+        Boolean to control whether the ``populate_<field>_choices`` methods
+        of the actions of all the steps are called concurrently, on the
+        thread pool shared by the process. They are then called once all the
+        actions are initialized, so an action must not rely on the choices of
+        its fields in its ``__init__`` method, but in the ``populate`` method
+        itself. Default: ``False``
+
+    .. attribute:: max_workers
+
+        The maximum number of ``populate`` methods called at the same time
+        when ``load_concurrently`` is ``True``. Default: ``4``
+
     """
     slug = None
     default_steps = ()
@@ -631,6 +743,8 @@ class Workflow(html.HTMLElement):
     redirect_param_name = "next"
     multipart = False
     wizard = False
+    load_concurrently = False
+    max_workers = 4
     _registerable_class = Step
 
     def __str__(self):
@@ -676,6 +790,9 @@ class Workflow(html.HTMLElement):
         self.context_seed = clean_seed
         self.context.update(clean_seed)
 
+        if request and self.load_concurrently:
+            self._load_choices()
+
         if request and request.method == "POST":
             for step in self.steps:
                 valid = step.action.is_valid()
@@ -686,6 +803,24 @@ class Workflow(html.HTMLElement):
                     data = request.POST
                 self.context = step.contribute(data, self.context)
 
+    def _load_choices(self):
+        calls = []
+        _local.choice_calls = calls
+        try:
+            for step in self.steps:
+                step.action
+        finally:
+            _local.choice_calls = None
+        futures = concurrency.run_concurrently(
+            self.request, [populate for bound_field, populate in calls],
+            max_workers=self.max_workers)
+        for (bound_field, populate), future in zip(calls, futures):
+            try:
+                bound_field.choices = future.result()
+            except Exception:
+                LOG.exception("Problem populating the choices of an action.")
+                raise
+
     @property
     def steps(self):
         if getattr(self, "_ordered_steps", None) is None:
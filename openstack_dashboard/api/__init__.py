@@ -33,6 +33,7 @@ Keystone/Nova/Glance/Swift et. al.
 """
 from openstack_dashboard.api import base
 from openstack_dashboard.api import cinder
+from openstack_dashboard.api import executor
 from openstack_dashboard.api import glance
 from openstack_dashboard.api import heat
 from openstack_dashboard.api import keystone
@@ -45,6 +46,7 @@ from openstack_dashboard.api import swift
 __all__ = [
     "base",
     "cinder",
+    "executor",
     "glance",
     "heat",
     "keystone",
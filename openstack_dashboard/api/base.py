@@ -319,42 +319,81 @@ def get_url_for_service(service, region, endpoint_type):
     return None
 
 
+class EndpointIndex(object):
+    """The services of a catalog by type, and their URLs once looked up.
+
+    The catalog is not scanned again for the services and the URLs which
+    have already been looked up, as :func:`url_for` and
+    :func:`is_service_enabled` are called many times per request.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.size = len(catalog or [])
+        self.services = {}
+        for service in catalog or []:
+            if 'type' in service:
+                self.services.setdefault(service['type'], service)
+        self._urls = {}
+        self._enabled = {}
+
+    def get_service(self, service_type):
+        return self.services.get(service_type)
+
+    def get_url(self, service_type, region, endpoint_type):
+        key = (service_type, region, endpoint_type)
+        if key not in self._urls:
+            self._urls[key] = get_url_for_service(
+                self.services[service_type], region, endpoint_type)
+        return self._urls[key]
+
+    def is_enabled(self, service_type, region):
+        key = (service_type, region)
+        if key not in self._enabled:
+            service = self.services.get(service_type)
+            # ignore region for identity
+            self._enabled[key] = bool(service) and any(
+                service_type == 'identity' or
+                _get_endpoint_region(endpoint) == region
+                for endpoint in service.get('endpoints', []))
+        return self._enabled[key]
+
+
+def get_endpoint_index(user):
+    """Returns the :class:`EndpointIndex` of the catalog of ``user``.
+
+    It is kept on the user, which holds the catalog of its token, and built
+    again whenever the catalog is replaced or resized.
+    """
+    catalog = user.service_catalog
+    index = getattr(user, '_endpoint_index', None)
+    if (index is None or index.catalog is not catalog or
+            index.size != len(catalog or [])):
+        index = user._endpoint_index = EndpointIndex(catalog)
+    return index
+
+
 def url_for(request, service_type, endpoint_type=None, region=None):
     endpoint_type = endpoint_type or getattr(settings,
                                              'OPENSTACK_ENDPOINT_TYPE',
                                              'publicURL')
     fallback_endpoint_type = getattr(settings, 'SECONDARY_ENDPOINT_TYPE', None)
 
-    catalog = request.user.service_catalog
-    service = get_service_from_catalog(catalog, service_type)
-    if service:
+    index = get_endpoint_index(request.user)
+    if index.get_service(service_type):
         if not region:
             region = request.user.services_region
-        url = get_url_for_service(service,
-                                  region,
-                                  endpoint_type)
+        url = index.get_url(service_type, region, endpoint_type)
         if not url and fallback_endpoint_type:
-            url = get_url_for_service(service,
-                                      region,
-                                      fallback_endpoint_type)
+            url = index.get_url(service_type, region, fallback_endpoint_type)
         if url:
             return url
     raise exceptions.ServiceCatalogException(service_type)
 
 
 def is_service_enabled(request, service_type):
-    service = get_service_from_catalog(request.user.service_catalog,
-                                       service_type)
-    if service:
-        region = request.user.services_region
-        for endpoint in service.get('endpoints', []):
-            if 'type' not in service:
-                continue
-            # ignore region for identity
-            if service['type'] == 'identity' or \
-               _get_endpoint_region(endpoint) == region:
-                return True
-    return False
+    return get_endpoint_index(request.user).is_enabled(
+        service_type, request.user.services_region)
 
 
 def _get_endpoint_region(endpoint):
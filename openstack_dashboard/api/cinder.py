@@ -285,11 +285,13 @@ def update_pagination(entities, page_size, marker, sort_dir):
 
 @profiler.trace
 def volume_list_paged(request, search_opts=None, marker=None, paginate=False,
-                      sort_dir="desc"):
+                      sort_dir="desc", page_size=None):
     """List volumes with pagination.
 
     To see all volumes in the cloud as an admin you can pass in a special
     search option: {'all_tenants': 1}
+
+    The pages have ``page_size`` volumes, by default the user's page size.
     """
     has_more_data = False
     has_prev_data = False
@@ -304,7 +306,7 @@ def volume_list_paged(request, search_opts=None, marker=None, paginate=False,
                  for t in transfer_list(request, search_opts=search_opts)}
 
     if VERSIONS.active > 1 and paginate:
-        page_size = utils.get_page_size(request)
+        page_size = page_size or utils.get_page_size(request)
         # sort_key and sort_dir deprecated in kilo, use sort
         # if pagination is true, we use a single sort parameter
         # by default, it is "created_at"
@@ -0,0 +1,77 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Concurrent API calls made on behalf of a request.
+
+The calls run on the thread pool shared by the whole process, see
+:mod:`horizon.utils.concurrency`, so the number of threads calling the
+services does not grow with the number of requests. The language, the theme
+and the profiler trace of the request are carried into the calls, and the
+messages they add are passed back to the request thread.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+
+from horizon import exceptions
+from horizon.utils import concurrency
+
+
+LOG = logging.getLogger(__name__)
+
+# The calls which have not started yet are not made once one of the calls
+# has ended the request, by redirecting or logging out the user.
+STOP_ON = (exceptions.NotAuthorized, exceptions.Http302)
+
+
+def _get_config():
+    config = {'max_per_request': 4, 'timeout': None}
+    config.update(getattr(settings, 'CONCURRENT_API_CALLS', {}))
+    return config
+
+
+def _timed(func):
+    # functools.partial objects have no name of their own.
+    name = getattr(getattr(func, 'func', func), '__name__', repr(func))
+
+    def call():
+        start = time.time()
+        try:
+            return func()
+        finally:
+            LOG.debug("Concurrent call %s took %.3f seconds.",
+                      name, time.time() - start)
+    return call
+
+
+def run(request, *funcs):
+    """Calls ``funcs`` concurrently on behalf of ``request``.
+
+    Returns the futures of the calls once they are all done, in the order of
+    ``funcs``. At most ``CONCURRENT_API_CALLS['max_per_request']`` of them
+    run at the same time. The calls which have not started yet are
+    cancelled once ``CONCURRENT_API_CALLS['timeout']`` seconds have passed,
+    or when a call gives up on the request, for instance because the token
+    of the user has expired.
+    """
+    config = _get_config()
+    start = time.time()
+    futures = concurrency.run_concurrently(
+        request, [_timed(func) for func in funcs],
+        max_workers=config['max_per_request'],
+        stop_on=STOP_ON,
+        timeout=config['timeout'])
+    LOG.debug("%d concurrent calls for %s took %.3f seconds.",
+              len(funcs), request.path, time.time() - start)
+    return futures
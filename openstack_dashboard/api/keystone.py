@@ -18,6 +18,7 @@
 #    under the License.
 
 import collections
+import functools
 import logging
 
 from django.conf import settings
@@ -35,6 +36,7 @@ from horizon import messages
 from horizon.utils import functions as utils
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import executor
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 from openstack_dashboard import policy
 
@@ -668,7 +670,7 @@ def get_project_groups_roles(request, project):
 @profiler.trace
 def role_assignments_list(request, project=None, user=None, role=None,
                           group=None, domain=None, effective=False,
-                          include_subtree=True):
+                          include_subtree=True, include_names=False):
     if VERSIONS.active < 3:
         raise exceptions.NotAvailable
 
@@ -677,9 +679,12 @@ def role_assignments_list(request, project=None, user=None, role=None,
 
     manager = keystoneclient(request, admin=True).role_assignments
 
+    kwargs = {}
+    if include_names:
+        kwargs['include_names'] = True
     return manager.list(project=project, user=user, role=role, group=group,
                         domain=domain, effective=effective,
-                        include_subtree=include_subtree)
+                        include_subtree=include_subtree, **kwargs)
 
 
 @profiler.trace
@@ -772,29 +777,53 @@ def remove_domain_user_role(request, user, role, domain=None):
 @profiler.trace
 def get_project_users_roles(request, project):
     users_roles = collections.defaultdict(list)
-    if VERSIONS.active < 3:
-        project_users = user_list(request, project=project)
-
-        for user in project_users:
-            roles = roles_for_user(request, user.id, project)
-            roles_ids = [role.id for role in roles]
-            users_roles[user.id].extend(roles_ids)
-    else:
-        project_role_assignments = role_assignments_list(request,
-                                                         project=project)
-        for role_assignment in project_role_assignments:
-            if not hasattr(role_assignment, 'user'):
-                continue
-            user_id = role_assignment.user['id']
-            role_id = role_assignment.role['id']
-
-            # filter by project_id
-            if ('project' in role_assignment.scope and
-                    role_assignment.scope['project']['id'] == project):
-                    users_roles[user_id].append(role_id)
+    for user_id, user_name, roles_ids in get_project_members(request,
+                                                             project):
+        users_roles[user_id].extend(roles_ids)
     return users_roles
 
 
+def _roles_for_users(request, users, project):
+    # Keystone v2 has no role assignments API, the roles of each user are
+    # requested concurrently instead.
+    futures = executor.run(request, *[
+        functools.partial(roles_for_user, request, user.id, project)
+        for user in users])
+    return [[role.id for role in future.result()] for future in futures]
+
+
+@profiler.trace
+def get_project_members(request, project, domain=None):
+    """Returns the users having a role on the project, with their names.
+
+    The members are returned as ``(user_id, user_name, role_ids)`` tuples.
+    Unlike :func:`user_list`, only the users with a role on the project are
+    retrieved, and only the ones of ``domain`` are kept when it is given.
+    On Keystone v3, they are all retrieved with a single request.
+    """
+    if VERSIONS.active < 3:
+        users = user_list(request, project=project)
+        return [(user.id, user.name, roles_ids) for user, roles_ids
+                in zip(users, _roles_for_users(request, users, project))]
+
+    members = collections.OrderedDict()
+    for role_assignment in role_assignments_list(request, project=project,
+                                                 include_subtree=False,
+                                                 include_names=True):
+        if (not hasattr(role_assignment, 'user') or
+                'project' not in role_assignment.scope):
+            continue
+        user = role_assignment.user
+        if (domain is not None and
+                user.get('domain', {}).get('id') != domain):
+            continue
+        name, roles_ids = members.setdefault(user['id'],
+                                             (user.get('name'), []))
+        roles_ids.append(role_assignment.role['id'])
+    return [(user_id, name, roles_ids)
+            for user_id, (name, roles_ids) in members.items()]
+
+
 @profiler.trace
 def add_tenant_user_role(request, project=None, user=None, role=None,
                          group=None, domain=None):
@@ -218,6 +218,66 @@ class NovaUsage(base.APIResourceWrapper):
         return getattr(self, "total_memory_mb_usage", 0)
 
 
+class NovaUsageTotals(object):
+    """Usage totals of a tenant added up from pages of :class:`NovaUsage`.
+
+    Only the totals are kept, not the ``server_usages`` of the pages, so
+    the usage of a long period can be summarized while it is fetched.
+    """
+    server_usages = ()
+
+    def __init__(self, tenant_id):
+        self.tenant_id = tenant_id
+        self.total_active_instances = 0
+        self.vcpus = 0
+        self.memory_mb = 0
+        self.local_gb = 0
+        self.vcpu_hours = 0
+        self.disk_gb_hours = 0
+        self.memory_mb_hours = 0
+        self.total_hours = 0
+
+    def add(self, usage):
+        """Adds a page of usage of the tenant to the totals."""
+        # Attribute may not exist if there are no instances
+        active = [s for s in getattr(usage, 'server_usages', [])
+                  if s['ended_at'] is None]
+        self.total_active_instances += len(active)
+        self.vcpus += sum(s['vcpus'] for s in active)
+        self.memory_mb += sum(s['memory_mb'] for s in active)
+        self.local_gb += sum(s['local_gb'] for s in active)
+        self.vcpu_hours += getattr(usage, 'total_vcpus_usage', 0)
+        self.disk_gb_hours += getattr(usage, 'total_local_gb_usage', 0)
+        self.memory_mb_hours += getattr(usage, 'total_memory_mb_usage', 0)
+        self.total_hours += getattr(usage, 'total_hours', 0)
+
+    def add_totals(self, totals, latest=False):
+        """Adds the totals of another period of the tenant.
+
+        The hours of the periods add up. The active instances are those of
+        the ``latest`` period only, since the instances still running at
+        the end of the range are reported in every period.
+        """
+        self.vcpu_hours += totals.vcpu_hours
+        self.disk_gb_hours += totals.disk_gb_hours
+        self.memory_mb_hours += totals.memory_mb_hours
+        self.total_hours += totals.total_hours
+        if latest:
+            self.total_active_instances = totals.total_active_instances
+            self.vcpus = totals.vcpus
+            self.memory_mb = totals.memory_mb
+            self.local_gb = totals.local_gb
+
+    def get_summary(self):
+        return {'instances': self.total_active_instances,
+                'memory_mb': self.memory_mb,
+                'vcpus': self.vcpus,
+                'vcpu_hours': self.vcpu_hours,
+                'local_gb': self.local_gb,
+                'disk_gb_hours': self.disk_gb_hours,
+                'memory_mb_hours': self.memory_mb_hours}
+
+
 class FlavorExtraSpec(object):
     def __init__(self, flavor_id, key, val):
         self.flavor_id = flavor_id
@@ -507,9 +567,10 @@ def server_get(request, instance_id):
 
 
 @profiler.trace
-def server_list(request, search_opts=None, all_tenants=False, detailed=True):
+def server_list(request, search_opts=None, all_tenants=False, detailed=True,
+                page_size=None):
     nova_client = get_novaclient_with_locked_status(request)
-    page_size = utils.get_page_size(request)
+    page_size = page_size or utils.get_page_size(request)
     paginate = False
     if search_opts is None:
         search_opts = {}
@@ -704,42 +765,89 @@ def _merge_usage_list(usages, next_usage_list):
             usages[next_usage.tenant_id] = next_usage
 
 
-@profiler.trace
-def usage_get(request, tenant_id, start, end):
-    client = upgrade_api(request, novaclient(request), '2.40')
-    usage = client.usage.get(tenant_id, start, end)
+def _iter_usage_pages(client, fetch, get_marker):
+    page = fetch()
+    yield page
     if client.api_version >= api_versions.APIVersion('2.40'):
         # If the number of instances used to calculate the usage is greater
-        # than max_limit, the usage will be split across multiple requests
-        # and the responses will need to be merged back together.
-        marker = _get_usage_marker(usage)
+        # than max_limit, the usage is split across multiple requests.
+        marker = get_marker(page)
         while marker:
-            next_usage = client.usage.get(tenant_id, start, end, marker=marker)
-            marker = _get_usage_marker(next_usage)
+            page = fetch(marker=marker)
+            marker = get_marker(page)
             if marker:
-                _merge_usage(usage, next_usage)
+                yield page
+
+
+def _usage_get_pages(request, tenant_id, start, end):
+    client = upgrade_api(request, novaclient(request), '2.40')
+
+    def fetch(**kwargs):
+        return client.usage.get(tenant_id, start, end, **kwargs)
+
+    return _iter_usage_pages(client, fetch, _get_usage_marker)
+
+
+def _usage_list_pages(request, start, end):
+    client = upgrade_api(request, novaclient(request), '2.40')
+    return _client_usage_list_pages(client, start, end)
+
+
+def _client_usage_list_pages(client, start, end):
+    def fetch(**kwargs):
+        return client.usage.list(start, end, True, **kwargs)
+
+    return _iter_usage_pages(client, fetch, _get_usage_list_marker)
+
+
+def usage_get_pages(request, tenant_id, start, end):
+    """Yields the usage of a tenant as it is fetched, one page at a time.
+
+    Each page is a :class:`NovaUsage` holding some of the instances and
+    the totals of those instances only. Before microversion 2.40 there is
+    a single page.
+    """
+    for usage in _usage_get_pages(request, tenant_id, start, end):
+        yield NovaUsage(usage)
+
+
+def usage_list_pages(request, start, end):
+    """Yields the usage of all tenants as it is fetched, a page at a time.
+
+    Each page is a list of :class:`NovaUsage`, and the usage of a tenant
+    may be split across pages, see :class:`NovaUsageTotals`.
+    """
+    for usage_list in _usage_list_pages(request, start, end):
+        yield [NovaUsage(u) for u in usage_list]
+
+
+def client_usage_list_pages(client, start, end):
+    """Same as :func:`usage_list_pages` with an existing novaclient.
+
+    This is meant for code running outside of a request, such as
+    management commands, which authenticate on their own.
+    """
+    for usage_list in _client_usage_list_pages(client, start, end):
+        yield [NovaUsage(u) for u in usage_list]
+
+
+@profiler.trace
+def usage_get(request, tenant_id, start, end):
+    pages = _usage_get_pages(request, tenant_id, start, end)
+    usage = next(pages)
+    # The pages are merged back together.
+    for next_usage in pages:
+        _merge_usage(usage, next_usage)
     return NovaUsage(usage)
 
 
 @profiler.trace
 def usage_list(request, start, end):
-    client = upgrade_api(request, novaclient(request), '2.40')
-    usage_list = client.usage.list(start, end, True)
-    if client.api_version >= api_versions.APIVersion('2.40'):
-        # If the number of instances used to calculate the usage is greater
-        # than max_limit, the usage will be split across multiple requests
-        # and the responses will need to be merged back together.
-        usages = collections.OrderedDict()
+    # The pages are merged back together.
+    usages = collections.OrderedDict()
+    for usage_list in _usage_list_pages(request, start, end):
         _merge_usage_list(usages, usage_list)
-        marker = _get_usage_list_marker(usage_list)
-        while marker:
-            next_usage_list = client.usage.list(start, end, True,
-                                                marker=marker)
-            marker = _get_usage_list_marker(next_usage_list)
-            if marker:
-                _merge_usage_list(usages, next_usage_list)
-        usage_list = usages.values()
-    return [NovaUsage(u) for u in usage_list]
+    return [NovaUsage(u) for u in usages.values()]
 
 
 @profiler.trace
@@ -24,6 +24,8 @@ from osprofiler import profiler
 from osprofiler import web
 from six.moves.urllib.parse import urlparse
 
+from horizon.utils import concurrency
+
 
 ROOT_HEADER = 'PARENT_VIEW_TRACE_ID'
 PROFILER_SETTINGS = getattr(settings, 'OPENSTACK_PROFILER', {})
@@ -122,6 +124,26 @@ def update_trace_headers(keys, **kwargs):
                        web.X_TRACE_HMAC: trace_data[1]})
 
 
+@contextlib.contextmanager
+def _continued(hmac_key, base_id, parent_id):
+    profiler.init(hmac_key, base_id=base_id, parent_id=parent_id)
+    try:
+        yield
+    finally:
+        profiler._clean()
+
+
+def _capture_trace():
+    """Continues the trace of the request in the concurrent calls."""
+    profiler_instance = profiler.get()
+    if profiler_instance is None:
+        return None
+    hmac_key = profiler_instance.hmac_key
+    base_id = profiler_instance.get_base_id()
+    parent_id = profiler_instance.get_id()
+    return lambda: _continued(hmac_key, base_id, parent_id)
+
+
 if not PROFILER_SETTINGS.get('enabled', False):
     def trace(function):
         return function
@@ -130,3 +152,5 @@ else:
         func_name = function.__module__ + '.' + function.__name__
         decorator = profiler.trace(func_name)
         return decorator(function)
+
+    concurrency.register_context(_capture_trace)
@@ -113,13 +113,8 @@ class ModifyAccess(tables.LinkAction):
 
 class FlavorFilterAction(tables.FilterAction):
     def filter(self, table, flavors, filter_string):
-        """Really naive case-insensitive search."""
-        q = filter_string.lower()
-
-        def comp(flavor):
-            return q in flavor.name.lower()
-
-        return filter(comp, flavors)
+        """Case-insensitive search."""
+        return self.search(table, flavors, filter_string, ('name',))
 
 
 def get_size(flavor):
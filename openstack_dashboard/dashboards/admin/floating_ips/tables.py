@@ -35,10 +35,8 @@ LOG = logging.getLogger(__name__)
 class FloatingIPFilterAction(tables.FilterAction):
 
     def filter(self, table, fips, filter_string):
-        """Naive case-insensitive search."""
-        q = filter_string.lower()
-        return [ip for ip in fips
-                if q in ip.ip.lower()]
+        """Case-insensitive search."""
+        return self.search(table, fips, filter_string, ('ip',))
 
 
 class AdminAllocateFloatingIP(project_tables.AllocateIP):
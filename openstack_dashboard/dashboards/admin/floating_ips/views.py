@@ -57,7 +57,7 @@ def get_tenant_list(request):
     return tenants
 
 
-class IndexView(tables.DataTableView):
+class IndexView(tables.LocalPagedTableMixin, tables.DataTableView):
     table_class = fip_tables.FloatingIPsTable
     page_title = _("Floating IPs")
 
@@ -98,6 +98,14 @@ class IndexView(tables.DataTableView):
 
         return floating_ips
 
+    def dump_snapshot_data(self, data):
+        return [dict(ip.to_dict(), instance_name=ip.instance_name,
+                     pool_name=ip.pool_name, tenant_name=ip.tenant_name)
+                for ip in data]
+
+    def load_snapshot_data(self, data):
+        return [api.neutron.FloatingIp(ip) for ip in data]
+
 
 class DetailView(views.HorizonTemplateView):
     template_name = 'admin/floating_ips/detail.html'
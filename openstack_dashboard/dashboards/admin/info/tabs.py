@@ -147,3 +147,4 @@ class SystemInfoTabs(tabs.TabGroup):
     tabs = (ServicesTab, NovaServicesTab, CinderServicesTab,
             NetworkAgentsTab, HeatServiceTab)
     sticky = True
+    load_concurrently = True
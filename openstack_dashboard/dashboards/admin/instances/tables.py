@@ -18,6 +18,7 @@ from django.template.defaultfilters import title
 from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import ungettext_lazy
 
+from horizon import exceptions
 from horizon import tables
 from horizon.utils import filters
 
@@ -88,12 +89,32 @@ class LiveMigrateInstance(policy.PolicyTargetMixin,
 
 
 class AdminUpdateRow(project_tables.UpdateRow):
+    all_tenants = True
+
+    def get_data_list(self, request, instance_ids):
+        instances = super(AdminUpdateRow, self).get_data_list(request,
+                                                              instance_ids)
+        tenant_names = {}
+        for instance in instances:
+            if instance.tenant_id not in tenant_names:
+                tenant_names[instance.tenant_id] = self._get_tenant_name(
+                    request, instance.tenant_id)
+            instance.tenant_name = tenant_names[instance.tenant_id]
+        return instances
+
+    def _get_tenant_name(self, request, tenant_id):
+        try:
+            tenant = api.keystone.tenant_get(request, tenant_id, admin=True)
+        except Exception:
+            msg = _('Unable to retrieve instance project information.')
+            exceptions.handle(request, msg, ignore=True)
+            return None
+        return getattr(tenant, "name", None)
+
     def get_data(self, request, instance_id):
         instance = super(AdminUpdateRow, self).get_data(request, instance_id)
-        tenant = api.keystone.tenant_get(request,
-                                         instance.tenant_id,
-                                         admin=True)
-        instance.tenant_name = getattr(tenant, "name", None)
+        instance.tenant_name = self._get_tenant_name(request,
+                                                     instance.tenant_id)
         return instance
 
 
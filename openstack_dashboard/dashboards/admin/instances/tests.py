@@ -204,6 +204,36 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.assertContains(res, "Active", 1, 200)
         self.assertContains(res, "Running", 1, 200)
 
+    @test.create_stubs({api.nova: ('server_get', 'flavor_get',
+                                   'extension_supported', ),
+                        api.network: ('servers_update_addresses',),
+                        api.keystone: ('tenant_get',)})
+    def test_ajax_loading_instances_tenant_exception(self):
+        server = self.servers.first()
+        flavor = self.flavors.list()[0]
+        api.nova.server_get(IsA(http.HttpRequest), server.id).AndReturn(server)
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.nova.flavor_get(IsA(http.HttpRequest),
+                            server.flavor['id']).AndReturn(flavor)
+        api.keystone.tenant_get(IsA(http.HttpRequest),
+                                server.tenant_id,
+                                admin=True) \
+            .AndRaise(self.exceptions.keystone)
+        self.mox.ReplayAll()
+
+        url = (INDEX_URL +
+               "?action=row_update&table=instances&obj_id=" + server.id)
+
+        res = self.client.get(url, {},
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertTemplateUsed(res, "horizon/common/_data_table_row.html")
+        self.assertNotContains(res, "test_tenant", 200)
+        self.assertContains(res, "server_1", 2, 200)
+
     @test.create_stubs({
         api.nova: ('flavor_list', 'server_list', 'extension_supported', ),
         api.keystone: ('tenant_list',),
@@ -17,8 +17,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import futurist
-
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
@@ -161,11 +159,11 @@ class AdminIndexView(tables.DataTableView):
                     message=_('Unable to retrieve IP addresses from Neutron.'),
                     ignore=True)
 
-        with futurist.ThreadPoolExecutor(max_workers=4) as e:
-            e.submit(fn=_task_get_tenants)
-            e.submit(fn=_task_get_images)
-            e.submit(fn=_task_get_flavors)
-            e.submit(fn=_task_get_instances)
+        api.executor.run(self.request,
+                         _task_get_tenants,
+                         _task_get_images,
+                         _task_get_flavors,
+                         _task_get_instances)
 
         # This code gets activated only in case of filtering by nonexistent
         # project, image or flavor. Executing it before _task_get_instances
@@ -149,6 +149,7 @@ class NetworkDetailsTabs(tabs.DetailTabsGroup):
     tabs = (OverviewTab, subnets_tables.SubnetsTab, ports_tables.PortsTab,
             agents_tabs.DHCPAgentsTab, )
     sticky = True
+    load_concurrently = True
 
 
 class DetailView(tabs.TabbedTableView):
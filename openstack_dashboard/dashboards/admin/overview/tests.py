@@ -39,7 +39,7 @@ INDEX_URL = reverse('horizon:project:overview:index')
 class UsageViewTests(test.BaseAdminViewTests):
 
     def _stub_api_calls(self, nova_stu_enabled):
-        self.mox.StubOutWithMock(api.nova, 'usage_list')
+        self.mox.StubOutWithMock(api.nova, 'usage_list_pages')
         self.mox.StubOutWithMock(api.nova, 'tenant_absolute_limits')
         self.mox.StubOutWithMock(api.nova, 'extension_supported')
         self.mox.StubOutWithMock(api.keystone, 'tenant_list')
@@ -91,14 +91,13 @@ class UsageViewTests(test.BaseAdminViewTests):
 
         if nova_stu_enabled:
             start_day, now = self._get_start_end_range(overview_days_range)
-            api.nova.usage_list(IsA(http.HttpRequest),
-                                datetime.datetime(start_day.year,
-                                                  start_day.month,
-                                                  start_day.day, 0, 0, 0, 0),
-                                datetime.datetime(now.year,
-                                                  now.month,
-                                                  now.day, 23, 59, 59, 0)) \
-                .AndReturn(usage_list)
+            api.nova.usage_list_pages(
+                IsA(http.HttpRequest),
+                datetime.datetime(start_day.year, start_day.month,
+                                  start_day.day, 0, 0, 0, 0),
+                datetime.datetime(now.year, now.month, now.day,
+                                  23, 59, 59, 0)) \
+                .AndReturn([usage_list])
         api.nova.tenant_absolute_limits(IsA(http.HttpRequest), reserved=True) \
             .AndReturn(self.limits['absolute'])
         api.neutron.is_extension_supported(IsA(http.HttpRequest),
@@ -186,15 +185,13 @@ class UsageViewTests(test.BaseAdminViewTests):
                     .AndReturn([self.tenants.list(), False])
         if nova_stu_enabled:
             start_day, now = self._get_start_end_range(overview_days_range)
-            api.nova.usage_list(IsA(http.HttpRequest),
-                                datetime.datetime(start_day.year,
-                                                  start_day.month,
-                                                  start_day.day,
-                                                  0, 0, 0, 0),
-                                datetime.datetime(now.year,
-                                                  now.month,
-                                                  now.day, 23, 59, 59, 0)) \
-                .AndReturn(usage_obj)
+            api.nova.usage_list_pages(
+                IsA(http.HttpRequest),
+                datetime.datetime(start_day.year, start_day.month,
+                                  start_day.day, 0, 0, 0, 0),
+                datetime.datetime(now.year, now.month, now.day,
+                                  23, 59, 59, 0)) \
+                .AndReturn([usage_obj])
         api.nova.tenant_absolute_limits(IsA(http.HttpRequest), reserved=True)\
             .AndReturn(self.limits['absolute'])
         api.neutron.is_extension_supported(IsA(http.HttpRequest),
@@ -214,13 +211,18 @@ class UsageViewTests(test.BaseAdminViewTests):
         self.assertTemplateUsed(res, 'admin/overview/usage.csv')
         self.assertIsInstance(res.context['usage'], usage.GlobalUsage)
         hdr = 'Project Name,VCPUs,RAM (MB),Disk (GB),Usage (Hours)'
-        self.assertContains(res, '%s\r\n' % hdr)
+        # The response is streamed, so it can only be read once.
+        content = b''.join(res.streaming_content).decode('utf-8')
+        self.assertIn('%s\r\n' % hdr, content)
 
         if nova_stu_enabled:
-            for obj in usage_obj:
+            # The view reports the per-tenant totals of the usage pages.
+            summaries = res.context['usage'].usage_list
+            self.assertEqual(len(usage_obj), len(summaries))
+            for obj in summaries:
                 row = u'{0},{1},{2},{3},{4:.2f}\r\n'.format(obj.project_name,
                                                             obj.vcpus,
                                                             obj.memory_mb,
                                                             obj.disk_gb_hours,
                                                             obj.vcpu_hours)
-                self.assertContains(res, row)
+                self.assertIn(row, content)
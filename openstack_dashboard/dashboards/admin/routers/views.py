@@ -76,6 +76,10 @@ class IndexView(r_views.IndexView, n_views.IndexView):
         routers = self._get_routers()
         return routers
 
+    def dump_snapshot_data(self, data):
+        return [dict(router.to_dict(), name=router.name,
+                     tenant_name=router.tenant_name) for router in data]
+
     def get_filters(self, filters=None, filters_map=None):
         filters = super(IndexView, self).get_filters(filters, filters_map)
         if 'project' in filters:
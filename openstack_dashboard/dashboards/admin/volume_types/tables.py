@@ -187,10 +187,8 @@ def get_volume_type_encryption_link(volume_type):
 class VolumeTypesFilterAction(tables.FilterAction):
 
     def filter(self, table, volume_types, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [volume_type for volume_type in volume_types
-                if query in volume_type.name.lower()]
+        """Case-insensitive search."""
+        return self.search(table, volume_types, filter_string, ('name',))
 
 
 class UpdateRow(tables.Row):
@@ -211,15 +211,8 @@ class DomainFilterAction(tables.FilterAction):
         return multidomain_support
 
     def filter(self, table, domains, filter_string):
-        """Naive case-insensitive search."""
-        q = filter_string.lower()
-
-        def comp(domain):
-            if q in domain.name.lower():
-                return True
-            return False
-
-        return filter(comp, domains)
+        """Case-insensitive search."""
+        return self.search(table, domains, filter_string, ('name',))
 
 
 class SetDomainContext(tables.Action):
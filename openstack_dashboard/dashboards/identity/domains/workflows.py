@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import logging
 
 from django.conf import settings
@@ -27,6 +28,7 @@ from horizon import workflows
 
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.identity.domains import constants
+from openstack_dashboard.utils import identity
 
 
 LOG = logging.getLogger(__name__)
@@ -310,6 +312,31 @@ class UpdateDomain(workflows.Workflow):
     def format_status_message(self, message):
         return message % self.context.get('name', 'unknown domain')
 
+    def _filter_self_admin_revokes(self, request, available_roles,
+                                   revokes):
+        available_admin_role_ids = [
+            role.id for role in available_roles
+            if role.name.lower() in utils.get_admin_roles()
+        ]
+        # Prevent admins from doing stupid things to themselves.
+        # TODO(lcheng) When Horizon moves to Domain scoped token for
+        # invoking identity operation, also check that the domain is
+        # request.user.domain_id.
+        removing_admin = any(user_id == request.user.id and
+                             role_id in available_admin_role_ids
+                             for user_id, role_id in revokes)
+        if not removing_admin:
+            return revokes
+        # Cannot remove "admin" role on current(admin) domain
+        msg = _('You cannot revoke your administrative privileges '
+                'from the domain you are currently logged into. '
+                'Please switch to another domain with '
+                'administrative privileges or remove the '
+                'administrative role manually via the CLI.')
+        messages.warning(request, msg)
+        return [(user_id, role_id) for user_id, role_id in revokes
+                if user_id != request.user.id]
+
     def _update_domain_members(self, request, domain_id, data):
         # update domain members
         users_to_modify = 0
@@ -322,93 +349,33 @@ class UpdateDomain(workflows.Workflow):
             # can diff against it.
             users_roles = api.keystone.get_domain_users_roles(request,
                                                               domain=domain_id)
-            users_to_modify = len(users_roles)
             all_users = api.keystone.user_list(request,
                                                domain=domain_id)
             users_dict = {user.id: user.name for user in all_users}
 
-            for user_id in users_roles.keys():
-                # Don't remove roles if the user isn't in the domain
-                if user_id not in users_dict:
-                    users_to_modify -= 1
-                    continue
-
-                # Check if there have been any changes in the roles of
-                # Existing domain members.
-                current_role_ids = list(users_roles[user_id])
-
-                for role in available_roles:
-                    field_name = member_step.get_member_field_name(role.id)
-                    # Check if the user is in the list of users with this role.
-                    if user_id in data[field_name]:
-                        # Add it if necessary
-                        if role.id not in current_role_ids:
-                            # user role has changed
-                            api.keystone.add_domain_user_role(
-                                request,
-                                domain=domain_id,
-                                user=user_id,
-                                role=role.id)
-                        else:
-                            # User role is unchanged, so remove it from the
-                            # remaining roles list to avoid removing it later.
-                            index = current_role_ids.index(role.id)
-                            current_role_ids.pop(index)
-
-                # Prevent admins from doing stupid things to themselves.
-                is_current_user = user_id == request.user.id
-                # TODO(lcheng) When Horizon moves to Domain scoped token for
-                # invoking identity operation, replace this with:
-                # domain_id == request.user.domain_id
-                is_current_domain = True
-
-                available_admin_role_ids = [
-                    role.id for role in available_roles
-                    if role.name.lower() in utils.get_admin_roles()
-                ]
-                admin_role_ids = [role for role in current_role_ids
-                                  if role in available_admin_role_ids]
-                if len(admin_role_ids):
-                    removing_admin = any([role in current_role_ids
-                                          for role in admin_role_ids])
-                else:
-                    removing_admin = False
-                if is_current_user and is_current_domain and removing_admin:
-                    # Cannot remove "admin" role on current(admin) domain
-                    msg = _('You cannot revoke your administrative privileges '
-                            'from the domain you are currently logged into. '
-                            'Please switch to another domain with '
-                            'administrative privileges or remove the '
-                            'administrative role manually via the CLI.')
-                    messages.warning(request, msg)
-
-                # Otherwise go through and revoke any removed roles.
-                else:
-                    for id_to_delete in current_role_ids:
-                        api.keystone.remove_domain_user_role(
-                            request,
-                            domain=domain_id,
-                            user=user_id,
-                            role=id_to_delete)
-                users_to_modify -= 1
-
-            # Grant new roles on the domain.
+            # Don't remove roles if the user isn't in the domain
+            current = dict((user_id, set(role_ids))
+                           for user_id, role_ids in users_roles.items()
+                           if user_id in users_dict)
+            requested = collections.defaultdict(set)
             for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many users may be added for exception handling.
-                users_to_modify += len(data[field_name])
-            for role in available_roles:
-                users_added = 0
                 field_name = member_step.get_member_field_name(role.id)
                 for user_id in data[field_name]:
-                    if user_id not in users_roles:
-                        api.keystone.add_domain_user_role(request,
-                                                          domain=domain_id,
-                                                          user=user_id,
-                                                          role=role.id)
-                    users_added += 1
-                users_to_modify -= users_added
-            return True
+                    requested[user_id].add(role.id)
+
+            grants, revokes = identity.get_role_changes(current, requested)
+            revokes = self._filter_self_admin_revokes(
+                request, available_roles, revokes)
+            users_to_modify = len(set(user_id for user_id, role_id
+                                      in grants + revokes))
+
+            failed = identity.apply_role_changes(
+                request, grants, revokes,
+                grant=lambda user, role: api.keystone.add_domain_user_role(
+                    request, domain=domain_id, user=user, role=role),
+                revoke=lambda user, role: (
+                    api.keystone.remove_domain_user_role(
+                        request, domain=domain_id, user=user, role=role)))
         except Exception:
             exceptions.handle(request,
                               _('Failed to modify %s project '
@@ -416,6 +383,13 @@ class UpdateDomain(workflows.Workflow):
                               % users_to_modify)
             return False
 
+        if failed:
+            msg = _('Unable to update the roles of the following users: %s.')
+            messages.error(request, msg % ', '.join(
+                users_dict.get(user_id, user_id) for user_id in failed))
+            return False
+        return True
+
     def _update_domain_groups(self, request, domain_id, data):
         # update domain groups
         groups_to_modify = 0
@@ -121,11 +121,8 @@ class GroupsTable(tables.DataTable):
 
 class UserFilterAction(tables.FilterAction):
     def filter(self, table, users, filter_string):
-        """Naive case-insensitive search."""
-        q = filter_string.lower()
-        return [user for user in users
-                if q in user.name.lower()
-                or q in (getattr(user, 'email', None) or '').lower()]
+        """Case-insensitive search."""
+        return self.search(table, users, filter_string, ('name', 'email'))
 
 
 class RemoveMembers(tables.DeleteAction):
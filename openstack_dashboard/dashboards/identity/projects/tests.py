@@ -13,18 +13,24 @@
 #    under the License.
 
 import datetime
+import json
 import logging
 import os
 import unittest
 
 import django
+from django.contrib import messages
+from django.contrib.messages.storage import default_storage
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django import http
 from django.test.utils import override_settings
 from django.utils import timezone
+from django.utils.http import urlencode
 
 from mox3.mox import IgnoreArg
 from mox3.mox import IsA
+import six
 
 from horizon.workflows import views
 
@@ -824,6 +830,11 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
 
             # member role
             workflow_data[GROUP_ROLE_PREFIX + "2"] = ['1', '2', '3']
+            api.keystone.role_assignments_list(IsA(http.HttpRequest),
+                                               project=self.tenant.id,
+                                               include_subtree=False,
+                                               include_names=True) \
+                .MultipleTimes().AndReturn(role_assignments)
             api.keystone.role_assignments_list(IsA(http.HttpRequest),
                                                project=self.tenant.id) \
                .MultipleTimes().AndReturn(role_assignments)
@@ -870,15 +881,18 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
 
             # admin user - try to remove all roles on current project, warning
             api.keystone.roles_for_user(IsA(http.HttpRequest), '1',
-                                        self.tenant.id).AndReturn(roles)
+                                        self.tenant.id) \
+                .InAnyOrder().AndReturn(roles)
 
             # member user 1 - has role 1, will remove it
             api.keystone.roles_for_user(IsA(http.HttpRequest), '2',
-                                        self.tenant.id).AndReturn((roles[1],))
+                                        self.tenant.id) \
+                .InAnyOrder().AndReturn((roles[1],))
 
             # member user 3 - has role 2
             api.keystone.roles_for_user(IsA(http.HttpRequest), '3',
-                                        self.tenant.id).AndReturn((roles[0],))
+                                        self.tenant.id) \
+                .InAnyOrder().AndReturn((roles[0],))
             # add role 2
             api.keystone.add_tenant_user_role(IsA(http.HttpRequest),
                                               project=self.tenant.id,
@@ -931,6 +945,11 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
             .AndReturn(groups)
 
         if keystone_api_version >= 3:
+            api.keystone.role_assignments_list(IsA(http.HttpRequest),
+                                               project=self.tenant.id,
+                                               include_subtree=False,
+                                               include_names=True) \
+                .MultipleTimes().AndReturn(role_assignments)
             api.keystone.role_assignments_list(IsA(http.HttpRequest),
                                                project=self.tenant.id) \
                .MultipleTimes().AndReturn(role_assignments)
@@ -942,7 +961,8 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
             for user in proj_users:
                 api.keystone.roles_for_user(IsA(http.HttpRequest),
                                             user.id,
-                                            self.tenant.id).AndReturn(roles)
+                                            self.tenant.id) \
+                    .InAnyOrder().AndReturn(roles)
 
         self.mox.ReplayAll()
 
@@ -1036,7 +1056,8 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
             for user in proj_users:
                 api.keystone.roles_for_user(IsA(http.HttpRequest),
                                             user.id,
-                                            self.tenant.id).AndReturn(roles)
+                                            self.tenant.id) \
+                    .InAnyOrder().AndReturn(roles)
 
         workflow_data[USER_ROLE_PREFIX + "1"] = ['3']  # admin role
         workflow_data[USER_ROLE_PREFIX + "2"] = ['2']  # member role
@@ -1196,6 +1217,11 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
         workflow_data = {}
 
         if keystone_api_version >= 3:
+            api.keystone.role_assignments_list(IsA(http.HttpRequest),
+                                               project=self.tenant.id,
+                                               include_subtree=False,
+                                               include_names=True) \
+                .MultipleTimes().AndReturn(role_assignments)
             api.keystone.role_assignments_list(IsA(http.HttpRequest),
                                                project=self.tenant.id) \
                 .MultipleTimes().AndReturn(role_assignments)
@@ -1206,7 +1232,8 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
             for user in proj_users:
                 api.keystone.roles_for_user(IsA(http.HttpRequest),
                                             user.id,
-                                            self.tenant.id).AndReturn(roles)
+                                            self.tenant.id) \
+                    .InAnyOrder().AndReturn(roles)
 
         role_ids = [role.id for role in roles]
         for user in proj_users:
@@ -1328,7 +1355,8 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
             for user in proj_users:
                 api.keystone.roles_for_user(IsA(http.HttpRequest),
                                             user.id,
-                                            self.tenant.id).AndReturn(roles)
+                                            self.tenant.id) \
+                    .InAnyOrder().AndReturn(roles)
 
         workflow_data[USER_ROLE_PREFIX + "1"] = ['1', '3']  # admin role
         workflow_data[USER_ROLE_PREFIX + "2"] = ['1', '2', '3']  # member role
@@ -1458,7 +1486,8 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
             for user in proj_users:
                 api.keystone.roles_for_user(IsA(http.HttpRequest),
                                             user.id,
-                                            self.tenant.id).AndReturn(roles)
+                                            self.tenant.id) \
+                    .InAnyOrder().AndReturn(roles)
 
         workflow_data[USER_ROLE_PREFIX + "1"] = ['1', '3']  # admin role
         workflow_data[USER_ROLE_PREFIX + "2"] = ['1', '2', '3']  # member role
@@ -1555,7 +1584,7 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
 
 class UsageViewTests(test.BaseAdminViewTests):
     def _stub_nova_api_calls(self, nova_stu_enabled=True):
-        self.mox.StubOutWithMock(api.nova, 'usage_get')
+        self.mox.StubOutWithMock(api.nova, 'usage_get_pages')
         self.mox.StubOutWithMock(api.nova, 'tenant_absolute_limits')
         self.mox.StubOutWithMock(api.nova, 'extension_supported')
         self.mox.StubOutWithMock(api.cinder, 'tenant_absolute_limits')
@@ -1607,9 +1636,11 @@ class UsageViewTests(test.BaseAdminViewTests):
         end = datetime.datetime(now.year, now.month, now.day, 23, 59, 59, 0)
 
         if nova_stu_enabled:
-            api.nova.usage_get(IsA(http.HttpRequest),
-                               self.tenant.id,
-                               start, end).AndReturn(usage_obj)
+            # The usage is added up as its pages are fetched, which are not
+            # fetched again for the CSV rows.
+            api.nova.usage_get_pages(IsA(http.HttpRequest),
+                                     self.tenant.id,
+                                     start, end).AndReturn([usage_obj])
         api.nova.tenant_absolute_limits(IsA(http.HttpRequest), reserved=True)\
             .AndReturn(self.limits['absolute'])
         api.cinder.tenant_absolute_limits(IsA(http.HttpRequest)) \
@@ -1626,7 +1657,13 @@ class UsageViewTests(test.BaseAdminViewTests):
         self.assertIsInstance(res.context['usage'], usage.ProjectUsage)
         hdr = ('Instance Name,VCPUs,RAM (MB),Disk (GB),Usage (Hours),'
                'Time since created (Seconds),State')
-        self.assertContains(res, '%s\r\n' % hdr)
+        content = b''.join(res.streaming_content).decode('utf-8')
+        self.assertIn('%s\r\n' % hdr, content)
+        if nova_stu_enabled:
+            # The totals precede the rows.
+            self.assertIn('Active Instances:,%s\n'
+                          % usage_obj.get_summary()['instances'],
+                          content[:content.index(hdr)])
 
 
 class DetailProjectViewTests(test.BaseAdminViewTests):
@@ -1659,6 +1696,143 @@ class DetailProjectViewTests(test.BaseAdminViewTests):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
 
+@override_settings(OPENSTACK_KEYSTONE_LAZY_MEMBERSHIP=True)
+class LazyMembershipTests(test.BaseAdminViewTests):
+    def setUp(self):
+        super(LazyMembershipTests, self).setUp()
+        cache.clear()
+
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    @test.create_stubs({api.keystone: ('user_list',)})
+    def test_available_users(self):
+        users = self.users.list()
+        api.keystone.user_list(IsA(http.HttpRequest), domain=self.domain.id) \
+            .AndReturn(users)
+        self.mox.ReplayAll()
+
+        url = reverse('horizon:identity:projects:available_users')
+        res = self.client.get(url + '?' + urlencode(
+            {'domain_id': self.domain.id, 'offset': 1}))
+
+        data = json.loads(res.content.decode('utf-8'))
+        expected = sorted(users, key=lambda user: user.name.lower())[1:3]
+        self.assertEqual([{'id': user.id, 'name': user.name}
+                          for user in expected], data['items'])
+        self.assertEqual(len(users) > 3, data['more'])
+
+        # The users are listed once for the pages and searches that follow.
+        user = users[0]
+        res = self.client.get(url + '?' + urlencode(
+            {'domain_id': self.domain.id, 'filter': user.name.upper()}))
+
+        data = json.loads(res.content.decode('utf-8'))
+        self.assertIn({'id': user.id, 'name': user.name}, data['items'])
+        self.assertTrue(all(user.name.lower() in item['name'].lower()
+                            for item in data['items']))
+
+    @test.create_stubs({api.keystone: ('get_default_role',
+                                       'role_list',
+                                       'get_project_members',
+                                       'get_project_users_roles',
+                                       'add_tenant_user_role',
+                                       'remove_tenant_user_role')})
+    def test_update_lazy_project_members(self):
+        project = self.tenants.first()
+        roles = self.roles.list()
+        api.keystone.get_default_role(IsA(http.HttpRequest)) \
+            .AndReturn(self.roles.first())
+        api.keystone.role_list(IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(roles)
+        api.keystone.get_project_members(
+            IsA(http.HttpRequest), project.id, domain=project.domain_id) \
+            .AndReturn([('2', 'user_two', [roles[1].id])])
+        api.keystone.get_project_users_roles(
+            IsA(http.HttpRequest), project=project.id) \
+            .AndReturn({'2': [roles[1].id]})
+        changes = []
+        api.keystone.remove_tenant_user_role(IsA(http.HttpRequest),
+                                             project=project.id,
+                                             user='2',
+                                             role=roles[1].id) \
+            .WithSideEffects(self._record_change('revoke', changes))
+        api.keystone.add_tenant_user_role(IsA(http.HttpRequest),
+                                          project=project.id,
+                                          user='3',
+                                          role=roles[1].id) \
+            .WithSideEffects(self._record_change('grant', changes))
+        self.mox.ReplayAll()
+
+        workflow, data = self._get_lazy_workflow(project, roles)
+
+        self.assertTrue(workflow._update_project_members(self.request, data,
+                                                         project.id))
+        # Revoking a role the user does not have is ignored.
+        self.assertEqual([('grant', '3', roles[1].id),
+                          ('revoke', '2', roles[1].id)], sorted(changes))
+        self.assertEqual([], list(messages.get_messages(self.request)))
+
+    @test.create_stubs({api.keystone: ('get_default_role',
+                                       'role_list',
+                                       'get_project_members',
+                                       'get_project_users_roles',
+                                       'add_tenant_user_role',
+                                       'remove_tenant_user_role')})
+    def test_update_lazy_project_members_failure(self):
+        project = self.tenants.first()
+        roles = self.roles.list()
+        api.keystone.get_default_role(IsA(http.HttpRequest)) \
+            .AndReturn(self.roles.first())
+        api.keystone.role_list(IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(roles)
+        api.keystone.get_project_members(
+            IsA(http.HttpRequest), project.id, domain=project.domain_id) \
+            .AndReturn([('2', 'user_two', [roles[1].id])])
+        api.keystone.get_project_users_roles(
+            IsA(http.HttpRequest), project=project.id) \
+            .AndReturn({'2': [roles[1].id]})
+        api.keystone.remove_tenant_user_role(IsA(http.HttpRequest),
+                                             project=project.id,
+                                             user='2',
+                                             role=roles[1].id) \
+            .AndRaise(self.exceptions.keystone)
+        changes = []
+        api.keystone.add_tenant_user_role(IsA(http.HttpRequest),
+                                          project=project.id,
+                                          user='3',
+                                          role=roles[1].id) \
+            .WithSideEffects(self._record_change('grant', changes))
+        self.mox.ReplayAll()
+
+        workflow, data = self._get_lazy_workflow(project, roles)
+
+        self.assertFalse(workflow._update_project_members(self.request, data,
+                                                          project.id))
+        # The other changes are still made.
+        self.assertEqual([('grant', '3', roles[1].id)], changes)
+        errors = [six.text_type(message.message) for message
+                  in messages.get_messages(self.request)]
+        self.assertEqual(1, len(errors))
+        self.assertIn('user_two', errors[0])
+
+    def _record_change(self, change, changes):
+        def record(request, project, user, role):
+            changes.append((change, user, role))
+        return record
+
+    def _get_lazy_workflow(self, project, roles):
+        self.request._messages = default_storage(self.request)
+        workflow = workflows.UpdateProjectNoQuota(
+            self.request, context_seed={'project_id': project.id,
+                                        'domain_id': project.domain_id})
+        member_step = workflow.get_step(workflows.PROJECT_USER_MEMBER_SLUG)
+        self.assertTrue(member_step.lazy)
+        action = member_step.action
+        data = {action.get_grants_field_name(): [('3', roles[1].id)],
+                action.get_revokes_field_name(): [('2', roles[1].id),
+                                                  ('4', roles[1].id)]}
+        return workflow, data
+
+
 @unittest.skipUnless(os.environ.get('WITH_SELENIUM', False),
                      "The WITH_SELENIUM env variable is not set.")
 class SeleniumTests(test.SeleniumAdminTestCase):
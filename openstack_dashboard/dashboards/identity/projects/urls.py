@@ -24,6 +24,8 @@ from openstack_dashboard.dashboards.identity.projects import views
 urlpatterns = [
     url(r'^$', views.IndexView.as_view(), name='index'),
     url(r'^create$', views.CreateProjectView.as_view(), name='create'),
+    url(r'^available_users/$',
+        views.AvailableUsersView.as_view(), name='available_users'),
     url(r'^(?P<tenant_id>[^/]+)/update/$',
         views.UpdateProjectView.as_view(), name='update'),
     url(r'^(?P<project_id>[^/]+)/usage/$',
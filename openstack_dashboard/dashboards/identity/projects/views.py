@@ -16,13 +16,20 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django import http
 from django.utils.translation import ugettext_lazy as _
+from django.views import generic
+import six
 
 from horizon import exceptions
 from horizon import messages
 from horizon import tables
+from horizon.utils import functions as utils
 from horizon.utils import memoized
 from horizon import views
 from horizon import workflows
@@ -289,3 +296,61 @@ class DetailProjectView(views.HorizonTemplateView):
                               _('Unable to retrieve project details.'),
                               redirect=reverse(INDEX_URL))
         return project
+
+
+class AvailableUsersView(generic.View):
+    """Returns a page of the users which can be made members of a project.
+
+    It serves the available list of the project members step when
+    ``OPENSTACK_KEYSTONE_LAZY_MEMBERSHIP`` is enabled, so that the users of
+    the domain are not all rendered in the workflow.
+
+    Keystone can't page the users, so the sorted users of the domain are
+    kept in the Django cache for ``cache_timeout`` seconds per user token,
+    and the pages and searches of the step are served from there.
+    """
+    cache_timeout = 60
+
+    def _get_cache_key(self, request, domain_id):
+        token = getattr(request.user, 'token', None)
+        parts = [request.user.id, getattr(token, 'id', None), domain_id]
+        digest = hashlib.sha256(
+            u'\0'.join(six.text_type(part) for part in parts).encode('utf-8'))
+        return 'horizon:available_users:%s' % digest.hexdigest()
+
+    def _get_users(self, request, domain_id):
+        key = self._get_cache_key(request, domain_id)
+        users = cache.get(key)
+        if users is None:
+            users = [(user.id, user.name or '') for user in
+                     api.keystone.user_list(request, domain=domain_id)]
+            users.sort(key=lambda user: user[1].lower())
+            cache.set(key, users, self.cache_timeout)
+        return users
+
+    def get(self, request, *args, **kwargs):
+        domain_id = (request.GET.get('domain_id') or
+                     identity.get_domain_id_for_operation(request))
+        name_filter = request.GET.get('filter', '').strip().lower()
+        try:
+            offset = max(int(request.GET.get('offset', 0)), 0)
+        except ValueError:
+            offset = 0
+        page_size = utils.get_page_size(request)
+
+        try:
+            users = self._get_users(request, domain_id)
+        except Exception:
+            exceptions.handle(request, ignore=True)
+            return http.JsonResponse({'items': [], 'more': False},
+                                     status=500)
+        if name_filter:
+            users = [user for user in users
+                     if name_filter in user[1].lower()]
+
+        page = users[offset:offset + page_size]
+        return http.JsonResponse({
+            'items': [{'id': user_id, 'name': name}
+                      for user_id, name in page],
+            'more': len(users) > offset + page_size,
+        })
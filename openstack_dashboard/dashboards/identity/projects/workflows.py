@@ -16,10 +16,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import functools
 import logging
 
 from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.utils.http import urlencode
 from django.utils.translation import ugettext_lazy as _
 
 from openstack_auth import utils
@@ -42,12 +45,17 @@ LOG = logging.getLogger(__name__)
 
 INDEX_URL = "horizon:identity:projects:index"
 ADD_USER_URL = "horizon:identity:projects:create_user"
+AVAILABLE_USERS_URL = "horizon:identity:projects:available_users"
 PROJECT_GROUP_ENABLED = keystone.VERSIONS.active >= 3
 PROJECT_USER_MEMBER_SLUG = "update_members"
 PROJECT_GROUP_MEMBER_SLUG = "update_group_members"
 COMMON_HORIZONTAL_TEMPLATE = "identity/projects/_common_horizontal_form.html"
 
 
+def is_lazy_membership():
+    return getattr(settings, 'OPENSTACK_KEYSTONE_LAZY_MEMBERSHIP', False)
+
+
 class ProjectQuotaAction(workflows.Action):
     ifcb_label = _("Injected File Content (Bytes)")
     ifpb_label = _("Length of Injected File Path")
@@ -235,6 +243,31 @@ class UpdateProjectMembersAction(workflows.MembershipAction):
         self.fields[default_role_name] = forms.CharField(required=False)
         self.fields[default_role_name].initial = default_role.id
 
+        # Get list of roles
+        role_list = []
+        try:
+            role_list = api.keystone.role_list(request)
+        except Exception:
+            exceptions.handle(request,
+                              err_msg,
+                              redirect=reverse(INDEX_URL))
+
+        if is_lazy_membership():
+            # Only the current members are rendered, the other users are
+            # loaded page by page by the step.
+            members = []
+            if project_id:
+                try:
+                    members = api.keystone.get_project_members(
+                        request, project_id, domain=domain_id)
+                except Exception:
+                    exceptions.handle(request,
+                                      err_msg,
+                                      redirect=reverse(INDEX_URL))
+            self.init_lazy_membership(
+                [(role.id, role.name) for role in role_list], members)
+            return
+
         # Get list of available users
         all_users = []
         try:
@@ -244,14 +277,6 @@ class UpdateProjectMembersAction(workflows.MembershipAction):
             exceptions.handle(request, err_msg)
         users_list = [(user.id, user.name) for user in all_users]
 
-        # Get list of roles
-        role_list = []
-        try:
-            role_list = api.keystone.role_list(request)
-        except Exception:
-            exceptions.handle(request,
-                              err_msg,
-                              redirect=reverse(INDEX_URL))
         for role in role_list:
             field_name = self.get_member_field_name(role.id)
             label = role.name
@@ -288,8 +313,53 @@ class UpdateProjectMembers(workflows.UpdateMembersStep):
     no_available_text = _("No users found.")
     no_members_text = _("No users.")
 
+    def get_available_url(self):
+        if not is_lazy_membership():
+            return None
+        url = reverse(AVAILABLE_USERS_URL)
+        domain_id = self.workflow.context.get('domain_id')
+        if domain_id:
+            url += '?' + urlencode({'domain_id': domain_id})
+        return url
+
+    def get_requested_roles(self, data, roles, current=None):
+        """Returns the roles the users should have once the step is saved.
+
+        The ids of the roles are mapped by user id. In the lazy mode, the
+        changes submitted by the step are applied to the ``current`` roles
+        of the users.
+        """
+        if self.lazy:
+            requested = dict((user_id, set(role_ids))
+                             for user_id, role_ids in (current or {}).items())
+            for user_id, role_id in data[self.action.get_revokes_field_name()]:
+                requested.get(user_id, set()).discard(role_id)
+            for user_id, role_id in data[self.action.get_grants_field_name()]:
+                requested.setdefault(user_id, set()).add(role_id)
+            return requested
+        requested = collections.defaultdict(set)
+        for role in roles:
+            for user_id in data[self.get_member_field_name(role.id)]:
+                requested[user_id].add(role.id)
+        return requested
+
+    def get_user_names(self):
+        """Returns the names of the users known to the step, mapped by id."""
+        if self.lazy:
+            return dict((user_id, name) for user_id, name, role_ids
+                        in self.action.membership_members)
+        names = {}
+        for field in self.action.fields.values():
+            if isinstance(field, forms.MultipleChoiceField):
+                names.update(field.choices)
+        return names
+
     def contribute(self, data, context):
-        if data:
+        if data and self.lazy:
+            for field in (self.action.get_grants_field_name(),
+                          self.action.get_revokes_field_name()):
+                context[field] = data.get(field) or []
+        elif data:
             try:
                 roles = api.keystone.role_list(self.workflow.request)
             except Exception:
@@ -404,6 +474,12 @@ class UpdateProjectGroups(workflows.UpdateMembersStep):
         return context
 
 
+def report_failed_members(request, failed, names):
+    msg = _('Unable to update the roles of the following users: %s.')
+    messages.error(request, msg % ', '.join(names.get(user_id, user_id)
+                                            for user_id in failed))
+
+
 class CommonQuotaWorkflow(workflows.Workflow):
     def _update_project_quota(self, request, data, project_id):
         disabled_quotas = quotas.get_disabled_quotas(request)
@@ -491,25 +567,21 @@ class CreateProject(CommonQuotaWorkflow):
         # update project members
         users_to_add = 0
         try:
-            available_roles = api.keystone.role_list(request)
             member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-            # count how many users are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_to_add += len(role_list)
+            available_roles = api.keystone.role_list(request)
+            requested = member_step.get_requested_roles(data,
+                                                        available_roles)
+            users_to_add = len(requested)
+            grants, revokes = identity.get_role_changes({}, requested)
             # add new users to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_added = 0
-                for user in role_list:
-                    api.keystone.add_tenant_user_role(request,
-                                                      project=project_id,
-                                                      user=user,
-                                                      role=role.id)
-                    users_added += 1
-                users_to_add -= users_added
+            failed = identity.apply_role_changes(
+                request, grants, revokes,
+                grant=lambda user, role: api.keystone.add_tenant_user_role(
+                    request, project=project_id, user=user, role=role),
+                revoke=None)
+            if failed:
+                report_failed_members(request, failed,
+                                      member_step.get_user_names())
         except Exception:
             if PROJECT_GROUP_ENABLED:
                 group_msg = _(", add project groups")
@@ -707,39 +779,6 @@ class UpdateProject(CommonQuotaWorkflow):
             exceptions.handle(request, ignore=True)
             return
 
-    def _add_roles_to_users(self, request, data, project_id, user_id,
-                            role_ids, available_roles):
-        member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-        current_role_ids = list(role_ids)
-
-        for role in available_roles:
-            field_name = member_step.get_member_field_name(role.id)
-            # Check if the user is in the list of users with this role.
-            if user_id in data[field_name]:
-                # Add it if necessary
-                if role.id not in current_role_ids:
-                    # user role has changed
-                    api.keystone.add_tenant_user_role(
-                        request,
-                        project=project_id,
-                        user=user_id,
-                        role=role.id)
-                else:
-                    # User role is unchanged, so remove it from the
-                    # remaining roles list to avoid removing it later.
-                    index = current_role_ids.index(role.id)
-                    current_role_ids.pop(index)
-        return current_role_ids
-
-    def _remove_roles_from_user(self, request, project_id, user_id,
-                                current_role_ids):
-        for id_to_delete in current_role_ids:
-            api.keystone.remove_tenant_user_role(
-                request,
-                project=project_id,
-                user=user_id,
-                role=id_to_delete)
-
     def _is_removing_self_admin_role(self, request, project_id, user_id,
                                      available_roles, current_role_ids):
         is_current_user = user_id == request.user.id
@@ -767,6 +806,27 @@ class UpdateProject(CommonQuotaWorkflow):
         else:
             return False
 
+    def _grant_user_role(self, request, project_id, user_id, role_id):
+        api.keystone.add_tenant_user_role(request, project=project_id,
+                                          user=user_id, role=role_id)
+
+    def _revoke_user_role(self, request, project_id, user_id, role_id):
+        api.keystone.remove_tenant_user_role(request, project=project_id,
+                                             user=user_id, role=role_id)
+
+    def _filter_self_admin_revokes(self, request, project_id,
+                                   available_roles, revokes):
+        revoked_roles = collections.defaultdict(list)
+        for user_id, role_id in revokes:
+            revoked_roles[user_id].append(role_id)
+        # Prevent admins from doing stupid things to themselves.
+        protected_users = [
+            user_id for user_id, role_ids in revoked_roles.items()
+            if self._is_removing_self_admin_role(
+                request, project_id, user_id, available_roles, role_ids)]
+        return [(user_id, role_id) for user_id, role_id in revokes
+                if user_id not in protected_users]
+
     def _update_project_members(self, request, data, project_id):
         # update project members
         users_to_modify = 0
@@ -779,57 +839,42 @@ class UpdateProject(CommonQuotaWorkflow):
             # can diff against it.
             users_roles = api.keystone.get_project_users_roles(
                 request, project=project_id)
-            users_to_modify = len(users_roles)
-
-            # TODO(bpokorny): The following lines are needed to make sure we
-            # only modify roles for users who are in the current domain.
-            # Otherwise, we'll end up removing roles for users who have roles
-            # on the project but aren't in the domain.  For now, Horizon won't
-            # support managing roles across domains.  The Keystone CLI
-            # supports it, so we may want to add that in the future.
-            all_users = api.keystone.user_list(request,
-                                               domain=data['domain_id'])
-            users_dict = {user.id: user.name for user in all_users}
-
-            for user_id in users_roles.keys():
-                # Don't remove roles if the user isn't in the domain
-                if user_id not in users_dict:
-                    users_to_modify -= 1
-                    continue
+            current = dict((user_id, set(role_ids))
+                           for user_id, role_ids in users_roles.items())
 
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_role_ids = list(users_roles[user_id])
-                modified_role_ids = self._add_roles_to_users(
-                    request, data, project_id, user_id,
-                    current_role_ids, available_roles)
-                # Prevent admins from doing stupid things to themselves.
-                removing_admin = self._is_removing_self_admin_role(
-                    request, project_id, user_id, available_roles,
-                    modified_role_ids)
-                # Otherwise go through and revoke any removed roles.
-                if not removing_admin:
-                    self._remove_roles_from_user(request, project_id, user_id,
-                                                 modified_role_ids)
-                users_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many users may be added for exception handling.
-                users_to_modify += len(data[field_name])
-            for role in available_roles:
-                users_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for user_id in data[field_name]:
-                    if user_id not in users_roles:
-                        api.keystone.add_tenant_user_role(request,
-                                                          project=project_id,
-                                                          user=user_id,
-                                                          role=role.id)
-                    users_added += 1
-                users_to_modify -= users_added
-            return True
+            if member_step.lazy:
+                # Only the users of the domain are shown by the step, so
+                # only their roles can be changed.
+                user_names = member_step.get_user_names()
+            else:
+                # TODO(bpokorny): The following lines are needed to make
+                # sure we only modify roles for users who are in the current
+                # domain. Otherwise, we'll end up removing roles for users
+                # who have roles on the project but aren't in the domain.
+                # For now, Horizon won't support managing roles across
+                # domains. The Keystone CLI supports it, so we may want to
+                # add that in the future.
+                all_users = api.keystone.user_list(request,
+                                                   domain=data['domain_id'])
+                user_names = dict((user.id, user.name) for user in all_users)
+                current = dict((user_id, role_ids)
+                               for user_id, role_ids in current.items()
+                               if user_id in user_names)
+
+            requested = member_step.get_requested_roles(
+                data, available_roles, current)
+            grants, revokes = identity.get_role_changes(current, requested)
+            revokes = self._filter_self_admin_revokes(
+                request, project_id, available_roles, revokes)
+            users_to_modify = len(set(user_id for user_id, role_id
+                                      in grants + revokes))
+
+            failed = identity.apply_role_changes(
+                request, grants, revokes,
+                grant=functools.partial(self._grant_user_role, request,
+                                        project_id),
+                revoke=functools.partial(self._revoke_user_role, request,
+                                         project_id))
         except Exception:
             if PROJECT_GROUP_ENABLED:
                 group_msg = _(", update project groups")
@@ -843,6 +888,11 @@ class UpdateProject(CommonQuotaWorkflow):
                                  'group_msg': group_msg})
             return False
 
+        if failed:
+            report_failed_members(request, failed, user_names)
+            return False
+        return True
+
     def _update_project_groups(self, request, data, project_id, domain_id):
         # update project groups
         groups_to_modify = 0
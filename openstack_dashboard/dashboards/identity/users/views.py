@@ -45,13 +45,14 @@ from openstack_dashboard.utils import identity
 LOG = logging.getLogger(__name__)
 
 
-class IndexView(tables.DataTableView):
+class IndexView(tables.LocalPagedTableMixin, tables.DataTableView):
     table_class = project_tables.UsersTable
     template_name = 'identity/users/index.html'
     page_title = _("Users")
 
     def needs_filter_first(self, table):
-        return self._needs_filter_first
+        # get_data is not called when a page is served from the snapshot.
+        return getattr(self, '_needs_filter_first', False)
 
     def get_data(self):
         users = []
@@ -98,6 +99,15 @@ class IndexView(tables.DataTableView):
                 u.domain_name = domain_lookup.get(u.domain_id)
         return users
 
+    def dump_snapshot_data(self, data):
+        return [dict(user.to_dict(),
+                     project_id=getattr(user, 'project_id', None),
+                     domain_name=getattr(user, 'domain_name', None))
+                for user in data]
+
+    def load_snapshot_data(self, data):
+        return [api.base.APIDictWrapper(user) for user in data]
+
 
 class UpdateView(forms.ModalFormView):
     template_name = 'identity/users/update.html'
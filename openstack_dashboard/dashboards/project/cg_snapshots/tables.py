@@ -63,10 +63,8 @@ class UpdateRow(tables.Row):
 class VolumeCGSnapshotsFilterAction(tables.FilterAction):
 
     def filter(self, table, cg_snapshots, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [cg_snapshot for cg_snapshot in cg_snapshots
-                if query in cg_snapshot.name.lower()]
+        """Case-insensitive search."""
+        return self.search(table, cg_snapshots, filter_string, ('name',))
 
 
 class CGSnapshotsTable(tables.DataTable):
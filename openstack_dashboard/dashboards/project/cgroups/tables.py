@@ -111,10 +111,8 @@ class UpdateRow(tables.Row):
 class VolumeCGroupsFilterAction(tables.FilterAction):
 
     def filter(self, table, cgroups, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [cgroup for cgroup in cgroups
-                if query in cgroup.name.lower()]
+        """Case-insensitive search."""
+        return self.search(table, cgroups, filter_string, ('name',))
 
 
 def get_volume_types(cgroup):
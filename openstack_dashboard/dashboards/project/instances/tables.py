@@ -753,6 +753,75 @@ def get_instance_error(instance):
 
 class UpdateRow(tables.Row):
     ajax = True
+    ajax_batch = True
+    all_tenants = False
+
+    def _list_servers(self, request, instance_ids):
+        """Returns the instances of ``instance_ids`` which still exist.
+
+        A single list of the instances serves the whole batch. The list is
+        capped by the API result limit, so further pages are only fetched
+        while some of the instances are not found.
+        """
+        wanted = set(instance_ids)
+        page_size = getattr(settings, 'API_RESULT_LIMIT', 1000)
+        instances = []
+        marker = None
+        while wanted:
+            search_opts = {'marker': marker, 'paginate': True}
+            servers, has_more = api.nova.server_list(
+                request, search_opts=search_opts,
+                all_tenants=self.all_tenants, page_size=page_size)
+            for server in servers:
+                if server.id in wanted:
+                    wanted.remove(server.id)
+                    instances.append(server)
+            if not has_more or not servers:
+                break
+            marker = servers[-1].id
+        return instances
+
+    def get_data_list(self, request, instance_ids):
+        # A single list of the instances, flavor list and address lookup
+        # serve all the rows.
+        instances = self._list_servers(request, instance_ids)
+
+        try:
+            flavors = dict((str(flavor.id), flavor)
+                           for flavor in api.nova.flavor_list(request))
+        except Exception:
+            flavors = {}
+            exceptions.handle(request,
+                              _('Unable to retrieve flavor information.'),
+                              ignore=True)
+        for instance in instances:
+            flavor_id = instance.flavor["id"]
+            if flavor_id not in flavors:
+                try:
+                    flavors[flavor_id] = api.nova.flavor_get(request,
+                                                             flavor_id)
+                except Exception:
+                    exceptions.handle(request,
+                                      _('Unable to retrieve flavor '
+                                        'information for instance "%s".')
+                                      % instance.id,
+                                      ignore=True)
+                    continue
+            instance.full_flavor = flavors[flavor_id]
+
+        try:
+            api.network.servers_update_addresses(
+                request, instances, all_tenants=self.all_tenants)
+        except Exception:
+            exceptions.handle(request,
+                              _('Unable to retrieve Network information '
+                                'for instances.'),
+                              ignore=True)
+        for instance in instances:
+            error = get_instance_error(instance)
+            if error:
+                messages.error(request, error)
+        return instances
 
     def get_data(self, request, instance_id):
         instance = api.nova.server_get(request, instance_id)
@@ -1267,6 +1336,7 @@ class InstancesTable(tables.DataTable):
         if getattr(settings, 'LAUNCH_INSTANCE_NG_ENABLED', True):
             launch_actions = (LaunchLinkNG,) + launch_actions
         table_actions = launch_actions + (DeleteInstance,
+                                          tables.ExportAction,
                                           InstancesFilterAction)
         row_actions = (StartInstance, ConfirmResize, RevertResize,
                        CreateSnapshot, AssociateIP,
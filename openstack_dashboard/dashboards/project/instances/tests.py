@@ -4203,6 +4203,120 @@ class InstanceAjaxTests(helpers.TestCase):
         self.assertEqual(messages[0][0], 'error')
         self.assertTrue(messages[0][1].startswith('Failed'))
 
+    def _stub_rows_update(self):
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.nova.is_feature_available(
+            IsA(http.HttpRequest), 'locked_attribute'
+        ).MultipleTimes().AndReturn(True)
+        api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+
+    def _get_updated_rows(self, obj_ids):
+        params = [('action', 'rows_update'), ('table', 'instances')]
+        params.extend(('obj_id', obj_id) for obj_id in obj_ids)
+        res = self.client.get('?'.join((INDEX_URL, urlencode(params))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        return json.loads(res.content.decode('utf-8'))['rows']
+
+    @helpers.create_stubs({api.nova: ("server_list",
+                                      "flavor_list",
+                                      "extension_supported",
+                                      "is_feature_available"),
+                           api.network: ('servers_update_addresses',)})
+    def test_rows_update(self):
+        servers = self.servers.list()
+        server = servers[0]
+
+        self._stub_rows_update()
+        search_opts = {'marker': None, 'paginate': True}
+        api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts,
+                             all_tenants=False, page_size=1000) \
+            .AndReturn([servers, False])
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.network.servers_update_addresses(IsA(http.HttpRequest), [server],
+                                             all_tenants=False) \
+            .AndReturn(None)
+
+        self.mox.ReplayAll()
+
+        rows = self._get_updated_rows([server.id, 'deleted-instance'])
+        self.assertEqual([server.id], list(rows))
+        self.assertIn(server.name, rows[server.id])
+
+    @override_settings(API_RESULT_LIMIT=1)
+    @helpers.create_stubs({api.nova: ("server_list",
+                                      "flavor_list",
+                                      "extension_supported",
+                                      "is_feature_available"),
+                           api.network: ('servers_update_addresses',)})
+    def test_rows_update_next_page(self):
+        servers = self.servers.list()
+        server = servers[1]
+
+        self._stub_rows_update()
+        # The instance is not in the first page of the list.
+        search_opts = {'marker': None, 'paginate': True}
+        api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts,
+                             all_tenants=False, page_size=1) \
+            .AndReturn([servers[:1], True])
+        search_opts = {'marker': servers[0].id, 'paginate': True}
+        api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts,
+                             all_tenants=False, page_size=1) \
+            .AndReturn([servers[1:2], True])
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.network.servers_update_addresses(IsA(http.HttpRequest), [server],
+                                             all_tenants=False) \
+            .AndReturn(None)
+
+        self.mox.ReplayAll()
+
+        rows = self._get_updated_rows([server.id])
+        self.assertEqual([server.id], list(rows))
+        self.assertIn(server.name, rows[server.id])
+
+    @helpers.create_stubs({api.nova: ("server_list",
+                                      "flavor_list",
+                                      "extension_supported",
+                                      "is_feature_available"),
+                           api.glance: ('image_list_detailed',),
+                           api.network: ('servers_update_addresses',)})
+    def test_table_delta(self):
+        servers = self.servers.list()
+        server, deleted_server = servers[0], servers[1]
+        deleted_server.status = 'DELETED'
+
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.nova.is_feature_available(
+            IsA(http.HttpRequest), 'locked_attribute'
+        ).MultipleTimes().AndReturn(True)
+        api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        search_opts = {'changes-since': '2017-06-01T00:00:00+00:00'}
+        api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
+            .AndReturn([[server, deleted_server], False])
+        api.network.servers_update_addresses(IsA(http.HttpRequest), [server]) \
+            .AndReturn(None)
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.glance.image_list_detailed(IsA(http.HttpRequest)) \
+            .AndReturn([self.images.list(), False, False])
+
+        self.mox.ReplayAll()
+
+        params = {'action': 'table_delta',
+                  'table': 'instances',
+                  'since': '2017-06-01T00:00:00Z'}
+        res = self.client.get('?'.join((INDEX_URL, urlencode(params))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        delta = json.loads(res.content.decode('utf-8'))
+        self.assertEqual([server.id], [row[0] for row in delta['rows']])
+        self.assertEqual([deleted_server.id], delta['deleted'])
+        self.assertIsNone(delta['ids'])
+
     @helpers.create_stubs({api.nova: ("server_get",
                                       "flavor_get",
                                       'is_feature_available',
@@ -20,10 +20,9 @@
 Views for managing instances.
 """
 from collections import OrderedDict
+import functools
 import logging
 
-import futurist
-
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
@@ -60,25 +59,42 @@ LOG = logging.getLogger(__name__)
 class IndexView(tables.DataTableView):
     table_class = project_tables.InstancesTable
     page_title = _("Instances")
+    delta_refresh = True
+    # The flavors and images are fetched once per request, and shared by
+    # the pages of an export.
+    _full_flavors = None
+    _image_map = None
 
     def has_more_data(self, table):
         return self._more
 
     def get_data(self):
-        marker = self.request.GET.get(
-            project_tables.InstancesTable._meta.pagination_param, None)
+        kwargs = {}
+        if self.exporting:
+            marker = self.export_marker
+            kwargs['page_size'] = self.export_page_size
+        else:
+            marker = self.request.GET.get(
+                project_tables.InstancesTable._meta.pagination_param, None)
         search_opts = self.get_filters({'marker': marker, 'paginate': True})
 
         instances = []
-        full_flavors = {}
-        image_map = {}
+        tasks = []
+        if self._full_flavors is None:
+            self._full_flavors = {}
+            self._image_map = {}
+            tasks = [functools.partial(self._get_flavors,
+                                       full_flavors=self._full_flavors),
+                     functools.partial(self._get_images,
+                                       image_map=self._image_map)]
 
         def _task_get_instances():
             # Gather our instances
             try:
                 tmp_instances, self._more = api.nova.server_list(
                     self.request,
-                    search_opts=search_opts)
+                    search_opts=search_opts,
+                    **kwargs)
                 instances.extend(tmp_instances)
             except Exception:
                 self._more = False
@@ -88,37 +104,66 @@ class IndexView(tables.DataTableView):
                 # don't call api.network
                 return
 
-            try:
-                api.network.servers_update_addresses(self.request, instances)
-            except Exception:
-                exceptions.handle(
-                    self.request,
-                    message=_('Unable to retrieve IP addresses from Neutron.'),
-                    ignore=True)
+            self._update_addresses(instances)
 
-        def _task_get_flavors():
-            # Gather our flavors to correlate our instances to them
-            try:
-                flavors = api.nova.flavor_list(self.request)
-                full_flavors.update([(str(flavor.id), flavor)
-                                     for flavor in flavors])
-            except Exception:
-                exceptions.handle(self.request, ignore=True)
+        api.executor.run(self.request, _task_get_instances, *tasks)
 
-        def _task_get_images():
-            # Gather our images to correlate our instances to them
-            try:
-                # TODO(gabriel): Handle pagination.
-                images = api.glance.image_list_detailed(self.request)[0]
-                image_map.update([(str(image.id), image) for image in images])
-            except Exception:
-                exceptions.handle(self.request, ignore=True)
+        self._set_instance_attributes(instances, self._full_flavors,
+                                      self._image_map)
+        return instances
+
+    def get_delta_data(self, since):
+        # Nova reports the servers created, changed or deleted since a
+        # point in time through the changes-since filter.
+        search_opts = self.get_filters({'changes-since': since.isoformat()})
+        servers, has_more = api.nova.server_list(self.request,
+                                                 search_opts=search_opts)
+        deleted_ids = [server.id for server in servers
+                       if server.status == 'DELETED']
+        instances = [server for server in servers
+                     if server.status != 'DELETED']
+        if not instances:
+            return instances, deleted_ids
+
+        full_flavors = {}
+        image_map = {}
+        api.executor.run(
+            self.request,
+            functools.partial(self._update_addresses, instances=instances),
+            functools.partial(self._get_flavors, full_flavors=full_flavors),
+            functools.partial(self._get_images, image_map=image_map))
+
+        self._set_instance_attributes(instances, full_flavors, image_map)
+        return instances, deleted_ids
+
+    def _update_addresses(self, instances):
+        try:
+            api.network.servers_update_addresses(self.request, instances)
+        except Exception:
+            exceptions.handle(
+                self.request,
+                message=_('Unable to retrieve IP addresses from Neutron.'),
+                ignore=True)
+
+    def _get_flavors(self, full_flavors):
+        # Gather our flavors to correlate our instances to them
+        try:
+            flavors = api.nova.flavor_list(self.request)
+            full_flavors.update([(str(flavor.id), flavor)
+                                 for flavor in flavors])
+        except Exception:
+            exceptions.handle(self.request, ignore=True)
 
-        with futurist.ThreadPoolExecutor(max_workers=3) as e:
-            e.submit(fn=_task_get_instances)
-            e.submit(fn=_task_get_flavors)
-            e.submit(fn=_task_get_images)
+    def _get_images(self, image_map):
+        # Gather our images to correlate our instances to them
+        try:
+            # TODO(gabriel): Handle pagination.
+            images = api.glance.image_list_detailed(self.request)[0]
+            image_map.update([(str(image.id), image) for image in images])
+        except Exception:
+            exceptions.handle(self.request, ignore=True)
 
+    def _set_instance_attributes(self, instances, full_flavors, image_map):
         # Loop through instances to get flavor info.
         for instance in instances:
             if hasattr(instance, 'image'):
@@ -142,8 +187,6 @@ class IndexView(tables.DataTableView):
                        % (flavor_id, instance.id))
                 LOG.info(msg)
 
-        return instances
-
 
 def swap_filter(resources, filters, fake_field, real_field):
     if fake_field in filters:
@@ -391,11 +434,11 @@ class DetailView(tabs.TabView):
                     % {'name': instance.name, 'id': instance_id}
                 exceptions.handle(self.request, msg, ignore=True)
 
-        with futurist.ThreadPoolExecutor(max_workers=4) as e:
-            e.submit(fn=_task_get_volumes)
-            e.submit(fn=_task_get_flavor)
-            e.submit(fn=_task_get_security_groups)
-            e.submit(fn=_task_update_addresses)
+        api.executor.run(self.request,
+                         _task_get_volumes,
+                         _task_get_flavor,
+                         _task_get_security_groups,
+                         _task_update_addresses)
 
         return instance
 
@@ -19,6 +19,7 @@
 import json
 import logging
 import operator
+import threading
 
 from oslo_utils import units
 import six
@@ -417,6 +418,14 @@ class SetInstanceDetailsAction(workflows.Action):
     def _init_images_cache(self):
         if not hasattr(self, '_images_cache'):
             self._images_cache = {}
+            # The image and snapshot choices share the cache and may be
+            # populated concurrently.
+            self._images_lock = threading.Lock()
+
+    def _get_available_images(self, request, context):
+        with self._images_lock:
+            return image_utils.get_available_images(
+                request, context.get('project_id'), self._images_cache)
 
     def _get_volume_display_name(self, volume):
         if hasattr(volume, "volume_id"):
@@ -433,9 +442,7 @@ class SetInstanceDetailsAction(workflows.Action):
 
     def populate_image_id_choices(self, request, context):
         choices = []
-        images = image_utils.get_available_images(request,
-                                                  context.get('project_id'),
-                                                  self._images_cache)
+        images = self._get_available_images(request, context)
         for image in images:
             if image.properties.get("image_type", '') != "snapshot":
                 image.bytes = getattr(
@@ -454,9 +461,7 @@ class SetInstanceDetailsAction(workflows.Action):
         return choices
 
     def populate_instance_snapshot_id_choices(self, request, context):
-        images = image_utils.get_available_images(request,
-                                                  context.get('project_id'),
-                                                  self._images_cache)
+        images = self._get_available_images(request, context)
         choices = [(image.id, image.name)
                    for image in images
                    if image.properties.get("image_type", '') == "snapshot"]
@@ -713,19 +718,16 @@ class SetNetworkAction(workflows.Action):
         help_text=_("Launch instance with"
                     " these networks"))
 
-    def __init__(self, request, *args, **kwargs):
-        super(SetNetworkAction, self).__init__(request, *args, **kwargs)
-        network_list = self.fields["network"].choices
-        if len(network_list) == 1:
-            self.fields['network'].initial = [network_list[0][0]]
-
     class Meta(object):
         name = _("Networking")
         permissions = ('openstack.services.network',)
         help_text = _("Select networks for your instance.")
 
     def populate_network_choices(self, request, context):
-        return instance_utils.network_field_data(request)
+        network_list = instance_utils.network_field_data(request)
+        if len(network_list) == 1:
+            self.fields['network'].initial = [network_list[0][0]]
+        return network_list
 
 
 class SetNetwork(workflows.Step):
@@ -849,6 +851,7 @@ class LaunchInstance(workflows.Workflow):
     failure_message = _('Unable to launch %(count)s named "%(name)s".')
     success_url = "horizon:project:instances:index"
     multipart = True
+    load_concurrently = True
     default_steps = (SelectProjectUser,
                      SetInstanceDetails,
                      SetAccessControls,
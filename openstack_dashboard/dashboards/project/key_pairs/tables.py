@@ -108,10 +108,8 @@ class CreateLinkNG(QuotaKeypairMixin, tables.LinkAction):
 class KeypairsFilterAction(tables.FilterAction):
 
     def filter(self, table, keypairs, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [keypair for keypair in keypairs
-                if query in keypair.name.lower()]
+        """Case-insensitive search."""
+        return self.search(table, keypairs, filter_string, ('name',))
 
 
 class KeyPairsTable(tables.DataTable):
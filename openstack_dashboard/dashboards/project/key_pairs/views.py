@@ -22,6 +22,7 @@ from horizon import messages
 from horizon import tables
 from horizon.utils import memoized
 from horizon import views
+from openstack_dashboard.api import base
 from openstack_dashboard.api import nova
 from openstack_dashboard.dashboards.project.key_pairs \
     import forms as key_pairs_forms
@@ -30,7 +31,7 @@ from openstack_dashboard.dashboards.project.key_pairs \
 from openstack_dashboard import policy
 
 
-class IndexView(tables.DataTableView):
+class IndexView(tables.LocalPagedTableMixin, tables.DataTableView):
     table_class = key_pairs_tables.KeyPairsTable
     page_title = _("Key Pairs")
 
@@ -49,6 +50,14 @@ class IndexView(tables.DataTableView):
                               _('Unable to retrieve key pair list.'))
         return keypairs
 
+    def dump_snapshot_data(self, data):
+        return [{'name': keypair.name,
+                 'fingerprint': getattr(keypair, 'fingerprint', None)}
+                for keypair in data]
+
+    def load_snapshot_data(self, data):
+        return [base.APIDictWrapper(keypair) for keypair in data]
+
 
 class ImportView(forms.ModalFormView):
     form_class = key_pairs_forms.ImportKeypair
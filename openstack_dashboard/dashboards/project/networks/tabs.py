@@ -68,3 +68,4 @@ class NetworkDetailsTabs(tabs.DetailTabsGroup):
     slug = "network_tabs"
     tabs = (OverviewTab, subnets_tabs.SubnetsTab, ports_tabs.PortsTab, )
     sticky = True
+    load_concurrently = True
@@ -39,11 +39,13 @@ INDEX_URL = reverse('horizon:project:overview:index')
 class UsageViewTests(test.TestCase):
 
     @test.create_stubs({api.nova: ('usage_get',
+                                   'usage_get_pages',
                                    'tenant_absolute_limits',
                                    'extension_supported')})
     def _stub_nova_api_calls(self, nova_stu_enabled=True,
                              tenant_limits_exception=False,
-                             stu_exception=False, overview_days_range=None):
+                             stu_exception=False, overview_days_range=None,
+                             csv=False):
         api.nova.extension_supported(
             'SimpleTenantUsage', IsA(http.HttpRequest)) \
             .AndReturn(nova_stu_enabled)
@@ -60,7 +62,8 @@ class UsageViewTests(test.TestCase):
 
         if nova_stu_enabled:
             self._nova_stu_enabled(stu_exception,
-                                   overview_days_range=overview_days_range)
+                                   overview_days_range=overview_days_range,
+                                   csv=csv)
 
     @test.create_stubs({api.cinder: ('tenant_absolute_limits',)})
     def _stub_cinder_api_calls(self):
@@ -83,7 +86,8 @@ class UsageViewTests(test.TestCase):
             api.neutron.security_group_list(IsA(http.HttpRequest)) \
                 .AndReturn(self.security_groups.list())
 
-    def _nova_stu_enabled(self, exception=False, overview_days_range=1):
+    def _nova_stu_enabled(self, exception=False, overview_days_range=1,
+                          csv=False):
         now = timezone.now()
         if overview_days_range:
             start_day = now - datetime.timedelta(days=overview_days_range)
@@ -93,7 +97,12 @@ class UsageViewTests(test.TestCase):
                                   start_day.day, 0, 0, 0, 0)
         end = datetime.datetime(now.year, now.month, now.day, 23, 59, 59, 0)
 
-        if exception:
+        if csv:
+            # The CSV export summarizes the usage pages as they arrive.
+            api.nova.usage_get_pages(IsA(http.HttpRequest), self.tenant.id,
+                                     start, end) \
+                .AndReturn([api.nova.NovaUsage(self.usages.first())])
+        elif exception:
             api.nova.usage_get(IsA(http.HttpRequest), self.tenant.id,
                                start, end) \
                 .AndRaise(exception)
@@ -196,7 +205,8 @@ class UsageViewTests(test.TestCase):
 
     def _test_usage_csv(self, nova_stu_enabled=True, overview_days_range=None):
         self._stub_nova_api_calls(nova_stu_enabled,
-                                  overview_days_range=overview_days_range)
+                                  overview_days_range=overview_days_range,
+                                  csv=True)
         self._stub_neutron_api_calls()
         self._stub_cinder_api_calls()
         self.mox.ReplayAll()
@@ -32,7 +32,7 @@ from openstack_dashboard.dashboards.project.instances \
 from openstack_dashboard.utils import filters
 
 
-class ProjectUsageCsvRenderer(csvbase.BaseCsvResponse):
+class ProjectUsageCsvRenderer(csvbase.BaseCsvStreamingResponse):
 
     columns = [_("Instance Name"), _("VCPUs"), _("RAM (MB)"),
                _("Disk (GB)"), _("Usage (Hours)"),
@@ -41,7 +41,7 @@ class ProjectUsageCsvRenderer(csvbase.BaseCsvResponse):
     def get_row_data(self):
 
         choices = project_tables.STATUS_DISPLAY_CHOICES
-        for inst in self.context['usage'].get_instances():
+        for inst in self.context['usage'].iter_instances():
             state_label = (
                 filters.get_display_label(choices, inst['state']))
             yield (inst['name'],
@@ -48,3 +48,4 @@ class RouterDetailTabs(tabs.DetailTabsGroup):
     slug = "router_details"
     tabs = (OverviewTab, InterfacesTab, er_tabs.ExtraRoutesTab)
     sticky = True
+    load_concurrently = True
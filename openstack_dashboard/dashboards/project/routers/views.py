@@ -40,7 +40,7 @@ from openstack_dashboard.dashboards.project.routers import tables as rtables
 from openstack_dashboard.dashboards.project.routers import tabs as rdtabs
 
 
-class IndexView(tables.DataTableView):
+class IndexView(tables.LocalPagedTableMixin, tables.DataTableView):
     table_class = rtables.RoutersTable
     page_title = _("Routers")
     FILTERS_MAPPING = {'admin_state_up': {_("up"): True, _("down"): False}}
@@ -69,6 +69,12 @@ class IndexView(tables.DataTableView):
         routers = self._get_routers()
         return routers
 
+    def dump_snapshot_data(self, data):
+        return [dict(router.to_dict(), name=router.name) for router in data]
+
+    def load_snapshot_data(self, data):
+        return [api.neutron.Router(router) for router in data]
+
     def _list_external_networks(self):
         try:
             search_opts = {'router:external': True}
@@ -99,10 +99,8 @@ class ManageRules(policy.PolicyTargetMixin, tables.LinkAction):
 class SecurityGroupsFilterAction(tables.FilterAction):
 
     def filter(self, table, security_groups, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [security_group for security_group in security_groups
-                if query in security_group.name.lower()]
+        """Case-insensitive search."""
+        return self.search(table, security_groups, filter_string, ('name',))
 
 
 class SecurityGroupsTable(tables.DataTable):
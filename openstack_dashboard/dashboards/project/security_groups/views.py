@@ -161,7 +161,7 @@ class CreateView(forms.ModalFormView):
     page_title = _("Create Security Group")
 
 
-class IndexView(tables.DataTableView):
+class IndexView(tables.LocalPagedTableMixin, tables.DataTableView):
     table_class = project_tables.SecurityGroupsTable
     page_title = _("Security Groups")
 
@@ -176,3 +176,10 @@ class IndexView(tables.DataTableView):
             exceptions.handle(self.request,
                               _('Unable to retrieve security groups.'))
         return sorted(security_groups, key=lambda group: group.name)
+
+    def dump_snapshot_data(self, data):
+        # The rules are rebuilt from the security_group_rules.
+        return [group.to_dict() for group in data]
+
+    def load_snapshot_data(self, data):
+        return [api.neutron.SecurityGroup(group) for group in data]
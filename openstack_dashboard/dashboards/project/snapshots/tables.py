@@ -177,10 +177,8 @@ class SnapshotVolumeNameColumn(tables.WrappingColumn):
 class VolumeSnapshotsFilterAction(tables.FilterAction):
 
     def filter(self, table, snapshots, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [snapshot for snapshot in snapshots
-                if query in snapshot.name.lower()]
+        """Case-insensitive search."""
+        return self.search(table, snapshots, filter_string, ('name',))
 
 
 class VolumeDetailsSnapshotsTable(volume_tables.VolumesTableBase):
@@ -465,10 +465,8 @@ class VolumesTableBase(tables.DataTable):
 class VolumesFilterAction(tables.FilterAction):
 
     def filter(self, table, volumes, filter_string):
-        """Naive case-insensitive search."""
-        q = filter_string.lower()
-        return [volume for volume in volumes
-                if q in volume.name.lower()]
+        """Case-insensitive search."""
+        return self.search(table, volumes, filter_string, ('name',))
 
 
 class UpdateMetadata(tables.LinkAction):
@@ -511,7 +509,7 @@ class VolumesTable(VolumesTableBase):
         status_columns = ["status"]
         row_class = UpdateRow
         table_actions = (CreateVolume, AcceptTransfer, DeleteVolume,
-                         VolumesFilterAction)
+                         tables.ExportAction, VolumesFilterAction)
 
         launch_actions = ()
         if getattr(settings, 'LAUNCH_INSTANCE_LEGACY_ENABLED', False):
@@ -57,10 +57,14 @@ class VolumeTableMixIn(object):
     def _get_volumes(self, search_opts=None):
         try:
             marker, sort_dir = self._get_marker()
+            kwargs = {}
+            if self.exporting:
+                kwargs['page_size'] = self.export_page_size
             volumes, self._has_more_data, self._has_prev_data = \
                 cinder.volume_list_paged(self.request, marker=marker,
                                          search_opts=search_opts,
-                                         sort_dir=sort_dir, paginate=True)
+                                         sort_dir=sort_dir, paginate=True,
+                                         **kwargs)
 
             if sort_dir == "asc":
                 volumes.reverse()
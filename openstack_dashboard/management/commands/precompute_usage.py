@@ -0,0 +1,100 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils import timezone
+from keystoneauth1 import loading
+from keystoneauth1 import session
+from novaclient import api_versions
+from novaclient import client as nova_client
+
+from openstack_dashboard import api
+from openstack_dashboard.usage import store
+
+
+class Command(BaseCommand):
+    help = ("Precompute the usage of all projects for closed months and "
+            "keep it in the usage store of the overview panels. The "
+            "credentials of an admin user are read from the usual OS_* "
+            "environment variables.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('-m', '--months', type=int, default=1,
+                            help=("The number of closed months to compute, "
+                                  "going back from the last one"))
+        parser.add_argument('--region',
+                            default=os.environ.get('OS_REGION_NAME'),
+                            help=("The region of the compute service, as "
+                                  "selected by the dashboard users"))
+        parser.add_argument('--timeout', type=int, default=None,
+                            help=("How long the summaries are kept, in "
+                                  "seconds. They are kept until evicted by "
+                                  "default"))
+        parser.add_argument('--force', action='store_true',
+                            help="Compute the months already stored again")
+
+    def get_novaclient(self, region):
+        loader = loading.get_plugin_loader('password')
+        try:
+            auth = loader.load_from_options(
+                auth_url=os.environ['OS_AUTH_URL'],
+                username=os.environ['OS_USERNAME'],
+                password=os.environ['OS_PASSWORD'],
+                project_name=os.environ['OS_PROJECT_NAME'],
+                user_domain_name=os.environ.get('OS_USER_DOMAIN_NAME',
+                                                'Default'),
+                project_domain_name=os.environ.get('OS_PROJECT_DOMAIN_NAME',
+                                                   'Default'))
+        except KeyError as e:
+            raise CommandError("The %s environment variable is not set."
+                               % e.args[0])
+        verify = getattr(settings, 'OPENSTACK_SSL_CACERT', None) or True
+        if getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False):
+            verify = False
+        sess = session.Session(auth=auth, verify=verify)
+        client = nova_client.Client('2.1', session=sess, region_name=region)
+        min_ver, max_ver = api_versions._get_server_version_range(client)
+        if min_ver <= api_versions.APIVersion('2.40') <= max_ver:
+            client = nova_client.Client('2.40', session=sess,
+                                        region_name=region)
+        return client
+
+    def handle(self, *args, **options):
+        if store.get_cache() is None:
+            raise CommandError("The usage store is not enabled, set "
+                               "OVERVIEW_USAGE_CACHE first.")
+        if options['months'] < 1:
+            raise CommandError("At least one month must be computed.")
+
+        region = options['region']
+        client = self.get_novaclient(region)
+
+        today = timezone.now().date()
+        year, month = today.year, today.month
+        for i in range(options['months']):
+            year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+            if (not options['force'] and
+                    store.get_month(region, year, month) is not None):
+                self.stdout.write("%04d-%02d is already stored."
+                                  % (year, month))
+                continue
+            start, end = store.get_month_range(year, month)
+            usages = store.summarize_pages(
+                api.nova.client_usage_list_pages(client, start, end))
+            store.set_month(region, year, month, usages,
+                            timeout=options['timeout'])
+            self.stdout.write("Stored the usage of %d projects for "
+                              "%04d-%02d." % (len(usages), year, month))
@@ -29,6 +29,7 @@ from openstack_dashboard import theme_settings
 from openstack_dashboard.utils import settings as settings_utils
 
 from horizon.utils.escape import monkeypatch_escape
+from horizon.utils import file_discovery
 
 monkeypatch_escape()
 
@@ -55,6 +56,8 @@ MEDIA_ROOT = None
 MEDIA_URL = None
 STATIC_ROOT = None
 STATIC_URL = None
+STATIC_DISCOVERY_CACHE = None
+SCSS_CACHE_DIR = os.path.join(ROOT_PATH, 'local', '.scss_cache')
 SELECTABLE_THEMES = None
 INTEGRATION_TESTS_SUPPORT = False
 NG_TEMPLATE_CACHE_AGE = 2592000
@@ -332,6 +335,12 @@ if DEBUG:
         CACHED_TEMPLATE_LOADERS + ADD_TEMPLATE_LOADERS
     )
 else:
+    # The templates of the themes are cached for each theme.
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('horizon.themes.CachedThemeTemplateLoader', [loader])
+        if loader == 'horizon.themes.ThemeTemplateLoader' else loader
+        for loader in TEMPLATES[0]['OPTIONS']['loaders']
+    ]
     TEMPLATES[0]['OPTIONS']['loaders'].extend(
         [('django.template.loaders.cached.Loader', CACHED_TEMPLATE_LOADERS)] +
         ADD_TEMPLATE_LOADERS
@@ -415,9 +424,14 @@ if not SECRET_KEY:
                                                        '.secret_key_store'))
 
 # populate HORIZON_CONFIG with auto-discovered JavaScript sources, mock files,
-# specs files and external templates.
+# specs files and external templates. The files found by the previous
+# processes are reused for the directories which have not changed since.
+_discovery_cache = None
+if STATIC_DISCOVERY_CACHE:
+    _discovery_cache = file_discovery.DiscoveryCache(STATIC_DISCOVERY_CACHE)
 settings_utils.find_static_files(HORIZON_CONFIG, AVAILABLE_THEMES,
-                                 THEME_COLLECTION_DIR, ROOT_PATH)
+                                 THEME_COLLECTION_DIR, ROOT_PATH,
+                                 discovery_cache=_discovery_cache)
 
 
 # Load the pluggable dashboard settings
@@ -432,8 +446,11 @@ settings_utils.update_dashboards(
     ],
     HORIZON_CONFIG,
     INSTALLED_APPS,
+    discovery_cache=_discovery_cache,
 )
 INSTALLED_APPS[0:0] = ADD_INSTALLED_APPS
+if _discovery_cache is not None:
+    _discovery_cache.save()
 
 NG_TEMPLATE_CACHE_AGE = NG_TEMPLATE_CACHE_AGE if not DEBUG else 0
 
@@ -287,6 +287,21 @@ class ApiHelperTests(test.TestCase):
         with self.assertRaises(exceptions.ServiceCatalogException):
             url = api_base.url_for(self.request, 'image')
 
+    def test_endpoint_index(self):
+        index = api_base.get_endpoint_index(self.request.user)
+        self.assertIs(index, api_base.get_endpoint_index(self.request.user))
+        self.assertTrue(api_base.is_service_enabled(self.request, 'compute'))
+
+        self.request.user.service_catalog = [
+            service for service in self.request.user.service_catalog
+            if service['type'] != 'compute']
+
+        self.assertIsNot(index,
+                         api_base.get_endpoint_index(self.request.user))
+        self.assertFalse(api_base.is_service_enabled(self.request, 'compute'))
+        with self.assertRaises(exceptions.ServiceCatalogException):
+            api_base.url_for(self.request, 'compute')
+
 
 class QuotaSetTests(test.TestCase):
 
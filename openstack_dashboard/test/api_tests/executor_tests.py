@@ -0,0 +1,66 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import absolute_import
+
+from concurrent import futures as concurrent_futures
+import threading
+
+from django.test.utils import override_settings
+
+from horizon import exceptions
+from horizon import messages
+from openstack_dashboard.api import executor
+from openstack_dashboard.test import helpers as test
+
+
+class ExecutorTests(test.TestCase):
+
+    def test_run(self):
+        request = self.factory.get('/')
+        calls = []
+
+        def call(value):
+            calls.append(threading.current_thread())
+            messages.info(request, "Called %s." % value)
+            return value
+
+        futures = executor.run(request,
+                               lambda: call(1),
+                               lambda: call(2),
+                               lambda: call(3))
+
+        self.assertEqual([1, 2, 3], [future.result() for future in futures])
+        self.assertNotIn(threading.current_thread(), calls)
+        # The messages of the calls are added in order by the request thread.
+        self.assertEqual(["Called 1.", "Called 2.", "Called 3."],
+                         [m.message for m in request._messages])
+
+    def test_run_exception(self):
+        def fail():
+            raise exceptions.NotFound()
+
+        futures = executor.run(self.request, fail, lambda: 2)
+
+        self.assertRaises(exceptions.NotFound, futures[0].result)
+        self.assertEqual(2, futures[1].result())
+
+    @override_settings(CONCURRENT_API_CALLS={'max_per_request': 1})
+    def test_run_cancelled_once_unauthorized(self):
+        def unauthorized():
+            raise exceptions.NotAuthorized()
+
+        futures = executor.run(self.request, unauthorized, lambda: 2)
+
+        self.assertRaises(exceptions.NotAuthorized, futures[0].result)
+        self.assertRaises(concurrent_futures.CancelledError,
+                          futures[1].result)
@@ -83,6 +83,24 @@ class RoleAPITests(test.APITestCase):
         # (it would show up in mox as an unexpected method call)
         role = api.keystone.get_default_role(self.request)
 
+    def test_get_project_users_roles(self):
+        keystoneclient = self.stub_keystoneclient()
+        tenant = self.tenants.first()
+        keystoneclient.role_assignments = self.mox.CreateMockAnything()
+        keystoneclient.role_assignments.list(
+            project=tenant.id, user=None, role=None, group=None,
+            domain=None, effective=False, include_subtree=False,
+            include_names=True).AndReturn(self.role_assignments.list())
+        self.mox.ReplayAll()
+
+        users_roles = api.keystone.get_project_users_roles(self.request,
+                                                           tenant.id)
+
+        # Only the roles of the users on the project are kept, in a single
+        # request.
+        self.assertEqual({'1': ['1'], '2': ['2'], '3': ['2']},
+                         dict(users_roles))
+
 
 class ServiceAPITests(test.APITestCase):
     def test_service_wrapper(self):
@@ -269,6 +269,40 @@ class ComputeApiTests(test.APITestCase):
         for usage in ret_val:
             self.assertIsInstance(usage, api.nova.NovaUsage)
 
+    def test_usage_list_pages_paginated(self):
+        usages = self.usages.list()
+
+        novaclient = self.stub_novaclient()
+        novaclient.versions = self.mox.CreateMockAnything()
+        novaclient.versions.get_current().AndReturn(
+            api_versions.APIVersion('2.40'))
+        novaclient.api_version = api_versions.APIVersion('2.40')
+        novaclient.usage = self.mox.CreateMockAnything()
+        novaclient.usage.list('start', 'end', True).AndReturn(usages)
+        novaclient.usage.list(
+            'start',
+            'end',
+            True,
+            marker=u'063cf7f3-ded1-4297-bc4c-31eae876cc93',
+        ).AndReturn({})
+        self.mox.ReplayAll()
+
+        pages = list(api.nova.usage_list_pages(self.request, 'start', 'end'))
+        self.assertEqual(1, len(pages))
+        for usage in pages[0]:
+            self.assertIsInstance(usage, api.nova.NovaUsage)
+
+    def test_usage_totals(self):
+        usage = api.nova.NovaUsage(self.usages.first())
+        totals = api.nova.NovaUsageTotals(usage.tenant_id)
+        totals.add(usage)
+        self.assertEqual(usage.get_summary(), totals.get_summary())
+
+        totals.add(usage)
+        self.assertEqual(dict((key, value * 2) for key, value
+                              in usage.get_summary().items()),
+                         totals.get_summary())
+
     def test_server_get(self):
         server = self.servers.first()
 
@@ -283,6 +283,12 @@ REST_API_ADDITIONAL_SETTINGS = ['REST_API_SETTING_2']
 
 ALLOWED_PRIVATE_SUBNET_CIDR = {'ipv4': [], 'ipv6': []}
 
+# The test users share the same token, while the tests change the policies.
+NAVIGATION_CACHE = None
+
+# The tests do not share the compiled stylesheets.
+SCSS_CACHE_DIR = None
+
 
 # --------------------
 # Test-only settings
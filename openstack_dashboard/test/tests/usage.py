@@ -0,0 +1,118 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import absolute_import
+
+import datetime
+
+from django.core.cache import cache
+from django import http
+from django.test.utils import override_settings
+from django.utils import timezone
+from mox3.mox import IsA
+
+from openstack_dashboard import api
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard import usage
+from openstack_dashboard.usage import store
+
+
+@override_settings(OVERVIEW_USAGE_CACHE='default')
+class UsageStoreTests(test.TestCase):
+
+    def setUp(self):
+        super(UsageStoreTests, self).setUp()
+        cache.clear()
+
+    def _get_totals(self, usage_list):
+        return store.summarize_pages([[api.nova.NovaUsage(u)
+                                       for u in usage_list]])
+
+    def _get_fields(self, usages):
+        return [(tenant_id, vars(totals))
+                for tenant_id, totals in usages.items()]
+
+    def test_split_period(self):
+        february = self._get_totals(self.usages.list())
+        store.set_month('RegionOne', 2017, 2, february)
+        store.set_month('RegionOne', 2017, 4, february)
+        start = datetime.datetime(2017, 1, 15, 0, 0, 0)
+        end = datetime.datetime(2017, 4, 10, 23, 59, 59)
+        now = datetime.datetime(2017, 4, 10, 12, 0, 0)
+
+        periods = list(store.split_period('RegionOne', start, end, now))
+
+        # April is not closed yet, so it is fetched even though it is
+        # stored.
+        self.assertEqual(
+            [(start, datetime.datetime(2017, 1, 31, 23, 59, 59)),
+             (datetime.datetime(2017, 2, 1, 0, 0, 0),
+              datetime.datetime(2017, 2, 28, 23, 59, 59)),
+             (datetime.datetime(2017, 3, 1, 0, 0, 0), end)],
+            [(s, e) for s, e, usages in periods])
+        self.assertIsNone(periods[0][2])
+        self.assertIsNone(periods[2][2])
+        # The stored totals are copies, their fields are compared.
+        self.assertEqual(self._get_fields(february),
+                         self._get_fields(periods[1][2]))
+
+    def test_split_period_other_region(self):
+        store.set_month('RegionOne', 2017, 2,
+                        self._get_totals(self.usages.list()))
+        start = datetime.datetime(2017, 2, 1, 0, 0, 0)
+        end = datetime.datetime(2017, 3, 10, 23, 59, 59)
+
+        periods = list(store.split_period('RegionTwo', start, end, end))
+
+        self.assertEqual([(start, end, None)], periods)
+
+    @override_settings(OVERVIEW_USAGE_CACHE=None)
+    def test_split_period_disabled(self):
+        store.set_month('RegionOne', 2017, 2,
+                        self._get_totals(self.usages.list()))
+        start = datetime.datetime(2017, 2, 1, 0, 0, 0)
+        end = datetime.datetime(2017, 3, 10, 23, 59, 59)
+
+        periods = list(store.split_period('RegionOne', start, end, end))
+
+        self.assertEqual([(start, end, None)], periods)
+
+    @test.create_stubs({api.nova: ('usage_list_pages',)})
+    def test_global_usage_from_store(self):
+        usage_list = [api.nova.NovaUsage(u) for u in self.usages.list()]
+        now = timezone.make_naive(timezone.now(), timezone.utc)
+        year, month = ((now.year - 1, 12) if now.month == 1
+                       else (now.year, now.month - 1))
+        start, last_month_end = store.get_month_range(year, month)
+        end = datetime.datetime(now.year, now.month, now.day, 23, 59, 59)
+        region = getattr(self.request.user, 'services_region', None)
+        store.set_month(region, year, month, store.summarize_pages(
+            [usage_list]))
+        api.nova.usage_list_pages(
+            IsA(http.HttpRequest),
+            last_month_end + datetime.timedelta(seconds=1),
+            end).AndReturn([usage_list])
+        self.mox.ReplayAll()
+
+        global_usage = usage.GlobalUsage(self.request)
+        usages = global_usage.get_usage_list(start, end)
+
+        for totals in usages:
+            tenant_usage = [u for u in usage_list
+                            if u.tenant_id == totals.tenant_id][0]
+            summary = tenant_usage.get_summary()
+            # The hours of both months add up, the running instances are
+            # the ones of the current month.
+            self.assertEqual(summary['vcpu_hours'] * 2, totals.vcpu_hours)
+            self.assertEqual(summary['instances'],
+                             totals.total_active_instances)
+            self.assertEqual(summary['vcpus'], totals.vcpus)
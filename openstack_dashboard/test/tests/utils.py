@@ -15,8 +15,10 @@
 
 from oslo_utils import uuidutils
 
+from horizon import exceptions
 from openstack_dashboard.test import helpers as test
 from openstack_dashboard.utils import filters
+from openstack_dashboard.utils import identity
 
 
 class UtilsFilterTests(test.TestCase):
@@ -38,3 +40,42 @@ class UtilsFilterTests(test.TestCase):
     def test_reject_random_string(self):
         val = '55WbJTpJDf'
         self.assertRaises(ValueError, filters.get_int_or_uuid, val)
+
+
+class UtilsIdentityTests(test.TestCase):
+    def test_get_role_changes(self):
+        current = {'1': {'a', 'b'}, '2': {'a'}}
+        requested = {'1': {'a', 'c'}, '3': {'b'}}
+
+        grants, revokes = identity.get_role_changes(current, requested)
+
+        self.assertEqual([('1', 'c'), ('3', 'b')], grants)
+        self.assertEqual([('1', 'b'), ('2', 'a')], revokes)
+
+    def test_apply_role_changes(self):
+        calls = []
+
+        def grant(member_id, role_id):
+            calls.append(('grant', member_id, role_id))
+
+        def revoke(member_id, role_id):
+            if member_id == '2':
+                raise exceptions.Conflict()
+            calls.append(('revoke', member_id, role_id))
+
+        failed = identity.apply_role_changes(
+            self.request, [('1', 'c'), ('3', 'b')],
+            [('1', 'b'), ('2', 'a')], grant, revoke)
+
+        self.assertEqual(['2'], failed)
+        self.assertItemsEqual([('revoke', '1', 'b'), ('grant', '1', 'c'),
+                               ('grant', '3', 'b')], calls)
+
+    def test_apply_role_changes_unauthorized(self):
+        def grant(member_id, role_id):
+            raise exceptions.NotAuthorized()
+
+        self.assertRaises(exceptions.NotAuthorized,
+                          identity.apply_role_changes,
+                          self.request, [('1', 'c')], [],
+                          grant, lambda member_id, role_id: None)
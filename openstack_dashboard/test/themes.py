@@ -10,6 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from django.template.engine import Engine
+from django.test.utils import override_settings
+
+from horizon import themes as horizon_themes
 from openstack_dashboard import settings
 from openstack_dashboard.templatetags import themes
 from openstack_dashboard.test import helpers as test
@@ -27,3 +31,33 @@ class SelectableThemeTest(test.TestCase):
         selectable = themes.themes()
         available = themes.settings.AVAILABLE_THEMES
         self.assertNotEqual(selectable, available)
+
+
+class ThemeTemplateLoaderTest(test.TestCase):
+    @override_settings(AVAILABLE_THEMES=[
+        ('default', 'Default', 'themes/default'),
+        ('custom', 'Custom', 'themes/custom'),
+        ('default', 'Duplicate', 'themes/duplicate'),
+    ])
+    def test_find_theme(self):
+        self.assertEqual(('default', 'Default', 'themes/default'),
+                         horizon_themes.find_theme('default'))
+        self.assertEqual(('custom', 'Custom', 'themes/custom'),
+                         horizon_themes.find_theme('custom'))
+        self.assertIsNone(horizon_themes.find_theme('unknown'))
+
+    def test_cached_loader_keys_per_theme(self):
+        loader = horizon_themes.CachedThemeTemplateLoader(
+            Engine(), ['horizon.themes.ThemeTemplateLoader'])
+
+        with horizon_themes.override_theme('default'):
+            default_key = loader.cache_key('horizon/common/_detail.html', None)
+        with horizon_themes.override_theme('material'):
+            material_key = loader.cache_key('horizon/common/_detail.html',
+                                            None)
+        with horizon_themes.override_theme('unknown'):
+            unknown_key = loader.cache_key('horizon/common/_detail.html', None)
+
+        self.assertNotEqual(default_key, material_key)
+        # The templates of unknown themes are those of the default theme.
+        self.assertEqual(default_key, unknown_key)
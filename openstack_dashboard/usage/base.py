@@ -12,6 +12,7 @@
 
 from __future__ import division
 
+import collections
 import datetime
 
 from django.conf import settings
@@ -23,10 +24,14 @@ from horizon import forms
 from horizon import messages
 
 from openstack_dashboard import api
+from openstack_dashboard.usage import store
 
 
 class BaseUsage(object):
     show_deleted = False
+    # When False the usage is summarized as it is fetched, and only the
+    # fields of the instances needed by the reports are kept.
+    keep_instances = True
 
     def __init__(self, request, project_id=None):
         self.project_id = project_id or request.user.tenant_id
@@ -63,6 +68,9 @@ class BaseUsage(object):
         [instance_list.extend(u.server_usages) for u in self.usage_list]
         return instance_list
 
+    def iter_instances(self):
+        return iter(self.get_instances())
+
     def get_date_range(self):
         if not hasattr(self, "start") or not hasattr(self, "end"):
             args_start = (self.first_day.year, self.first_day.month,
@@ -209,6 +217,15 @@ class BaseUsage(object):
     def get_usage_list(self, start, end):
         return []
 
+    def get_usage_periods(self, start, end):
+        """Splits the naive UTC period between the usage store and Nova.
+
+        See :func:`openstack_dashboard.usage.store.split_period`.
+        """
+        now = timezone.make_naive(self.today, timezone.utc)
+        region = getattr(self.request.user, 'services_region', None)
+        return store.split_period(region, start, end, now)
+
     def summarize(self, start, end):
         if not api.nova.extension_supported('SimpleTenantUsage', self.request):
             return
@@ -253,31 +270,59 @@ class GlobalUsage(BaseUsage):
     show_deleted = True
 
     def get_usage_list(self, start, end):
-        return api.nova.usage_list(self.request, start, end)
+        # The per-tenant totals are added up as the pages arrive, so only
+        # one page of instances is held in memory at a time. The closed
+        # months precomputed in the usage store are not fetched again.
+        usages = collections.OrderedDict()
+        periods = list(self.get_usage_periods(start, end))
+        for i, (period_start, period_end, totals) in enumerate(periods):
+            if totals is None:
+                totals = store.summarize_pages(api.nova.usage_list_pages(
+                    self.request, period_start, period_end))
+            for tenant_id, tenant_totals in totals.items():
+                if tenant_id not in usages:
+                    usages[tenant_id] = api.nova.NovaUsageTotals(tenant_id)
+                usages[tenant_id].add_totals(tenant_totals,
+                                             latest=i == len(periods) - 1)
+        return list(usages.values())
 
 
 class ProjectUsage(BaseUsage):
     attrs = ('memory_mb', 'vcpus', 'uptime',
              'hours', 'local_gb')
+    # The fields of the instances kept when keep_instances is False.
+    instance_fields = ('name', 'vcpus', 'memory_mb', 'local_gb', 'hours',
+                       'uptime', 'state')
 
     def get_usage_list(self, start, end):
+        if not self.keep_instances:
+            totals = api.nova.NovaUsageTotals(self.project_id)
+            instances = []
+            for usage in api.nova.usage_get_pages(self.request,
+                                                  self.project_id,
+                                                  start, end):
+                totals.add(usage)
+                # Only the fields of the report are kept of each instance.
+                instances.extend(
+                    dict((field, server_usage[field])
+                         for field in self.instance_fields)
+                    for server_usage in self._get_server_usages(usage))
+            totals.server_usages = instances
+            return (totals,)
+        usage = api.nova.usage_get(self.request, self.project_id, start, end)
+        usage.server_usages = list(self._get_server_usages(usage))
+        return (usage,)
+
+    def _get_server_usages(self, usage):
         show_deleted = self.request.GET.get('show_deleted',
                                             self.show_deleted)
-        instances = []
-        deleted_instances = []
-        usage = api.nova.usage_get(self.request, self.project_id, start, end)
+        now = self.today
         # Attribute may not exist if there are no instances
-        if hasattr(usage, 'server_usages'):
-            now = self.today
-            for server_usage in usage.server_usages:
-                # This is a way to phrase uptime in a way that is compatible
-                # with the 'timesince' filter. (Use of local time intentional.)
-                server_uptime = server_usage['uptime']
-                total_uptime = now - datetime.timedelta(seconds=server_uptime)
-                server_usage['uptime_at'] = total_uptime
-                if server_usage['ended_at'] and not show_deleted:
-                    deleted_instances.append(server_usage)
-                else:
-                    instances.append(server_usage)
-        usage.server_usages = instances
-        return (usage,)
+        for server_usage in getattr(usage, 'server_usages', []):
+            # This is a way to phrase uptime in a way that is compatible
+            # with the 'timesince' filter. (Use of local time intentional.)
+            server_uptime = server_usage['uptime']
+            total_uptime = now - datetime.timedelta(seconds=server_uptime)
+            server_usage['uptime_at'] = total_uptime
+            if not server_usage['ended_at'] or show_deleted:
+                yield server_usage
@@ -0,0 +1,122 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Store of the usage summaries of closed months.
+
+The summaries are computed ahead of time by the ``precompute_usage``
+management command and kept in the cache named by the
+``OVERVIEW_USAGE_CACHE`` setting, so that the overview only has to ask
+Nova for the usage of the months which are not closed yet.
+"""
+
+import calendar
+import collections
+import datetime
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+from openstack_dashboard import api
+
+
+LOG = logging.getLogger(__name__)
+
+KEY_FORMAT = 'openstack_dashboard.usage:%(region)s:%(year)04d-%(month)02d'
+
+
+def get_cache():
+    """Returns the cache of the store, or None if it is not enabled."""
+    alias = getattr(settings, 'OVERVIEW_USAGE_CACHE', None)
+    if alias is None:
+        return None
+    return caches[alias]
+
+
+def get_key(region, year, month):
+    return KEY_FORMAT % {'region': region, 'year': year, 'month': month}
+
+
+def get_month_range(year, month):
+    """Returns the naive first and last seconds of a month."""
+    last_day = calendar.monthrange(year, month)[1]
+    return (datetime.datetime(year, month, 1, 0, 0, 0),
+            datetime.datetime(year, month, last_day, 23, 59, 59))
+
+
+def iter_months(start, end):
+    """Yields the ``(year, month)`` of the months from start to end."""
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def get_month(region, year, month):
+    """Returns the stored usage totals of a month by tenant, or None."""
+    cache = get_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(get_key(region, year, month))
+    except Exception:
+        LOG.warning("Unable to read the usage of %04d-%02d from the "
+                    "usage store.", year, month, exc_info=True)
+        return None
+
+
+def set_month(region, year, month, usages, timeout=None):
+    """Stores the usage totals of a month by tenant."""
+    cache = get_cache()
+    if cache is not None:
+        cache.set(get_key(region, year, month), usages, timeout)
+
+
+def summarize_pages(pages):
+    """Adds up pages of usage of all tenants into totals by tenant."""
+    usages = collections.OrderedDict()
+    for page in pages:
+        for usage in page:
+            if usage.tenant_id not in usages:
+                usages[usage.tenant_id] = \
+                    api.nova.NovaUsageTotals(usage.tenant_id)
+            usages[usage.tenant_id].add(usage)
+    return usages
+
+
+def split_period(region, start, end, now):
+    """Splits a period into stored months and periods to ask Nova for.
+
+    Yields ``(start, end, usages)`` tuples in order, where ``usages`` are
+    the stored totals by tenant of a whole month closed before ``now``, or
+    None for the parts of the period which have to be fetched. Adjacent
+    parts to fetch are joined. All the datetimes are naive UTC.
+    """
+    if get_cache() is None:
+        yield start, end, None
+        return
+    pending = None
+    for year, month in iter_months(start, end):
+        month_start, month_end = get_month_range(year, month)
+        usages = None
+        if start <= month_start and month_end <= end and month_end < now:
+            usages = get_month(region, year, month)
+        if usages is None:
+            if pending is None:
+                pending = max(start, month_start)
+            continue
+        if pending is not None:
+            yield pending, month_start - datetime.timedelta(seconds=1), None
+            pending = None
+        yield month_start, month_end, usages
+    if pending is not None:
+        yield pending, end, None
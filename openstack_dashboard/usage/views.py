@@ -46,6 +46,9 @@ class UsageView(tables.DataTableView):
             project_id = self.kwargs.get('project_id',
                                          self.request.user.tenant_id)
             self.usage = self.usage_class(self.request, project_id)
+            if self.request.GET.get('format', 'html') == 'csv':
+                # Only the fields of the CSV rows are kept of the instances.
+                self.usage.keep_instances = False
             self.usage.summarize(*self.usage.get_date_range())
             self.usage.get_limits()
             self.kwargs['usage'] = self.usage
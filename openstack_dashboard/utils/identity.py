@@ -12,7 +12,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+import logging
+
 from openstack_dashboard import api
+from openstack_dashboard.api import executor
+
+
+LOG = logging.getLogger(__name__)
 
 
 def get_domain_id_for_operation(request):
@@ -26,3 +33,52 @@ def get_domain_id_for_operation(request):
     if domain_context:
         return domain_context
     return api.keystone.get_effective_domain_id(request)
+
+
+def get_role_changes(current, requested):
+    """Returns the role assignments to grant and to revoke.
+
+    ``current`` and ``requested`` map the ids of members to the ids of their
+    roles. The changes are returned as two sorted lists of
+    ``(member_id, role_id)`` pairs, the assignments to grant and the ones to
+    revoke. A member missing from ``requested`` loses all its roles.
+    """
+    grants = [(member_id, role_id)
+              for member_id, role_ids in requested.items()
+              for role_id in role_ids
+              if role_id not in current.get(member_id, ())]
+    revokes = [(member_id, role_id)
+               for member_id, role_ids in current.items()
+               for role_id in role_ids
+               if role_id not in requested.get(member_id, ())]
+    return sorted(grants), sorted(revokes)
+
+
+def apply_role_changes(request, grants, revokes, grant, revoke):
+    """Grants and revokes role assignments concurrently.
+
+    ``grant`` and ``revoke`` are called with the member id and the role id
+    of each change, at most ``CONCURRENT_API_CALLS['max_per_request']`` at a
+    time. Returns the ids of the members for which a change failed, in the
+    order of the changes. The exception of a change which ended the request,
+    for instance because the token of the user has expired, is raised again.
+    """
+    changes = ([(revoke, member_id, role_id)
+                for member_id, role_id in revokes] +
+               [(grant, member_id, role_id)
+                for member_id, role_id in grants])
+    futures = executor.run(request, *[
+        functools.partial(func, member_id, role_id)
+        for func, member_id, role_id in changes])
+    failed = []
+    for (func, member_id, role_id), future in zip(changes, futures):
+        try:
+            future.result()
+        except executor.STOP_ON:
+            raise
+        except Exception:
+            LOG.warning("Unable to change the role %s of %s.", role_id,
+                        member_id, exc_info=True)
+            if member_id not in failed:
+                failed.append(member_id)
+    return failed
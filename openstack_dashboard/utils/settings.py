@@ -60,7 +60,8 @@ def import_dashboard_config(modules):
                   key=lambda c: c[1]['__name__'].rsplit('.', 1)[1])
 
 
-def update_dashboards(modules, horizon_config, installed_apps):
+def update_dashboards(modules, horizon_config, installed_apps,
+                      discovery_cache=None):
     """Imports dashboard and panel configuration from modules and applies it.
 
     The submodules from specified modules are imported, and the configuration
@@ -89,6 +90,9 @@ def update_dashboards(modules, horizon_config, installed_apps):
     the panel configuration can be applied. Making changes to the panel is
     deferred until the horizon autodiscover is completed, configurations are
     applied in alphabetical order of files where it was imported.
+
+    The static files of the plugins are discovered with ``discovery_cache``,
+    see :func:`find_static_files`.
     """
     config_dashboards = horizon_config.get('dashboards', [])
     if config_dashboards or horizon_config.get('default_dashboard'):
@@ -124,8 +128,8 @@ def update_dashboards(modules, horizon_config, installed_apps):
             for _app in _apps:
                 module = import_module(_app)
                 base_path = os.path.join(module.__path__[0], 'static/')
-                file_discovery.populate_horizon_config(horizon_config,
-                                                       base_path)
+                file_discovery.populate_horizon_config(
+                    horizon_config, base_path, cache=discovery_cache)
 
         add_exceptions = config.get('ADD_EXCEPTIONS', {}).items()
         for category, exc_list in add_exceptions:
@@ -271,7 +275,14 @@ def find_static_files(
         HORIZON_CONFIG,
         AVAILABLE_THEMES,
         THEME_COLLECTION_DIR,
-        ROOT_PATH):
+        ROOT_PATH,
+        discovery_cache=None):
+    """Discovers the static files of Horizon, the dashboard and the themes.
+
+    When a :class:`horizon.utils.file_discovery.DiscoveryCache` is given,
+    the files found by a previous process are reused for the directories
+    which have not changed since.
+    """
     import horizon
     import openstack_dashboard
 
@@ -282,7 +293,8 @@ def find_static_files(
     # leading "/"
     file_discovery.populate_horizon_config(
         HORIZON_CONFIG,
-        os.path.join(horizon_home_dir, 'static/')
+        os.path.join(horizon_home_dir, 'static/'),
+        cache=discovery_cache
     )
 
     # filter out non-angular javascript code and lib
@@ -294,7 +306,8 @@ def find_static_files(
     file_discovery.populate_horizon_config(
         HORIZON_CONFIG,
         os.path.join(os_dashboard_home_dir, 'static/'),
-        sub_path='app/'
+        sub_path='app/',
+        cache=discovery_cache
     )
 
     # Discover theme static resources, and in particular any
@@ -311,7 +324,8 @@ def find_static_files(
         # discover static files provided by the theme
         file_discovery.populate_horizon_config(
             discovered_files,
-            path
+            path,
+            cache=discovery_cache
         )
 
         # Get the theme name from the theme url